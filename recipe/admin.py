@@ -25,7 +25,8 @@ admin.site.register(User, UserAdmin)
 
 class RecipeAdmin(admin.ModelAdmin):
     list_display = ('title', 'user_id', 'category', 'cooking_time',
-                    'serving_size', 'created_at', 'updated_at')
+                    'serving_size', 'avg_rating', 'review_count',
+                    'created_at', 'updated_at')
     list_filter = ('title', 'user_id', 'category',
                    'cooking_time', 'serving_size')
     ordering = ('-created_at',)
@@ -1,29 +1,54 @@
-from .auth import SignupAPI, LoginAPI
+from .auth import SignupAPI, LoginAPI, UserProvisionAPI
 from .review import (
     ReviewCreateView,
-    ReviewDetailView
+    ReviewBatchCreateAPI,
+    ReviewDetailView,
+    RecipeReviewListAPI
 )
 from .category import(
     CategoryListCreateAPIView,
-    CategoryRetrieveUpdateDestroyAPIView
+    CategoryRetrieveUpdateDestroyAPIView,
+    CategoryStatsListAPIView,
+    CategoryStatsRetrieveAPIView
 )
 from .recipe import (
     CreateRecipeAPI,
+    RecipeImportAPI,
     ListGetRecipeAPI,
     ListUpdateDeleteRecipeAPI
 )
 from .search import SearchAPI
+from .pantry import PantryMatchAPI
+from .export import RecipeExportAPI
+from .async_views import (
+    AsyncSearchAPI,
+    AsyncRecipeDetailAPI,
+    AsyncCategoryListAPI,
+    AsyncRecipeListAPI
+)
 
 
 __all__ = [
     "SignupAPI",
     "LoginAPI",
+    "UserProvisionAPI",
     "CreateRecipeAPI",
+    "RecipeImportAPI",
     "ReviewCreateView",
+    "ReviewBatchCreateAPI",
     "ReviewDetailView",
+    "RecipeReviewListAPI",
     "CategoryListCreateAPIView",
     "CategoryRetrieveUpdateDestroyAPIView",
+    "CategoryStatsListAPIView",
+    "CategoryStatsRetrieveAPIView",
     "ListGetRecipeAPI",
     "ListUpdateDeleteRecipeAPI",
-    "SearchAPI"
+    "SearchAPI",
+    "PantryMatchAPI",
+    "RecipeExportAPI",
+    "AsyncSearchAPI",
+    "AsyncRecipeDetailAPI",
+    "AsyncCategoryListAPI",
+    "AsyncRecipeListAPI"
 ]
@@ -0,0 +1,250 @@
+"""
+    Async versions of the hot read endpoints, for deployments served by an
+    ASGI server (``recipe_radar.asgi``).
+
+    DRF runs its handlers synchronously, so under ASGI every DRF request
+    occupies a thread while it waits on the database. These are plain Django
+    async views on the async ORM that keep the API contract of their sync
+    counterparts: the same JWT authentication, ``{status, message, data}``
+    envelope, exception handler, renderer and conditional GET validators.
+"""
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import (
+    AuthenticationFailed,
+    MethodNotAllowed,
+    NotAuthenticated
+)
+from rest_framework.request import Request
+from rest_framework.response import Response
+from recipe.api.conditional import (
+    acategory_list_validators,
+    arecipe_validators,
+    conditional_get
+)
+from recipe.api.recipe import ListGetRecipeAPI
+from recipe.api.review import aget_first_review_page
+from recipe.api.serializer import (
+    ListRequestRecipeSerializer,
+    RecipeSerializer,
+    UpdateRecipeSerializer,
+    RECIPE_ORDERINGS,
+    recipe_values_serializer,
+    get_fieldset,
+    get_fieldset_columns
+)
+from recipe.authentication import AsyncJWTAuthentication
+from recipe.models import Recipe
+from recipe.parsers import FastJSONParser
+from recipe.renderers import FastJSONRenderer
+from recipe.services import (
+    asearch_recipes,
+    get_category_catalogue,
+    get_recipe_detail_cache
+)
+from recipe.utils import (
+    fail_response,
+    recipe_custom_exc_handler,
+    success_response,
+    CustomPagination,
+    KeysetPagination
+)
+
+
+class AsyncAPIView(View):
+    """
+        Base of the async views: authenticates, runs the coroutine handler
+        and renders its DRF ``Response`` with `FastJSONRenderer`. Exceptions
+        go through `recipe_custom_exc_handler` like on APIView.
+    """
+    authentication_class = AsyncJWTAuthentication
+    parser_classes = [FastJSONParser]
+    renderer_class = FastJSONRenderer
+    authentication_required = True
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(
+            request, parsers=[parser() for parser in self.parser_classes]
+        )
+        self.request = request
+        try:
+            handler = None
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), None)
+            if handler is None:
+                raise MethodNotAllowed(request.method)
+
+            await self.authenticate(request)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        return self.finalize_response(request, response)
+
+    async def authenticate(self, request):
+        authenticator = self.authentication_class()
+        user_auth = await authenticator.aauthenticate(request)
+        if user_auth is not None:
+            request.user, request.auth = user_auth
+        elif self.authentication_required:
+            raise NotAuthenticated()
+        else:
+            request.user, request.auth = AnonymousUser(), None
+
+    def handle_exception(self, exc):
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            exc.auth_header = self.authentication_class().authenticate_header(
+                self.request
+            )
+        response = recipe_custom_exc_handler(
+            exc, {'view': self, 'request': self.request}
+        )
+        if response is None:
+            raise exc
+        return response
+
+    def finalize_response(self, request, response):
+        if isinstance(response, Response):
+            response.accepted_renderer = self.renderer_class()
+            response.accepted_media_type = response.accepted_renderer.media_type
+            response.renderer_context = {'view': self, 'request': request}
+            response.render()
+        return response
+
+
+class AsyncSearchAPI(AsyncAPIView):
+    """
+        Async `SearchAPI`.
+    """
+    serializer_class = RecipeSerializer
+    values_serializer = recipe_values_serializer
+
+    async def get(self, request, *args, **kwargs):
+        query = kwargs.get('query', '').strip()
+        if not query:
+            return fail_response(
+                "Please enter a search query",
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        values_serializer = self.values_serializer.for_fields(
+            get_fieldset(request, self.serializer_class)
+        )
+        search_results = await asearch_recipes(
+            query, values=values_serializer.columns
+        )
+        if not search_results:
+            return fail_response(
+                "No results found", status=status.HTTP_404_NOT_FOUND
+            )
+        return success_response(
+            {'search_results': values_serializer.serialize(search_results)},
+            status=status.HTTP_200_OK
+        )
+
+
+class AsyncRecipeDetailAPI(AsyncAPIView):
+    """
+        Async ``GET`` of `ListUpdateDeleteRecipeAPI`, sharing its cache.
+    """
+    serializer_class = UpdateRecipeSerializer
+
+    @conditional_get(arecipe_validators)
+    async def get(self, request, *args, **kwargs):
+        fieldset = get_fieldset(request, self.serializer_class)
+        payload = await get_recipe_detail_cache().aget_or_set(
+            kwargs['pk'],
+            lambda: self.get_detail_payload(kwargs['pk'], fieldset),
+            variant=','.join(fieldset)
+        )
+        return success_response(
+            payload,
+            status=status.HTTP_200_OK,
+            message="Recipe Retrieved Successfully"
+        )
+
+    async def get_detail_payload(self, pk, fieldset) -> dict:
+        try:
+            recipe = await Recipe.objects.only(
+                'review_count',
+                *get_fieldset_columns(self.serializer_class, fieldset)
+            ).aget(pk=pk)
+        except Recipe.DoesNotExist:
+            raise Http404(
+                f"No {Recipe._meta.object_name} matches the given query."
+            )
+        reviews = await aget_first_review_page(pk)
+
+        return {
+            'recipe': self.serializer_class(recipe, fields=fieldset).data,
+            'reviews': reviews['results'],
+            'review_count': recipe.review_count,
+            'reviews_next': reviews['next']
+        }
+
+
+class AsyncCategoryListAPI(AsyncAPIView):
+    """
+        Async ``GET`` of `CategoryListCreateAPIView`, public like it.
+    """
+    authentication_required = False
+
+    @conditional_get(acategory_list_validators)
+    async def get(self, request, *args, **kwargs):
+        return Response((await get_category_catalogue().aget()).categories)
+
+
+class AsyncRecipeListAPI(AsyncAPIView):
+    """
+        Async `ListGetRecipeAPI`, with the same filters, orderings, fieldsets
+        and both paginations.
+    """
+    serializer_class = RecipeSerializer
+    values_serializer = recipe_values_serializer
+    pagination_class = CustomPagination
+    cursor_pagination_class = KeysetPagination
+    get_pagination_class = ListGetRecipeAPI.get_pagination_class
+    get_keyset_ordering = ListGetRecipeAPI.get_keyset_ordering
+
+    async def post(self, request, *args, **kwargs):
+        serializer = ListRequestRecipeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        values_serializer = self.values_serializer.for_fields(
+            get_fieldset(request, self.serializer_class)
+        )
+
+        filters = serializer.validated_data.get('filters')
+        self.ordering = RECIPE_ORDERINGS[serializer.validated_data['ordering']]
+
+        queryset = Recipe.objects.order_by(*self.ordering)
+        if filters:
+            queryset = queryset.filter(filters)
+
+        columns = dict.fromkeys(values_serializer.columns)
+        columns.update(dict.fromkeys(name.lstrip('-') for name in self.ordering))
+        queryset = queryset.values(*columns)
+
+        paginator = self.get_pagination_class()()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+
+        if page is not None:
+            return success_response(
+                paginator.get_paginated_data(
+                    values_serializer.serialize(page)
+                ),
+                status=status.HTTP_200_OK,
+                message="Fatched Successfully"
+            )
+
+        return success_response(
+            values_serializer.serialize([row async for row in queryset]),
+            status=status.HTTP_200_OK,
+            message="Recipes details"
+        )
@@ -1,13 +1,15 @@
+import io
 from django.db import transaction
 from django.db.utils import IntegrityError
 from rest_framework import status
-from rest_framework.response import Response
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.generics import CreateAPIView
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
 from recipe.utils import (
-    get_success_response, get_fail_response
+    success_response, fail_response
 )
 from rest_framework.generics import (
     CreateAPIView,
@@ -15,8 +17,11 @@ from rest_framework.generics import (
 )
 from recipe.api.serializer import (
     SignupSerializer,
-    LoginSerializer
+    LoginSerializer,
+    UserProvisionRequestSerializer
 )
+from recipe.services.importer import guess_import_format, read_records
+from recipe.services.provisioning import UserProvisioner
 
 
 class SignupAPI(CreateAPIView):
@@ -35,19 +40,18 @@ class SignupAPI(CreateAPIView):
                 serializer.is_valid(raise_exception=True)
                 self.perform_create(serializer)
                 headers = self.get_success_headers(serializer.data)
-                response = get_success_response()
-                response["message"] = "User Created Successfully"
-                response["data"] = serializer.data
-                return Response(
-                    response,
+                return success_response(
+                    serializer.data,
                     status=status.HTTP_201_CREATED,
+                    message="User Created Successfully",
                     headers=headers
                 )
         except IntegrityError as ex:
-            response = get_fail_response()
-            response["data"] = request.data
-            response["message"] = str(ex)
-            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+            return fail_response(
+                str(ex),
+                status=status.HTTP_400_BAD_REQUEST,
+                data=request.data
+            )
 
 
 class LoginAPI(GenericAPIView):
@@ -62,16 +66,70 @@ class LoginAPI(GenericAPIView):
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        email = serializer.validated_data['email']
-        password = serializer.validated_data['password']
-        user = authenticate(request, username=email, password=password)
+        user = serializer.validated_data['user']
         refresh = RefreshToken.for_user(user)
         response_data = {
             "user_data": user.get_user_data_for_response(),
             "refresh": str(refresh),
             "access": str(refresh.access_token)
         }
-        response = get_success_response()
-        response["message"] = "Login Successful"
-        response["data"] = response_data
-        return Response(response, status=status.HTTP_200_OK)
+        return success_response(
+            response_data,
+            status=status.HTTP_200_OK,
+            message="Login Successful"
+        )
+
+
+class UserProvisionAPI(GenericAPIView):
+    serializer_class = UserProvisionRequestSerializer
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+        tags=['Authentication'],
+        operation_description="Bulk create users from a JSON Lines or CSV "
+                              "file of signup records (superusers only). "
+                              "The response reports the errors of every "
+                              "rejected line, including duplicate emails "
+                              "and phone numbers. Use `manage.py "
+                              "provision_users` for large member bases.",
+        request_body=UserProvisionRequestSerializer,
+    )
+    def post(self, request, *args, **kwargs):
+        if not request.user.is_superuser:
+            raise PermissionDenied("Only superusers can provision users.")
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        upload = serializer.validated_data['file']
+        format = (serializer.validated_data.get('format')
+                  or guess_import_format(upload.name))
+        if format is None:
+            return fail_response(
+                "Cannot tell the format of the file, pass format",
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        stream = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+        try:
+            # Hashed in this worker: starting a process pool per request
+            # would multiply processes under concurrent imports.
+            report = UserProvisioner(workers=0).run(
+                read_records(stream, format)
+            )
+        except UnicodeDecodeError:
+            return fail_response(
+                "File is not valid UTF-8", status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not report.created:
+            return fail_response(
+                "No users created",
+                status=status.HTTP_400_BAD_REQUEST,
+                data=report.as_dict()
+            )
+        return success_response(
+            report.as_dict(),
+            status=status.HTTP_201_CREATED,
+            message=f"Created {report.created} users"
+        )
@@ -1,8 +1,16 @@
 from rest_framework import generics, permissions
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
 
-from recipe.models import Category
-from recipe.api.serializer import CategoryCreateSerializer, CategoryDetailSerializer
+from recipe.models import Category, CategoryStats
+from recipe.api.serializer import (
+    CategoryCreateSerializer,
+    CategoryDetailSerializer,
+    CategoryListSerializer,
+    CategoryStatsSerializer
+)
+from recipe.api.conditional import conditional_get, category_list_validators
+from recipe.services import get_category_catalogue
 from drf_yasg.utils import swagger_auto_schema
 
 
@@ -21,6 +29,18 @@ class CategoryListCreateAPIView(generics.ListCreateAPIView):
             raise PermissionDenied("Only superusers can create categories.")
         return super().get_permissions()
 
+    @swagger_auto_schema(
+        tags=['Category'],
+        operation_description="List Categories, with the number of recipes "
+                              "of each.",
+        responses={200: CategoryListSerializer(many=True)}
+    )
+    @conditional_get(category_list_validators)
+    def get(self, request, *args, **kwargs):
+        # Served from the per-worker catalogue, rebuilt only when a
+        # category or a recipe's category changes.
+        return Response(get_category_catalogue().get().categories)
+
     @swagger_auto_schema(
         tags=['Category'],
         operation_description="Create Category",
@@ -58,3 +78,37 @@ class CategoryRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
     )
     def perform_destroy(self, instance):
         instance.delete()
+
+
+class CategoryStatsListAPIView(generics.ListAPIView):
+    """
+        Statistics of every category, read from the stored `CategoryStats`
+        rows (one query) rather than aggregated from the recipes.
+    """
+    queryset = CategoryStats.objects.select_related('category').order_by('pk')
+    serializer_class = CategoryStatsSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        tags=['Category'],
+        operation_description="Statistics of every category: recipe count, "
+                              "average cooking time, serving size and "
+                              "rating, and review count.",
+        responses={200: CategoryStatsSerializer(many=True)}
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class CategoryStatsRetrieveAPIView(generics.RetrieveAPIView):
+    queryset = CategoryStats.objects.select_related('category')
+    serializer_class = CategoryStatsSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        tags=['Category'],
+        operation_description="Statistics of one category.",
+        responses={200: CategoryStatsSerializer}
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
@@ -0,0 +1,50 @@
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+from drf_yasg.utils import swagger_auto_schema
+from recipe.api.filter import RecipeFilter
+from recipe.api.serializer import RecipeExportRequestSerializer
+from recipe.models import Recipe
+from recipe.services.exporter import EXPORT_FORMATS, export_recipes
+from recipe.utils import fail_response
+
+
+class RecipeExportAPI(GenericAPIView):
+    queryset = Recipe.objects.all()
+    permission_classes = [IsAuthenticated]
+    serializer_class = RecipeExportRequestSerializer
+    filterset_class = RecipeFilter
+
+    @swagger_auto_schema(
+        tags=['Recipe'],
+        operation_description="Stream every recipe matching the "
+                              "`RecipeFilter` query parameters (e.g. "
+                              "`category_id=3&cooking_time__lte=30`) as "
+                              "NDJSON or CSV. `stream=reviews` exports the "
+                              "reviews of those recipes instead.",
+        query_serializer=RecipeExportRequestSerializer
+    )
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        output = serializer.validated_data['output']
+        stream = serializer.validated_data['stream']
+
+        filterset = self.filterset_class(
+            request.query_params, queryset=self.get_queryset()
+        )
+        if not filterset.is_valid():
+            return fail_response(
+                [errors[0] for errors in filterset.errors.values()],
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        response = StreamingHttpResponse(
+            export_recipes(filterset.qs, output, stream),
+            content_type=EXPORT_FORMATS[output]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{stream}.{output}"'
+        )
+        return response
@@ -1,6 +1,12 @@
 from .recipe_filter import RecipeFilter
+from .planner import FilterPlanner, recipe_filter_planner
+from .schema import FilterField, RECIPE_FILTER_FIELDS
 
 
 __all__ = [
-    "RecipeFilter"
+    "RecipeFilter",
+    "FilterPlanner",
+    "recipe_filter_planner",
+    "FilterField",
+    "RECIPE_FILTER_FIELDS"
 ]
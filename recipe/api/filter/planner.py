@@ -0,0 +1,88 @@
+from functools import lru_cache
+from django.db.models import Q
+from rest_framework import serializers
+from recipe.api.filter.schema import RECIPE_FILTER_FIELDS
+
+
+class FilterPlanner:
+    """
+        Validates client supplied filters against a declared schema and
+        compiles them into a `Q` object.
+
+        The plan (model lookup path, value field and lookup of every key) is
+        compiled once per filter shape, i.e. per set of keys, and cached, so
+        repeated requests only pay for validating the values.
+    """
+    max_expensive_filters = 1
+    max_list_values = 100
+
+    def __init__(self, filter_fields):
+        self.filter_fields = filter_fields
+        self.get_plan = lru_cache(maxsize=256)(self._compile_plan)
+
+    def _parse_key(self, key):
+        if key in self.filter_fields:
+            name, lookup = key, 'exact'
+        else:
+            name, _, lookup = key.rpartition('__')
+        filter_field = self.filter_fields.get(name)
+        if filter_field is None:
+            raise serializers.ValidationError(
+                f"Filtering on '{key}' is not supported."
+            )
+        if lookup not in filter_field.lookups:
+            raise serializers.ValidationError(
+                f"Lookup '{lookup}' is not allowed on '{name}'."
+            )
+        return filter_field, lookup
+
+    def _compile_plan(self, keys) -> tuple:
+        plan = []
+        expensive = 0
+        for key in keys:
+            filter_field, lookup = self._parse_key(key)
+            if lookup in filter_field.expensive_lookups:
+                expensive += 1
+            path = filter_field.field_name
+            if lookup != 'exact':
+                path = f'{path}__{lookup}'
+            plan.append((key, path, filter_field.value_field, lookup))
+        if expensive > self.max_expensive_filters:
+            raise serializers.ValidationError(
+                f"At most {self.max_expensive_filters} text search filter "
+                f"is allowed per request."
+            )
+        return tuple(plan)
+
+    def _coerce(self, key, value_field, lookup, value):
+        try:
+            if lookup in ('in', 'range'):
+                if not isinstance(value, list):
+                    raise serializers.ValidationError("Expected a list.")
+                if lookup == 'range' and len(value) != 2:
+                    raise serializers.ValidationError(
+                        "Expected a list of two values."
+                    )
+                if len(value) > self.max_list_values:
+                    raise serializers.ValidationError(
+                        f"Expected at most {self.max_list_values} values."
+                    )
+                return [value_field.run_validation(item) for item in value]
+            return value_field.run_validation(value)
+        except serializers.ValidationError as exc:
+            detail = exc.detail[0] if isinstance(exc.detail, list) else exc.detail
+            raise serializers.ValidationError(
+                f"Invalid value for '{key}': {detail}"
+            )
+
+    def compile(self, filters) -> Q:
+        if not isinstance(filters, dict):
+            raise serializers.ValidationError("Filters must be an object.")
+        plan = self.get_plan(tuple(sorted(filters)))
+        return Q(**{
+            path: self._coerce(key, value_field, lookup, filters[key])
+            for key, path, value_field, lookup in plan
+        })
+
+
+recipe_filter_planner = FilterPlanner(RECIPE_FILTER_FIELDS)
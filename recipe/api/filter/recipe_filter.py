@@ -1,5 +1,9 @@
 from django_filters import rest_framework as filters
 from recipe.models import Recipe
+from recipe.api.filter.schema import (
+    RECIPE_FILTER_FIELDS,
+    get_filterset_fields
+)
 
 
 class RecipeFilter(filters.FilterSet):
@@ -14,6 +18,4 @@ class RecipeFilter(filters.FilterSet):
 
     class Meta:
         model = Recipe
-        fields = ['avg_rating', 'title', 'description', 'ingredients',
-                  'preparation_steps', 'cooking_time', 'serving_size',
-                  'category_id']
+        fields = get_filterset_fields(RECIPE_FILTER_FIELDS)
@@ -0,0 +1,93 @@
+"""
+    Declared filter schema of recipes.
+
+    This is the single list of what clients may filter recipes on. It feeds
+    both the JSON body filters of the recipe list endpoint (through
+    `FilterPlanner`) and the query string filters of `RecipeFilter`.
+"""
+from dataclasses import dataclass, field
+from rest_framework import serializers
+
+EQUALITY_LOOKUPS = ('exact', 'in')
+RANGE_LOOKUPS = ('exact', 'lt', 'lte', 'gt', 'gte', 'range', 'in')
+
+
+@dataclass(frozen=True)
+class FilterField:
+    """
+        One filterable field.
+
+        ``field_name`` is the model field path, ``value_field`` the DRF field
+        used to validate and coerce one value, ``lookups`` the lookups
+        allowed on it and ``expensive_lookups`` the subset that cannot use an
+        index and scans the table.
+    """
+    field_name: str
+    value_field: serializers.Field
+    lookups: tuple = ('exact',)
+    expensive_lookups: frozenset = field(default_factory=frozenset)
+
+
+def _text(lookups=('icontains',), expensive=('icontains',)):
+    return {
+        'value_field': serializers.CharField(max_length=100),
+        'lookups': lookups,
+        'expensive_lookups': frozenset(expensive),
+    }
+
+
+RECIPE_FILTER_FIELDS = {
+    'id': FilterField('id', serializers.IntegerField(), EQUALITY_LOOKUPS),
+    'title': FilterField(
+        'title',
+        **_text(
+            lookups=('exact', 'iexact', 'icontains', 'istartswith'),
+            expensive=('iexact', 'icontains', 'istartswith')
+        )
+    ),
+    'description': FilterField('description', **_text()),
+    'ingredients': FilterField('ingredients', **_text()),
+    'preparation_steps': FilterField('preparation_steps', **_text()),
+    'cooking_time': FilterField(
+        'cooking_time', serializers.IntegerField(), RANGE_LOOKUPS
+    ),
+    'serving_size': FilterField(
+        'serving_size', serializers.IntegerField(), RANGE_LOOKUPS
+    ),
+    'avg_rating': FilterField(
+        'avg_rating', serializers.FloatField(), RANGE_LOOKUPS
+    ),
+    'review_count': FilterField(
+        'review_count', serializers.IntegerField(),
+        ('exact', 'lt', 'lte', 'gt', 'gte')
+    ),
+    'created_at': FilterField(
+        'created_at', serializers.DateTimeField(),
+        ('lt', 'lte', 'gt', 'gte', 'range')
+    ),
+    'category': FilterField(
+        'category', serializers.IntegerField(), EQUALITY_LOOKUPS
+    ),
+    'category_id': FilterField(
+        'category', serializers.IntegerField(), EQUALITY_LOOKUPS
+    ),
+    'category__name': FilterField(
+        'category__name', serializers.CharField(max_length=50),
+        ('exact', 'iexact'), frozenset({'iexact'})
+    ),
+    'user': FilterField('user', serializers.IntegerField()),
+}
+
+
+def get_filterset_fields(filter_fields) -> dict:
+    """
+        Returns the schema as a django-filter ``Meta.fields`` mapping of
+        model field path to lookups.
+    """
+    fields = {}
+    for filter_field in filter_fields.values():
+        lookups = fields.setdefault(filter_field.field_name, [])
+        for lookup in filter_field.lookups:
+            if lookup not in lookups:
+                lookups.append(lookup)
+    return fields
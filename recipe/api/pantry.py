@@ -0,0 +1,51 @@
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+from drf_yasg.utils import swagger_auto_schema
+from recipe.models import Recipe
+from recipe.api.serializer import (
+    PantryMatchRequestSerializer,
+    RecipeSerializer
+)
+from recipe.services import pantry_index
+from recipe.utils import success_response
+
+
+class PantryMatchAPI(GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = RecipeSerializer
+
+    @swagger_auto_schema(
+        tags=['Search & Filter'],
+        operation_description="Recipes ranked by how many of their "
+                              "ingredients are in the given pantry",
+        request_body=PantryMatchRequestSerializer,
+        responses={200: RecipeSerializer(many=True)}
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = PantryMatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        matches = pantry_index.match(
+            serializer.validated_data['ingredients'],
+            max_missing=serializer.validated_data.get('max_missing'),
+            limit=serializer.validated_data['limit']
+        )
+        recipes = Recipe.objects.in_bulk(
+            [match.recipe_id for match in matches]
+        )
+
+        results = []
+        for match in matches:
+            recipe = recipes.get(match.recipe_id)
+            if recipe is None:
+                continue
+            results.append({
+                'recipe': self.get_serializer(recipe).data,
+                'matched': match.matched,
+                'missing': list(match.missing)
+            })
+
+        return success_response(
+            results, status=status.HTTP_200_OK, message="Pantry matches"
+        )
@@ -1,11 +1,14 @@
+import io
+from django.db import transaction
 from rest_framework import status
-from django.db.models import Avg, F
+from rest_framework.parsers import MultiPartParser
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
-from recipe.models import Recipe, Review
+from recipe.models import Recipe
 from recipe.api.filter import RecipeFilter
+from recipe.api.conditional import conditional_get, recipe_validators
+from recipe.api.review import get_first_review_page
 from django.shortcuts import get_object_or_404
 from rest_framework.generics import (
     CreateAPIView,
@@ -15,15 +18,26 @@ from rest_framework.generics import (
 )
 from recipe.api.serializer import (
     CreateRecipeSerializer,
+    RecipeImportRequestSerializer,
     RecipeSerializer,
     ListRequestRecipeSerializer,
     UpdateRecipeSerializer,
-    ReviewSerializer
+    RECIPE_ORDERINGS,
+    recipe_values_serializer,
+    get_fieldset,
+    get_fieldset_columns
+)
+from recipe.services import get_recipe_detail_cache
+from recipe.services.importer import (
+    RecipeImporter,
+    guess_import_format,
+    read_records
 )
 from recipe.utils import (
-    get_success_response,
-    get_fail_response,
-    CustomPagination
+    success_response,
+    fail_response,
+    CustomPagination,
+    KeysetPagination
 )
 
 
@@ -42,59 +56,145 @@ class CreateRecipeAPI(CreateAPIView):
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        response = get_success_response()
-        response['message'] = "Recipe Created Successfully"
-        response['data'] = serializer.data
-        return Response(response, status=status.HTTP_201_CREATED)
+        # Category stats are updated by the save's signals: one
+        # transaction for both.
+        with transaction.atomic():
+            serializer.save()
+        return success_response(
+            serializer.data,
+            status=status.HTTP_201_CREATED,
+            message="Recipe Created Successfully"
+        )
+
+
+class RecipeImportAPI(GenericAPIView):
+    serializer_class = RecipeImportRequestSerializer
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+        tags=['Recipe'],
+        operation_description="Bulk import recipes owned by the current "
+                              "user from a JSON Lines or CSV file. Records "
+                              "use the fields of Create Recipe; the response "
+                              "reports the errors of every rejected line. "
+                              "Use `manage.py import_recipes` for very "
+                              "large catalogs.",
+        request_body=RecipeImportRequestSerializer,
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        upload = serializer.validated_data['file']
+        format = (serializer.validated_data.get('format')
+                  or guess_import_format(upload.name))
+        if format is None:
+            return fail_response(
+                "Cannot tell the format of the file, pass format",
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        stream = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+        try:
+            report = RecipeImporter(request.user).run(
+                read_records(stream, format)
+            )
+        except UnicodeDecodeError:
+            return fail_response(
+                "File is not valid UTF-8", status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not report.created:
+            return fail_response(
+                "No recipes imported",
+                status=status.HTTP_400_BAD_REQUEST,
+                data=report.as_dict()
+            )
+        return success_response(
+            report.as_dict(),
+            status=status.HTTP_201_CREATED,
+            message=f"Imported {report.created} recipes"
+        )
 
 
 class ListGetRecipeAPI(GenericAPIView):
     queryset = Recipe.objects.all()
     serializer_class = RecipeSerializer
+    # Rows are read with values() and mapped by this instead of building
+    # model instances for `serializer_class`, with the same output.
+    values_serializer = recipe_values_serializer
     permission_classes = [IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = RecipeFilter
 
+    def get_pagination_class(self):
+        """
+            Page-number pagination by default. ``?pagination=cursor`` (or any
+            request carrying a ``cursor``) switches to keyset pagination,
+            which skips the COUNT and the OFFSET scan.
+        """
+        query_params = self.request.query_params
+        if (query_params.get('pagination') == 'cursor'
+                or self.cursor_pagination_class.cursor_query_param in query_params):
+            return self.cursor_pagination_class
+        return self.pagination_class
+
+    def get_keyset_ordering(self):
+        return self.ordering
+
     @swagger_auto_schema(
         tags=['Recipe'],
-        operation_description="List Recipes",
+        operation_description="List Recipes, ordered by `ordering` (newest, "
+                              "top_rated, quickest or serving_size). Pass "
+                              "`?pagination=cursor` for keyset pagination "
+                              "and follow the returned `next` link. "
+                              "`?fields=card` (or `full`, or a comma "
+                              "separated list of fields) limits the "
+                              "returned fields.",
         request_body=ListRequestRecipeSerializer,
         responses={200: RecipeSerializer(many=True)}
     )
     def post(self, request, *args, **kwargs):
         serializer = ListRequestRecipeSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
+        values_serializer = self.values_serializer.for_fields(
+            get_fieldset(request, self.serializer_class)
+        )
 
-        filters = serializer.validated_data.get('filters', {})
+        filters = serializer.validated_data.get('filters')
+        self.ordering = RECIPE_ORDERINGS[serializer.validated_data['ordering']]
 
-        queryset = self.get_queryset()
+        queryset = self.get_queryset().order_by(*self.ordering)
 
         if filters:
-            queryset = queryset.filter(**filters)
+            queryset = queryset.filter(filters)
+
+        # Keyset pagination reads the cursor position from the ordering
+        # columns, so they are fetched even when not returned.
+        columns = dict.fromkeys(values_serializer.columns)
+        columns.update(dict.fromkeys(name.lstrip('-') for name in self.ordering))
+        queryset = queryset.values(*columns)
 
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(queryset, request)
+        paginator = self.get_pagination_class()()
+        page = paginator.paginate_queryset(queryset, request, view=self)
 
-        response = get_success_response()
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            _response = paginator.get_paginated_response(serializer.data)
-            response['message'] = "Fatched Successfully"
-            response["data"] = _response.data
-            return Response(response, status=status.HTTP_200_OK)
-
-        serializer = self.get_serializer(queryset, many=True)
-        response['message'] = "Recipes details"
-        response['data'] = serializer.data
-        return Response(response, status=status.HTTP_200_OK)
-
-    def get_queryset(self):
-        queryset = super().get_queryset().annotate(
-                avg_rating=Avg('reviews__rating')
+            return success_response(
+                paginator.get_paginated_data(
+                    values_serializer.serialize(page)
+                ),
+                status=status.HTTP_200_OK,
+                message="Fatched Successfully"
             )
-        return queryset
+
+        return success_response(
+            values_serializer.serialize(queryset),
+            status=status.HTTP_200_OK,
+            message="Recipes details"
+        )
 
 
 class ListUpdateDeleteRecipeAPI(RetrieveUpdateDestroyAPIView):
@@ -104,11 +204,22 @@ class ListUpdateDeleteRecipeAPI(RetrieveUpdateDestroyAPIView):
 
     def check_user_permission(self, request, recipe):
         if request.user.id != recipe.user_id:
-            response = get_fail_response()
-            response["message"] = "You are not authorized to perform this action on this recipe"
-            return Response(response, status=status.HTTP_403_FORBIDDEN)
+            return fail_response(
+                "You are not authorized to perform this action on this recipe",
+                status=status.HTTP_403_FORBIDDEN
+            )
         return None
 
+    # Category stats are updated by the write's signals: one transaction
+    # for both, whichever method (PUT, PATCH, DELETE) writes.
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            super().perform_update(serializer)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            super().perform_destroy(instance)
+
     @swagger_auto_schema(
         tags=['Recipe'],
         operation_description="Update Recipe",
@@ -120,11 +231,14 @@ class ListUpdateDeleteRecipeAPI(RetrieveUpdateDestroyAPIView):
         permission_response = self.check_user_permission(request, recipe)
         if permission_response:
             return permission_response
-        response = super().update(request, *args, **kwargs)
-        _response = get_success_response()
-        _response['message'] = "Recipe Updated Successfully"
-        _response['data'] = response.data
-        return Response(_response, status=status.HTTP_200_OK)
+        serializer = self.get_serializer(recipe, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return success_response(
+            serializer.data,
+            status=status.HTTP_200_OK,
+            message="Recipe Updated Successfully"
+        )
 
     @swagger_auto_schema(
         tags=['Recipe'],
@@ -135,31 +249,46 @@ class ListUpdateDeleteRecipeAPI(RetrieveUpdateDestroyAPIView):
         permission_response = self.check_user_permission(request, recipe)
         if permission_response:
             return permission_response
-        response = super().delete(request, *args, **kwargs)
-        _response = get_success_response()
-        _response['message'] = "Recipe Deleted Successfully"
-        _response['data'] = response.data
-        return Response(_response, status=status.HTTP_200_OK)
+        self.perform_destroy(recipe)
+        return success_response(
+            status=status.HTTP_200_OK,
+            message="Recipe Deleted Successfully"
+        )
 
     @swagger_auto_schema(
         tags=['Recipe'],
-        operation_description="Retrieve Recipe",
+        operation_description="Retrieve Recipe. `?fields=card` (or `full`, "
+                              "or a comma separated list of fields) limits "
+                              "the recipe fields returned.",
         responses={200: UpdateRecipeSerializer}
     )
+    @conditional_get(recipe_validators)
     def get(self, request, *args, **kwargs):
-        recipe = get_object_or_404(Recipe, pk=kwargs['pk'])
-        reviews = Review.objects.filter(recipe_id=kwargs['pk']).select_related('user').annotate(
-            first_name=F('user__first_name'),
-            last_name=F('user__last_name')
-        ).values('id', 'rating', 'comment', 'created_at', 'updated_at', 'first_name', 'last_name')
-
-        recipe_data = self.get_serializer(recipe).data
-        review_serializer = ReviewSerializer(reviews, many=True)
-
-        response = get_success_response()
-        response['data'] = {
-            'recipe': recipe_data,
-            'reviews': review_serializer.data
+        fieldset = get_fieldset(request, self.serializer_class)
+        payload = get_recipe_detail_cache().get_or_set(
+            kwargs['pk'],
+            lambda: self.get_detail_payload(kwargs['pk'], fieldset),
+            variant=','.join(fieldset)
+        )
+        return success_response(
+            payload,
+            status=status.HTTP_200_OK,
+            message="Recipe Retrieved Successfully"
+        )
+
+    def get_detail_payload(self, pk, fieldset) -> dict:
+        recipe = get_object_or_404(
+            Recipe.objects.only(
+                'review_count',
+                *get_fieldset_columns(self.serializer_class, fieldset)
+            ),
+            pk=pk
+        )
+        reviews = get_first_review_page(pk)
+
+        return {
+            'recipe': self.get_serializer(recipe, fields=fieldset).data,
+            'reviews': reviews['results'],
+            'review_count': recipe.review_count,
+            'reviews_next': reviews['next']
         }
-        response['message'] = "Recipe Retrieved Successfully"
-        return Response(response, status=status.HTTP_200_OK)
@@ -1,11 +1,25 @@
-from rest_framework import generics, permissions
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import generics, permissions, status
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.utils.urls import replace_query_param
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import serializers
 
 from recipe.models import Review, Recipe
-from recipe.api.serializer import ReviewSerializer, ReviewCreateSerializer
+from recipe.api.serializer import (
+    ReviewSerializer,
+    ReviewCreateSerializer,
+    ReviewBatchRequestSerializer,
+    RecipeReviewSerializer,
+    RecipeReviewListRequestSerializer,
+    REVIEW_ORDERINGS,
+    recipe_review_values_serializer
+)
 from recipe.api.permission import IsOwnerOrReadOnly
+from recipe.api.conditional import conditional_get, review_validators
+from recipe.services.reviews import create_review_batch
+from recipe.utils import KeysetPagination, fail_response, success_response
 
 
 
@@ -21,14 +35,64 @@ class ReviewCreateView(generics.CreateAPIView):
         responses={201: ReviewCreateSerializer}
     )
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        # The rating aggregates are updated by the review's signals, in
+        # the same transaction.
+        with transaction.atomic():
+            serializer.save(user=self.request.user)
+
+
+class ReviewBatchCreateAPI(generics.GenericAPIView):
+    serializer_class = ReviewBatchRequestSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        tags=['Review'],
+        operation_description="Create up to 1000 reviews in one request. "
+                              "Every review is validated like Create Review "
+                              "and gets its own result; valid ones are "
+                              "saved even when others fail.",
+        request_body=ReviewBatchRequestSerializer
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = create_review_batch(
+            request.user, serializer.validated_data['reviews']
+        )
+        created = sum(1 for result in results if result['status'] == 'created')
+        data = {
+            'created': created,
+            'failed': len(results) - created,
+            'results': results
+        }
+        if not created:
+            return fail_response(
+                "No reviews created",
+                status=status.HTTP_400_BAD_REQUEST,
+                data=data
+            )
+        return success_response(
+            data,
+            status=status.HTTP_201_CREATED,
+            message=f"Created {created} reviews"
+        )
 
 
 class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Review.objects.all()
+    queryset = Review.objects.select_related('user', 'recipe')
     serializer_class = ReviewSerializer
     permission_classes = [IsOwnerOrReadOnly]
 
+    @swagger_auto_schema(
+        tags=['Review'],
+        operation_description="Retrieve Review",
+        responses={200: ReviewSerializer}
+    )
+    @conditional_get(review_validators)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     @swagger_auto_schema(
         tags=['Review'],
         operation_description="Update Review",
@@ -38,7 +102,8 @@ class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
     def perform_update(self, serializer):
         if serializer.instance.user != self.request.user:
             raise PermissionDenied("You do not have permission to edit this review.")
-        super().perform_update(serializer)
+        with transaction.atomic():
+            super().perform_update(serializer)
 
     @swagger_auto_schema(
         tags=['Review'],
@@ -49,4 +114,93 @@ class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
     def perform_destroy(self, instance):
         if instance.user != self.request.user:
             raise PermissionDenied("You do not have permission to delete this review.")
-        super().perform_destroy(instance)
\ No newline at end of file
+        with transaction.atomic():
+            super().perform_destroy(instance)
+
+
+def get_recipe_reviews(recipe_id):
+    return Review.objects.filter(recipe_id=recipe_id).values(
+        *recipe_review_values_serializer.columns
+    )
+
+
+def get_first_review_page(recipe_id) -> dict:
+    """
+        First page of the most recent reviews of a recipe, as embedded in
+        the recipe detail. ``next`` links to the second page of
+        `RecipeReviewListAPI`.
+    """
+    paginator = get_first_review_paginator()
+    page = paginator.get_page(get_recipe_reviews(recipe_id))
+    return get_review_page_data(paginator, page, recipe_id)
+
+
+async def aget_first_review_page(recipe_id) -> dict:
+    paginator = get_first_review_paginator()
+    page = await paginator.aget_page(get_recipe_reviews(recipe_id))
+    return get_review_page_data(paginator, page, recipe_id)
+
+
+def get_first_review_paginator() -> KeysetPagination:
+    paginator = KeysetPagination()
+    paginator.ordering = REVIEW_ORDERINGS['recent']
+    return paginator
+
+
+def get_review_page_data(paginator, page, recipe_id) -> dict:
+    next_link = None
+    if paginator.next_position is not None:
+        next_link = replace_query_param(
+            reverse('recipe-reviews', kwargs={'pk': recipe_id}),
+            paginator.cursor_query_param,
+            paginator.encode_cursor(paginator.next_position)
+        )
+    return {
+        'next': next_link,
+        'results': recipe_review_values_serializer.serialize(page)
+    }
+
+
+class RecipeReviewListAPI(generics.GenericAPIView):
+    serializer_class = RecipeReviewSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_keyset_ordering(self):
+        return self.ordering
+
+    @swagger_auto_schema(
+        tags=['Review'],
+        operation_description="List the reviews of a recipe, ordered by "
+                              "`ordering` (recent or top_rated). Follow the "
+                              "returned `next` link for the next page.",
+        query_serializer=RecipeReviewListRequestSerializer,
+        responses={200: RecipeReviewSerializer(many=True)}
+    )
+    def get(self, request, *args, **kwargs):
+        serializer = RecipeReviewListRequestSerializer(
+            data=request.query_params
+        )
+        serializer.is_valid(raise_exception=True)
+        self.ordering = REVIEW_ORDERINGS[serializer.validated_data['ordering']]
+
+        review_count = Recipe.objects.filter(pk=kwargs['pk']).values_list(
+            'review_count', flat=True
+        ).first()
+        if review_count is None:
+            return fail_response(
+                "Recipe not found", status=status.HTTP_404_NOT_FOUND
+            )
+
+        page = self.paginator.paginate_queryset(
+            get_recipe_reviews(kwargs['pk']), request, view=self
+        )
+        return success_response(
+            {
+                'count': review_count,
+                **self.paginator.get_paginated_data(
+                    recipe_review_values_serializer.serialize(page)
+                )
+            },
+            status=status.HTTP_200_OK
+        )
@@ -1,46 +1,56 @@
 from rest_framework import status
 from rest_framework.generics import GenericAPIView
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
-from django.db.models import Q
-from recipe.models import Recipe
-from recipe.api.serializer import RecipeSerializer
-from recipe.utils import get_fail_response, get_success_response
+from recipe.api.serializer import (
+    RecipeSerializer,
+    recipe_values_serializer,
+    get_fieldset
+)
+from recipe.services import search_recipes
+from recipe.utils import fail_response, success_response
 
 
 class SearchAPI(GenericAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = RecipeSerializer
+    values_serializer = recipe_values_serializer
 
     @swagger_auto_schema(
         tags=['Search & Filter'],
-        operation_description="Search API",
+        operation_description="Full-text search over recipe title, "
+                              "category, ingredients and description, "
+                              "ranked by relevance. `?fields=card` (or "
+                              "`full`, or a comma separated list of fields) "
+                              "limits the returned fields.",
         responses={200: RecipeSerializer(many=True)}
     )
     def get(self, request, *args, **kwargs):
-        query = kwargs.get('query', None)
+        query = kwargs.get('query', '').strip()
 
         if query:
-            search_results = Recipe.objects.filter(
-                Q(title__icontains=query) |
-                Q(category__name__icontains=query) |
-                Q(description__icontains=query) |
-                Q(ingredients__icontains=query) |
-                Q(cooking_time__icontains=query) |
-                Q(serving_size__icontains=query)
-            ).distinct()
+            values_serializer = self.values_serializer.for_fields(
+                get_fieldset(request, self.serializer_class)
+            )
+            search_results = search_recipes(
+                query, values=values_serializer.columns
+            )
 
-            if search_results.exists():
-                serializer = self.get_serializer(search_results, many=True)
-                response = get_success_response()
-                response['data']['search_results'] = serializer.data
-                return Response(response, status=status.HTTP_200_OK)
+            if search_results:
+                return success_response(
+                    {
+                        'search_results': values_serializer.serialize(
+                            search_results
+                        )
+                    },
+                    status=status.HTTP_200_OK
+                )
             else:
-                response = get_fail_response()
-                response['message'] = "No results found"
-                return Response(response, status=status.HTTP_404_NOT_FOUND)
+                return fail_response(
+                    "No results found", status=status.HTTP_404_NOT_FOUND
+                )
         else:
-            response = get_fail_response()
-            response['message'] = "Please enter a search query"
-            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+            return fail_response(
+                "Please enter a search query",
+                status=status.HTTP_400_BAD_REQUEST
+            )
@@ -1,32 +1,67 @@
 from .auth_serializer import (
     SignupSerializer,
-    LoginSerializer
+    LoginSerializer,
+    UserProvisionSerializer,
+    UserProvisionRequestSerializer
 )
 from .recipe_serializer import (
     CreateRecipeSerializer,
+    RecipeImportRequestSerializer,
+    RecipeExportRequestSerializer,
     RecipeSerializer,
     ListRequestRecipeSerializer,
-    UpdateRecipeSerializer
+    PantryMatchRequestSerializer,
+    UpdateRecipeSerializer,
+    RECIPE_ORDERINGS,
+    recipe_values_serializer
 )
 from .review_serializer import (
     ReviewSerializer,
-    ReviewCreateSerializer
+    ReviewCreateSerializer,
+    ReviewBatchRequestSerializer,
+    RecipeReviewSerializer,
+    RecipeReviewListRequestSerializer,
+    REVIEW_ORDERINGS,
+    recipe_review_values_serializer,
+    review_export_values_serializer
 )
+from .values_serializer import ValuesSerializer
+from .fieldsets import get_fieldset, get_fieldset_columns
 from .category_serializer import (
     CategoryCreateSerializer,
-    CategoryDetailSerializer
+    CategoryDetailSerializer,
+    CategoryListSerializer,
+    CategoryStatsSerializer
 )
 
 __all__ = [
     "SignupSerializer",
     "LoginSerializer",
+    "UserProvisionSerializer",
+    "UserProvisionRequestSerializer",
     "CreateRecipeSerializer",
+    "RecipeImportRequestSerializer",
+    "RecipeExportRequestSerializer",
     "ReviewSerializer",
     "ReviewCreateSerializer",
+    "ReviewBatchRequestSerializer",
+    "RecipeReviewSerializer",
+    "RecipeReviewListRequestSerializer",
+    "REVIEW_ORDERINGS",
+    "recipe_review_values_serializer",
+    "review_export_values_serializer",
     "CategoryCreateSerializer",
-    "CategoryDetailSerializer"
+    "CategoryDetailSerializer",
+    "CategoryListSerializer",
+    "CategoryStatsSerializer",
     "RecipeSerializer",
     "ListRequestRecipeSerializer",
+    "PantryMatchRequestSerializer",
     "UpdateRecipeSerializer",
+    "RECIPE_ORDERINGS",
+    "recipe_values_serializer",
+    "ValuesSerializer",
+    "get_fieldset",
+    "get_fieldset_columns",
     "ReviewSerializer"
 ]
@@ -2,14 +2,18 @@ from rest_framework import serializers
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth import authenticate
 from recipe.models import User
+from recipe.api.serializer.timing import TimedSerializerMixin
+from recipe.services.importer import IMPORT_FORMATS
 from recipe.utils import (
     validate_phone_number,
+    validate_phone_number_format,
     validate_password,
-    validate_email
+    validate_email,
+    validate_email_format
 )
 
 
-class SignupSerializer(serializers.ModelSerializer):
+class SignupSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     first_name = serializers.CharField(max_length=30)
     last_name = serializers.CharField(max_length=30)
     email = serializers.EmailField()
@@ -41,6 +45,30 @@ class SignupSerializer(serializers.ModelSerializer):
         return user
 
 
+class UserProvisionSerializer(SignupSerializer):
+    """
+        `SignupSerializer` rules for bulk provisioning without a query per
+        row: email and phone number uniqueness is checked by the
+        provisioner with one ``IN`` query each per chunk.
+    """
+
+    def validate_email(self, value):
+        validate_email_format(value)
+        return value
+
+    def validate_phone_number(self, value):
+        validate_phone_number_format(value)
+        return value
+
+
+class UserProvisionRequestSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    format = serializers.ChoiceField(
+            choices=IMPORT_FORMATS, required=False,
+            help_text="Default: from the file extension"
+        )
+
+
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
@@ -49,10 +77,15 @@ class LoginSerializer(serializers.Serializer):
         email = attrs.get('email')
         password = attrs.get('password')
 
-        # Check if the user exists and provided correct credentials
+        # Check if the user exists and provided correct credentials. The
+        # user is returned in ``validated_data`` so the password is hashed
+        # once per login.
         if email and password:
-            user = authenticate(username=email, password=password)
+            user = authenticate(
+                self.context.get('request'), username=email, password=password
+            )
             if not user:
                 raise serializers.ValidationError("Invalid credentials")
+            attrs['user'] = user
 
         return attrs
@@ -1,8 +1,10 @@
 from rest_framework import serializers
-from recipe.models import Category
+from recipe.models import Category, CategoryStats
+from recipe.api.serializer.timing import TimedSerializerMixin
 
 
-class CategoryCreateSerializer(serializers.ModelSerializer):
+class CategoryCreateSerializer(TimedSerializerMixin,
+                               serializers.ModelSerializer):
 
     class Meta:
         model = Category
@@ -12,7 +14,8 @@ class CategoryCreateSerializer(serializers.ModelSerializer):
         return Category.objects.create(**validated_data)
     
 
-class CategoryDetailSerializer(serializers.ModelSerializer):
+class CategoryDetailSerializer(TimedSerializerMixin,
+                               serializers.ModelSerializer):
 
     class Meta:
         model = Category
@@ -23,4 +26,32 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
         instance.name = validated_data.get('name', instance.name)
         instance.description = validated_data.get('description', instance.description)
         instance.save()
-        return instance
\ No newline at end of file
+        return instance
+
+class CategoryListSerializer(TimedSerializerMixin,
+                             serializers.ModelSerializer):
+    """
+        Category of the category list, with the number of its recipes
+        (``recipe_count`` annotation).
+    """
+    recipe_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Category
+        fields = ['id', 'name', 'description', 'recipe_count']
+
+
+class CategoryStatsSerializer(TimedSerializerMixin,
+                              serializers.ModelSerializer):
+    category_id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(source='category.name', read_only=True)
+    avg_cooking_time = serializers.FloatField(read_only=True)
+    avg_serving_size = serializers.FloatField(read_only=True)
+    avg_rating = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = CategoryStats
+        fields = [
+            'category_id', 'name', 'recipe_count', 'avg_cooking_time',
+            'avg_serving_size', 'avg_rating', 'review_count', 'updated_at'
+        ]
@@ -0,0 +1,82 @@
+"""
+    Sparse fieldsets: ``?fields=`` selects which keys of a serializer are
+    fetched and returned.
+
+    The value is either a preset declared in the serializer's ``fieldsets``
+    attribute (``card``), ``full`` for every field, or a comma separated
+    list of field names. Views restrict their SQL columns to the sources of
+    the selected fields so large text columns are never loaded when the
+    client does not need them.
+"""
+from functools import lru_cache
+from rest_framework import serializers
+
+FIELDSET_QUERY_PARAM = 'fields'
+FULL_FIELDSET = 'full'
+
+
+@lru_cache(maxsize=None)
+def get_readable_fields(serializer_class) -> dict:
+    """
+        Field name to source of every field ``serializer_class`` outputs,
+        in declaration order.
+    """
+    return {
+        name: field.source
+        for name, field in serializer_class().fields.items()
+        if not field.write_only
+    }
+
+
+def parse_fieldset(serializer_class, value=None) -> tuple:
+    """
+        Returns the field names selected by ``value``, in declaration order
+        so equal selections share cache entries and ETags.
+    """
+    readable_fields = get_readable_fields(serializer_class)
+    if not value or value == FULL_FIELDSET:
+        return tuple(readable_fields)
+
+    presets = getattr(serializer_class, 'fieldsets', {})
+    if value in presets:
+        requested = set(presets[value])
+    else:
+        requested = {name.strip() for name in value.split(',') if name.strip()}
+
+    if not requested or requested.difference(readable_fields):
+        raise serializers.ValidationError({
+            FIELDSET_QUERY_PARAM: [
+                f"Invalid fields '{value}'. Use "
+                f"{', '.join([FULL_FIELDSET, *presets])} or a comma "
+                f"separated list of: {', '.join(readable_fields)}."
+            ]
+        })
+    return tuple(name for name in readable_fields if name in requested)
+
+
+def get_fieldset(request, serializer_class) -> tuple:
+    return parse_fieldset(
+        serializer_class, request.query_params.get(FIELDSET_QUERY_PARAM)
+    )
+
+
+def get_fieldset_columns(serializer_class, fieldset) -> tuple:
+    """
+        Model columns needed to serialize ``fieldset``.
+    """
+    readable_fields = get_readable_fields(serializer_class)
+    return tuple(dict.fromkeys(readable_fields[name] for name in fieldset))
+
+
+class SparseFieldsetMixin:
+    """
+        Accepts a ``fields`` keyword argument with the field names to keep.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fieldset = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fieldset is not None:
+            for name in set(self.fields).difference(fieldset):
+                if not self.fields[name].write_only:
+                    self.fields.pop(name)
@@ -1,8 +1,15 @@
 from rest_framework import serializers
 from recipe.models import Recipe, Category
+from recipe.api.filter import recipe_filter_planner
+from recipe.api.serializer.fieldsets import SparseFieldsetMixin
+from recipe.api.serializer.timing import TimedSerializerMixin
+from recipe.api.serializer.values_serializer import ValuesSerializer
+from recipe.services.exporter import EXPORT_FORMATS, EXPORT_STREAMS
+from recipe.services.importer import IMPORT_FORMATS
 
 
-class CreateRecipeSerializer(serializers.ModelSerializer):
+class CreateRecipeSerializer(TimedSerializerMixin,
+                             serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
     category_id = serializers.PrimaryKeyRelatedField(
             queryset=Category.objects.all(), source='category'
@@ -44,19 +51,127 @@ class CreateRecipeSerializer(serializers.ModelSerializer):
         return recipe
 
 
+class CachedCategoryField(serializers.PrimaryKeyRelatedField):
+    """
+        Resolves the category from ``context['categories']``, a dict of
+        the categories of the current import chunk fetched in one query.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            category_id = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        category = self.context['categories'].get(category_id)
+        if category is None:
+            self.fail('does_not_exist', pk_value=data)
+        return category
+
+
+class RecipeImportSerializer(CreateRecipeSerializer):
+    """
+        `CreateRecipeSerializer` rules for bulk imports without a query per
+        row: categories come from a per-chunk cache and title uniqueness
+        is checked by the importer with one query per chunk. The owner is
+        set by the importer.
+    """
+    user = None
+    title = serializers.CharField(max_length=100)
+    category_id = CachedCategoryField(
+            queryset=Category.objects.all(), source='category'
+        )
+
+    class Meta(CreateRecipeSerializer.Meta):
+        fields = tuple(
+            name for name in CreateRecipeSerializer.Meta.fields
+            if name != 'user'
+        )
+
+
+class RecipeImportRequestSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    format = serializers.ChoiceField(
+            choices=IMPORT_FORMATS, required=False,
+            help_text="Default: from the file extension"
+        )
+
+
+class RecipeExportRequestSerializer(serializers.Serializer):
+    output = serializers.ChoiceField(
+            choices=list(EXPORT_FORMATS), default='ndjson'
+        )
+    stream = serializers.ChoiceField(
+            choices=EXPORT_STREAMS, default='recipes',
+            help_text="Export the matching recipes or their reviews"
+        )
+
+
+# Orderings accepted by the recipe list endpoint. Each one is backed by a
+# composite index on `Recipe` (and a per-category one), and ends with `id`
+# so it is a total order usable for keyset pagination.
+RECIPE_ORDERINGS = {
+    'newest': ('-created_at', '-id'),
+    'top_rated': ('-avg_rating', '-id'),
+    'quickest': ('cooking_time', 'id'),
+    'serving_size': ('serving_size', 'id'),
+}
+
+
 class ListRequestRecipeSerializer(serializers.Serializer):
     filters = serializers.JSONField(required=False)
+    ordering = serializers.ChoiceField(
+            choices=list(RECIPE_ORDERINGS), default='newest'
+        )
+
+    def validate_filters(self, value):
+        """
+            Compiles the filters into a `Q` object, rejecting fields,
+            lookups and combinations outside `RECIPE_FILTER_FIELDS`.
+        """
+        return recipe_filter_planner.compile(value)
+
+
+class PantryMatchRequestSerializer(serializers.Serializer):
+    ingredients = serializers.ListField(
+            child=serializers.CharField(max_length=100),
+            allow_empty=False,
+            max_length=100
+        )
+    max_missing = serializers.IntegerField(min_value=0, required=False)
+    limit = serializers.IntegerField(
+            min_value=1, max_value=100, default=20
+        )
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     avg_rating = serializers.FloatField(read_only=True)
 
+    # `?fields=` presets, see `recipe.api.serializer.fieldsets`.
+    fieldsets = {
+        'card': (
+            'id', 'title', 'category', 'avg_rating', 'review_count',
+            'cooking_time', 'serving_size', 'created_at'
+        ),
+    }
+
     class Meta:
         model = Recipe
-        fields = '__all__'
+        # The rating histogram and review timestamp are internal.
+        exclude = (
+            'search_document', 'rating_1_count', 'rating_2_count',
+            'rating_3_count', 'rating_4_count', 'rating_5_count',
+            'last_review_at'
+        )
 
 
-class UpdateRecipeSerializer(serializers.ModelSerializer):
+# Same output as RecipeSerializer, for rows fetched with `values()`.
+recipe_values_serializer = ValuesSerializer(RecipeSerializer)
+
+
+class UpdateRecipeSerializer(SparseFieldsetMixin, TimedSerializerMixin,
+                             serializers.ModelSerializer):
     user_id = serializers.HiddenField(default=serializers.CurrentUserDefault())
     id = serializers.IntegerField(read_only=True)
     title = serializers.CharField(max_length=100, required=False)
@@ -69,6 +184,10 @@ class UpdateRecipeSerializer(serializers.ModelSerializer):
             queryset=Category.objects.all(), source='category', required=False
         )
 
+    fieldsets = {
+        'card': ('id', 'title', 'category_id', 'cooking_time', 'serving_size'),
+    }
+
     class Meta:
         model = Recipe
         fields = (
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from recipe.models import Review, Recipe
+from recipe.api.serializer.timing import TimedSerializerMixin
+from recipe.api.serializer.values_serializer import ValuesSerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username')
     recipe = serializers.ReadOnlyField(source='recipe.title')
 
@@ -17,7 +19,8 @@ class ReviewSerializer(serializers.ModelSerializer):
         return value
     
 
-class ReviewCreateSerializer(serializers.ModelSerializer):
+class ReviewCreateSerializer(TimedSerializerMixin,
+                             serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username')
     recipe_id = serializers.IntegerField(write_only=True)
 
@@ -26,6 +29,11 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
         fields = ['user', 'recipe_id', 'id', 'recipe', 'rating', 'comment']
         read_only_fields = ['user', 'recipe']
 
+    def validate_rating(self, value):
+        if value < 1 or value > 5:
+            raise serializers.ValidationError("Rating must be between 1 and 5.")
+        return value
+
     def create(self, validated_data):
         recipe_id = validated_data.pop('recipe_id')
         try:
@@ -35,3 +43,57 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
 
         review = Review.objects.create(recipe=recipe, **validated_data)
         return review
+
+
+class ReviewBatchRequestSerializer(serializers.Serializer):
+    reviews = serializers.ListField(
+            child=serializers.DictField(),
+            allow_empty=False,
+            max_length=1000,
+            help_text="Reviews with the fields of Create Review"
+        )
+
+
+# Orderings of a recipe's reviews, each backed by an index on `Review` and
+# ending with `id` so it can be used for keyset pagination.
+REVIEW_ORDERINGS = {
+    'recent': ('-created_at', '-id'),
+    'top_rated': ('-rating', '-id'),
+}
+
+
+class RecipeReviewSerializer(TimedSerializerMixin,
+                             serializers.ModelSerializer):
+    first_name = serializers.ReadOnlyField(source='user.first_name')
+    last_name = serializers.ReadOnlyField(source='user.last_name')
+
+    class Meta:
+        model = Review
+        fields = [
+            'id', 'rating', 'comment', 'first_name', 'last_name',
+            'created_at', 'updated_at'
+        ]
+
+
+# Same output as RecipeReviewSerializer, for rows fetched with `values()`.
+recipe_review_values_serializer = ValuesSerializer(RecipeReviewSerializer)
+
+
+class RecipeReviewListRequestSerializer(serializers.Serializer):
+    ordering = serializers.ChoiceField(
+            choices=list(REVIEW_ORDERINGS), default='recent'
+        )
+
+
+class ReviewExportSerializer(TimedSerializerMixin,
+                             serializers.ModelSerializer):
+
+    class Meta:
+        model = Review
+        fields = [
+            'id', 'recipe', 'user', 'rating', 'comment',
+            'created_at', 'updated_at'
+        ]
+
+
+review_export_values_serializer = ValuesSerializer(ReviewExportSerializer)
@@ -0,0 +1,16 @@
+"""
+    Serialization timing for the per-request metrics (`recipe_radar.metrics`).
+"""
+from recipe_radar.metrics import time_serialize
+
+
+class TimedSerializerMixin:
+    """
+        Adds the time spent in ``to_representation()`` to the serialization
+        time of the current request. The items of a ``many=True`` serializer
+        are timed one by one, nested serializers count once.
+    """
+
+    def to_representation(self, instance):
+        with time_serialize():
+            return super().to_representation(instance)
@@ -0,0 +1,112 @@
+from functools import cached_property
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from recipe_radar.metrics import time_serialize
+
+# Fields whose `to_representation()` returns the value the database driver
+# already produced, so the plan copies it as is.
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+    serializers.SlugField,
+)
+
+
+class ValuesSerializer:
+    """
+        Read-only serializer for rows fetched with ``QuerySet.values()``.
+
+        The fields of ``serializer_class`` are compiled once into a plan of
+        ``(key, column, to_representation)`` entries, and each row is then
+        mapped with a plain loop instead of going through the serializer
+        machinery for every field of every row. Output is identical to
+        ``serializer_class(instances, many=True).data``.
+
+        Supported fields are model columns, columns of related models
+        (``source='user.first_name'``, fetched with a join) and primary key
+        relations. Anything else raises ImproperlyConfigured when the plan
+        is compiled. ``fields`` restricts the output to a sparse fieldset.
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        self.fields = None if fields is None else frozenset(fields)
+        self._fieldsets = {}
+
+    def for_fields(self, fields) -> 'ValuesSerializer':
+        """
+            Returns the (cached) serializer of the ``fields`` fieldset.
+        """
+        fields = tuple(fields)
+        serializer = self._fieldsets.get(fields)
+        if serializer is None:
+            serializer = ValuesSerializer(self.serializer_class, fields)
+            self._fieldsets[fields] = serializer
+        return serializer
+
+    @cached_property
+    def plan(self) -> tuple:
+        plan = []
+        for key, field in self.serializer_class().fields.items():
+            if field.write_only or (
+                    self.fields is not None and key not in self.fields):
+                continue
+            if field.source == '*':
+                raise ImproperlyConfigured(
+                    f"{self.serializer_class.__name__}.{key} is not a column "
+                    "and cannot be read from values()"
+                )
+            # ``user.first_name`` is read through the join ``user__first_name``.
+            column = field.source.replace('.', '__')
+            if type(field) in PASSTHROUGH_FIELDS:
+                to_representation = None
+            elif (type(field) is serializers.PrimaryKeyRelatedField
+                    and field.pk_field is None):
+                # values() returns the related id, which is the output.
+                to_representation = None
+            elif isinstance(field, (serializers.DateTimeField,
+                                    serializers.DateField,
+                                    serializers.TimeField,
+                                    serializers.DecimalField,
+                                    serializers.UUIDField)):
+                to_representation = field.to_representation
+            else:
+                raise ImproperlyConfigured(
+                    f"{self.serializer_class.__name__}.{key} "
+                    f"({type(field).__name__}) is not supported by "
+                    "ValuesSerializer"
+                )
+            plan.append((key, column, to_representation))
+        return tuple(plan)
+
+    @property
+    def columns(self) -> tuple:
+        """
+            Arguments for ``QuerySet.values()``.
+        """
+        return tuple(column for _, column, _ in self.plan)
+
+    @property
+    def keys(self) -> tuple:
+        """
+            Keys of the serialized rows, in order.
+        """
+        return tuple(key for key, _, _ in self.plan)
+
+    def to_representation(self, row) -> dict:
+        data = {}
+        for key, column, to_representation in self.plan:
+            value = row[column]
+            if to_representation is not None and value is not None:
+                value = to_representation(value)
+            data[key] = value
+        return data
+
+    def serialize(self, rows) -> list:
+        to_representation = self.to_representation
+        with time_serialize():
+            return [to_representation(row) for row in rows]
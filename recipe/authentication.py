@@ -0,0 +1,95 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+        `JWTAuthentication` resolving the token's user through
+        `recipe.services.user_cache` instead of a query per request. The
+        token and the user are checked exactly as by `JWTAuthentication`
+        and fail with the same errors.
+    """
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+    def get_user(self, validated_token):
+        from recipe.services.user_cache import get_user_cache
+
+        user_id = self.get_user_id(validated_token)
+
+        def load():
+            return self.user_model.objects.get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+
+        try:
+            user = get_user_cache().get_or_load(user_id, load)
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        return self.check_user(user, validated_token)
+
+    def check_user(self, user, validated_token):
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."),
+                    code="password_changed"
+                )
+
+        return user
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    """
+        `CachedJWTAuthentication` with an ``aauthenticate`` coroutine for
+        the async views, which loads uncached users with the async ORM.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        from recipe.services.user_cache import get_user_cache
+
+        user_id = self.get_user_id(validated_token)
+
+        async def load():
+            return await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+
+        try:
+            user = await get_user_cache().aget_or_load(user_id, load)
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        return self.check_user(user, validated_token)
@@ -0,0 +1,32 @@
+"""
+    Custom model fields used by the `recipe` app.
+"""
+from django.db import models
+from django.db.models import Lookup
+
+
+class SearchDocumentField(models.TextField):
+    """
+        Column holding the full-text search document of a recipe.
+
+        The column is a ``tsvector`` on PostgreSQL so it can be GIN indexed
+        and matched with ``@@``. Every other backend stores it as plain text.
+    """
+
+    def db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return 'tsvector'
+        return super().db_type(connection)
+
+
+@SearchDocumentField.register_lookup
+class SearchDocumentMatch(Lookup):
+    """
+        ``search_document__match=SearchQuery(...)`` on PostgreSQL.
+    """
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} @@ {rhs}', [*lhs_params, *rhs_params]
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+        Django's PBKDF2 hasher with the work factor taken from the
+        ``PASSWORD_HASHER_ITERATIONS`` setting. The algorithm name is
+        unchanged, so existing hashes verify as before and hashes with a
+        different iteration count are re-hashed by ``check_password`` on the
+        next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(
+            settings, 'PASSWORD_HASHER_ITERATIONS',
+            hashers.PBKDF2PasswordHasher.iterations
+        )
@@ -0,0 +1,43 @@
+"""
+    Helpers shared by the ``bench_*`` management commands.
+"""
+import math
+import timeit
+from contextlib import contextmanager
+from django.db import connection
+
+
+@contextmanager
+def throwaway_database(verbosity=0):
+    """
+        Runs the block against a freshly migrated test database that is
+        destroyed afterwards, so benchmarks never touch real data.
+    """
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(
+        verbosity=verbosity, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+
+
+def measure(function, number, repeat=3) -> float:
+    """
+        Best time of ``repeat`` runs, in seconds per call of ``function``.
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def percentiles(samples, points=(50, 95, 99)) -> dict:
+    """
+        Nearest-rank percentiles of ``samples``, ``{point: value}``.
+    """
+    samples = sorted(samples)
+    if not samples:
+        return {point: None for point in points}
+    return {
+        point: samples[max(0, math.ceil(point / 100 * len(samples)) - 1)]
+        for point in points
+    }
@@ -0,0 +1,425 @@
+import json
+import random
+import statistics
+import time
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from recipe.api.serializer import RECIPE_ORDERINGS
+from recipe.management.commands._bench import percentiles, throwaway_database
+from recipe.models import Category, Recipe, Review, User
+from recipe.services.category_stats import rebuild_category_stats
+from recipe.services.ratings import rebuild_rating_aggregates
+from recipe.services.signals import recipes_bulk_created
+
+PASSWORD = 'Bench-passw0rd'
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MIN_REGRESSION_MS = 1.0
+
+DISHES = (
+    'cake', 'curry', 'soup', 'salad', 'pasta', 'bread', 'stew', 'pie',
+    'noodles', 'risotto', 'tacos', 'pancakes',
+)
+ADJECTIVES = (
+    'spicy', 'creamy', 'quick', 'smoky', 'lemon', 'garlic', 'honey',
+    'rustic', 'roasted', 'vegan',
+)
+INGREDIENTS = (
+    'flour', 'egg', 'milk', 'sugar', 'butter', 'salt', 'onion', 'garlic',
+    'tomato', 'rice', 'chicken', 'lentils', 'cream', 'cheese', 'basil',
+    'lemon', 'honey', 'potato', 'carrot', 'chili',
+)
+
+# Latencies compared with the baseline. Regressions of the gated ones fail
+# the command; the advisory ones are only reported, their tail being too
+# noisy between runs of unchanged code. p99 is not compared at all.
+GATED_LATENCIES = ('p50_ms',)
+ADVISORY_LATENCIES = ('p95_ms',)
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = ("Seed a deterministic synthetic dataset into a throwaway "
+            "database, drive the API endpoints and report p50/p95/p99 "
+            "latency, queries per request and rows/sec. Results can be "
+            "saved as JSON and compared with a saved baseline, failing on "
+            "regressions.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--recipes', type=int, default=2000)
+        parser.add_argument('--reviews', type=int, default=10000)
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help="Measured requests per endpoint and run"
+        )
+        parser.add_argument(
+            '--runs', type=int, default=3,
+            help="Runs per endpoint; the reported p50 is the median of the "
+                 "p50 of each run"
+        )
+        parser.add_argument(
+            '--auth-requests', type=int, default=5,
+            help="Measured requests of signup and login, which are "
+                 "dominated by password hashing (see bench_login)"
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=2,
+            help="Unmeasured requests per endpoint before measuring"
+        )
+        parser.add_argument(
+            '--output', help="Write the results to this JSON file"
+        )
+        parser.add_argument(
+            '--baseline',
+            help="Compare with the results saved in this JSON file and "
+                 "fail on regressions"
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=DEFAULT_TOLERANCE,
+            help="Allowed p50 increase relative to the baseline before "
+                 "it counts as a regression (default 0.25)"
+        )
+        parser.add_argument(
+            '--min-regression-ms', type=float,
+            default=DEFAULT_MIN_REGRESSION_MS,
+            help="Smallest p50 increase, in milliseconds, that counts as a "
+                 "regression (default 1.0)"
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as file:
+                    baseline = json.load(file)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read baseline: {exc}")
+
+        dataset = {
+            name: options[name]
+            for name in ('seed', 'users', 'categories', 'recipes', 'reviews')
+        }
+        if baseline is not None and baseline.get('dataset') != dataset:
+            raise CommandError(
+                f"Baseline was recorded on another dataset "
+                f"({baseline.get('dataset')}), run with the same options"
+            )
+
+        with throwaway_database():
+            self.rng = random.Random(options['seed'])
+            started_at = time.perf_counter()
+            self.seed(**dataset)
+            self.stdout.write(
+                f"Seeded {options['users']} users, "
+                f"{options['categories']} categories, "
+                f"{options['recipes']} recipes and {options['reviews']} "
+                f"reviews in {time.perf_counter() - started_at:.1f} s"
+            )
+            self.client = Client(
+                headers={'Authorization': f'Bearer {self.get_token()}'}
+            )
+            endpoints = {}
+            self.stdout.write(
+                f"{'endpoint':<16}{'requests':>9}{'p50 ms':>9}{'p95 ms':>9}"
+                f"{'p99 ms':>9}{'queries':>9}{'rows/s':>10}"
+            )
+            for name, requests in self.get_endpoints(options):
+                result = endpoints[name] = self.run_endpoint(
+                    requests, options['warmup'], options['runs']
+                )
+                self.stdout.write(
+                    f"{name:<16}{result['requests']:>9}"
+                    f"{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+                    f"{result['p99_ms']:>9.2f}"
+                    f"{result['queries_per_request']:>9.2f}"
+                    f"{result['rows_per_second']:>10.0f}"
+                )
+
+        results = {
+            'dataset': dataset,
+            'database': connection.vendor,
+            'password_hasher_iterations': settings.PASSWORD_HASHER_ITERATIONS,
+            'endpoints': endpoints,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(results, file, indent=2)
+                file.write('\n')
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if baseline is not None:
+            regressions, warnings = self.compare(
+                results, baseline, options['tolerance'],
+                options['min_regression_ms']
+            )
+            for warning in warnings:
+                self.stdout.write(
+                    self.style.WARNING(f"{warning} (advisory)")
+                )
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions)} regression(s) against "
+                    f"{options['baseline']}:\n" + '\n'.join(regressions)
+                )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"No regressions against {options['baseline']}"
+                )
+            )
+
+    def seed(self, seed, users, categories, recipes, reviews):
+        rng = self.rng
+        # Hashed once: every seeded user shares the password.
+        password = make_password(PASSWORD)
+        self.users = User.objects.bulk_create(
+            (
+                User(
+                    email=f'bench{index}@example.com',
+                    first_name='Bench',
+                    last_name=f'User {index}',
+                    phone_number=f'9{index:09d}',
+                    password=password,
+                )
+                for index in range(users)
+            ),
+            batch_size=500
+        )
+        self.categories = Category.objects.bulk_create(
+            Category(name=f'Category {index}', description=f'Category {index}')
+            for index in range(categories)
+        )
+        self.recipes = Recipe.objects.bulk_create(
+            (
+                Recipe(
+                    user=rng.choice(self.users),
+                    category=rng.choice(self.categories),
+                    title=f'{rng.choice(ADJECTIVES).title()} '
+                          f'{rng.choice(DISHES)} {index}',
+                    description=' '.join(
+                        rng.choices(ADJECTIVES + DISHES, k=30)
+                    ),
+                    ingredients='\n'.join(rng.sample(INGREDIENTS, k=6)),
+                    preparation_steps='Mix everything and cook. ' * 10,
+                    cooking_time=rng.randint(5, 120),
+                    serving_size=rng.randint(1, 8),
+                )
+                for index in range(recipes)
+            ),
+            batch_size=500
+        )
+        recipes_bulk_created.send(sender=Recipe, recipes=self.recipes)
+        Review.objects.bulk_create(
+            (
+                Review(
+                    user=rng.choice(self.users),
+                    recipe=rng.choice(self.recipes),
+                    rating=rng.randint(1, 5),
+                    comment=' '.join(rng.choices(ADJECTIVES, k=8)),
+                )
+                for _ in range(reviews)
+            ),
+            batch_size=500
+        )
+        rebuild_rating_aggregates()
+        rebuild_category_stats()
+
+    def get_token(self) -> str:
+        return str(AccessToken.for_user(self.users[0]))
+
+    def get_endpoints(self, options):
+        """
+            Yields ``(name, requests)``, ``requests`` being a function of
+            the request index returning the ``(method, path, body)`` of the
+            request. Choices come from the seeded random generator, so every
+            run sends the same requests.
+        """
+        rng = self.rng
+        count, auth_count = options['requests'], options['auth_requests']
+
+        def signup(index):
+            return 'post', reverse('signup'), {
+                'first_name': 'Bench',
+                'last_name': f'Signup {index}',
+                'email': f'bench-signup{index}@example.com',
+                'phone_number': f'8{index:09d}',
+                'password': PASSWORD,
+            }
+
+        def login(index):
+            return 'post', reverse('login'), {
+                'email': rng.choice(self.users).email, 'password': PASSWORD,
+            }
+
+        def list_recipes(index):
+            return 'post', reverse('list-recipes'), {
+                'ordering': rng.choice(list(RECIPE_ORDERINGS)),
+            }
+
+        def list_filtered(index):
+            return 'post', reverse('list-recipes'), {
+                'ordering': rng.choice(list(RECIPE_ORDERINGS)),
+                'filters': {
+                    'category': rng.choice(self.categories).pk,
+                    'cooking_time__lte': rng.randint(30, 90),
+                },
+            }
+
+        def list_cursor(index):
+            return 'post', reverse('list-recipes') + '?pagination=cursor', {
+                'ordering': rng.choice(list(RECIPE_ORDERINGS)),
+            }
+
+        def search(index):
+            return 'get', reverse('search', args=[rng.choice(DISHES)]), None
+
+        def detail(index):
+            return 'get', reverse(
+                'update-recipe', args=[rng.choice(self.recipes).pk]
+            ), None
+
+        def recipe_reviews(index):
+            return 'get', reverse(
+                'recipe-reviews', args=[rng.choice(self.recipes).pk]
+            ), None
+
+        def review_create(index):
+            return 'post', reverse('review-list-create'), {
+                'recipe_id': rng.choice(self.recipes).pk,
+                'rating': rng.randint(1, 5),
+                'comment': 'Benchmark review',
+            }
+
+        def categories(index):
+            return 'get', reverse('category-list-create'), None
+
+        def category_stats(index):
+            return 'get', reverse('category-stats'), None
+
+        yield 'signup', (signup, auth_count)
+        yield 'login', (login, auth_count)
+        yield 'list', (list_recipes, count)
+        yield 'list_filtered', (list_filtered, count)
+        yield 'list_cursor', (list_cursor, count)
+        yield 'search', (search, count)
+        yield 'detail', (detail, count)
+        yield 'recipe_reviews', (recipe_reviews, count)
+        yield 'review_create', (review_create, count)
+        yield 'categories', (categories, count)
+        yield 'category_stats', (category_stats, count)
+
+    def send(self, method, path, body):
+        if body is None:
+            response = getattr(self.client, method)(path)
+        else:
+            response = getattr(self.client, method)(
+                path, json.dumps(body), content_type='application/json'
+            )
+        if response.status_code >= 400:
+            raise CommandError(
+                f"{method.upper()} {path} failed with "
+                f"{response.status_code}: {response.content[:500]!r}"
+            )
+        return response
+
+    def count_rows(self, response) -> int:
+        """
+            Rows in the response: the items of a list or page, else one.
+        """
+        data = json.loads(response.content)
+        if isinstance(data, dict) and 'data' in data:
+            data = data['data']
+        if isinstance(data, dict):
+            for key in ('results', 'search_results'):
+                if isinstance(data.get(key), list):
+                    return len(data[key])
+        if isinstance(data, list):
+            return len(data)
+        return 1
+
+    def run_endpoint(self, requests, warmup, runs) -> dict:
+        """
+            Measures ``runs`` runs of the endpoint's requests. The p50 is
+            the median of the per-run p50s, so one slow run does not move
+            it; p95 and p99 are taken over every request.
+        """
+        build, count = requests
+        total = count * runs
+        for index in range(warmup):
+            self.send(*build(total + index))
+
+        counter = QueryCounter()
+        latencies = []
+        run_medians = []
+        rows = 0
+        with connection.execute_wrapper(counter):
+            for run in range(runs):
+                run_latencies = []
+                for index in range(run * count, (run + 1) * count):
+                    request = build(index)
+                    started_at = time.perf_counter()
+                    response = self.send(*request)
+                    run_latencies.append(time.perf_counter() - started_at)
+                    rows += self.count_rows(response)
+                run_medians.append(percentiles(run_latencies)[50])
+                latencies.extend(run_latencies)
+
+        points = percentiles(latencies)
+        return {
+            'requests': total,
+            'p50_ms': round(statistics.median(run_medians) * 1000, 3),
+            'p95_ms': round(points[95] * 1000, 3),
+            'p99_ms': round(points[99] * 1000, 3),
+            'queries_per_request': round(counter.count / total, 2),
+            'rows_per_second': round(rows / sum(latencies), 1),
+        }
+
+    def compare(self, results, baseline, tolerance,
+                min_regression_ms=DEFAULT_MIN_REGRESSION_MS) -> tuple:
+        """
+            Returns ``(regressions, warnings)``, lines for the metrics of
+            ``results`` worse than the ``baseline`` ones. A latency is worse
+            when higher by more than ``tolerance`` and by more than
+            ``min_regression_ms``; it is a regression for `GATED_LATENCIES`
+            and a warning for `ADVISORY_LATENCIES`. Any additional query
+            per request is a regression.
+        """
+        regressions = []
+        warnings = []
+        for name, base in baseline.get('endpoints', {}).items():
+            result = results['endpoints'].get(name)
+            if result is None:
+                regressions.append(f"{name}: missing from the results")
+                continue
+            for metrics, lines in ((GATED_LATENCIES, regressions),
+                                   (ADVISORY_LATENCIES, warnings)):
+                for metric in metrics:
+                    if (result[metric] > base[metric] * (1 + tolerance)
+                            and result[metric] - base[metric]
+                            > min_regression_ms):
+                        lines.append(
+                            f"{name}: {metric} {result[metric]} > "
+                            f"{base[metric]} (+{tolerance:.0%})"
+                        )
+            if result['queries_per_request'] > base['queries_per_request']:
+                regressions.append(
+                    f"{name}: queries_per_request "
+                    f"{result['queries_per_request']} > "
+                    f"{base['queries_per_request']}"
+                )
+        return regressions, warnings
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+from recipe.management.commands._bench import percentiles
+from recipe.models import User
+
+# (name, method, sync path, async path, body) of the compared endpoints.
+ENDPOINTS = (
+    ('search', 'GET', '/api/search/{query}', '/api/async/search/{query}', None),
+    ('detail', 'GET', '/api/recipe/{recipe}', '/api/async/recipe/{recipe}', None),
+    ('categories', 'GET', '/api/categories', '/api/async/categories', None),
+    ('list', 'POST', '/api/recipes?fields=card', '/api/async/recipes?fields=card',
+     {'ordering': 'newest'}),
+)
+
+
+class Command(BaseCommand):
+    help = ("Compare the sync endpoints served by a WSGI server with the "
+            "async ones served by an ASGI server under concurrent slow "
+            "clients. Start both servers first, e.g. `gunicorn -w 4 "
+            "recipe_radar.wsgi -b :8000` and `uvicorn --workers 4 "
+            "recipe_radar.asgi:application --port 8001`.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--asgi-url', default='http://127.0.0.1:8001')
+        parser.add_argument(
+            '--user', required=True,
+            help="Email of the user the requests authenticate as"
+        )
+        parser.add_argument('--clients', type=int, default=100)
+        parser.add_argument(
+            '--requests', type=int, default=5,
+            help="Requests per client and endpoint"
+        )
+        parser.add_argument(
+            '--delay', type=float, default=0.05,
+            help="Seconds a slow client waits between writing header lines "
+                 "and between reading response chunks"
+        )
+        parser.add_argument('--query', default='cake')
+        parser.add_argument('--recipe', type=int, default=1)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user {options['user']}")
+        token = str(AccessToken.for_user(user))
+
+        self.stdout.write(
+            f"{options['clients']} clients x {options['requests']} requests, "
+            f"{options['delay'] * 1000:.0f} ms client delay"
+        )
+        self.stdout.write(
+            f"{'endpoint':<12}{'server':<6}{'req/s':>9}{'p50 ms':>9}"
+            f"{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}"
+        )
+        for name, method, sync_path, async_path, body in ENDPOINTS:
+            for server, base_url, path in (
+                    ('wsgi', options['wsgi_url'], sync_path),
+                    ('asgi', options['asgi_url'], async_path)):
+                path = path.format(
+                    query=options['query'], recipe=options['recipe']
+                )
+                elapsed, latencies, errors = asyncio.run(self.run_load(
+                    base_url, method, path, body, token, options
+                ))
+                points = percentiles(latencies)
+                self.stdout.write(
+                    f"{name:<12}{server:<6}"
+                    f"{len(latencies) / elapsed:>9.1f}"
+                    + ''.join(
+                        f"{(points[point] or 0) * 1000:>9.1f}"
+                        for point in (50, 95, 99)
+                    )
+                    + f"{errors:>8}"
+                )
+
+    async def run_load(self, base_url, method, path, body, token, options):
+        url = urlsplit(base_url)
+        request = self.build_request(
+            method, url.netloc, path, body, token
+        )
+        latencies, errors = [], 0
+
+        async def client():
+            nonlocal errors
+            for _ in range(options['requests']):
+                started = time.perf_counter()
+                try:
+                    status = await self.slow_request(
+                        url.hostname, url.port or 80, request,
+                        options['delay']
+                    )
+                except OSError:
+                    status = None
+                if status == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options['clients'])))
+        return time.perf_counter() - started, latencies, errors
+
+    def build_request(self, method, host, path, body, token) -> list:
+        """
+            The request as a list of lines the slow client writes one at a
+            time.
+        """
+        content = b'' if body is None else json.dumps(body).encode()
+        lines = [
+            f'{method} {path} HTTP/1.1\r\n',
+            f'Host: {host}\r\n',
+            f'Authorization: Bearer {token}\r\n',
+            'Accept: application/json\r\n',
+            'Connection: close\r\n',
+        ]
+        if body is not None:
+            lines += [
+                'Content-Type: application/json\r\n',
+                f'Content-Length: {len(content)}\r\n',
+            ]
+        return [line.encode() for line in lines] + [b'\r\n' + content]
+
+    async def slow_request(self, host, port, request, delay):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for line in request:
+                writer.write(line)
+                await writer.drain()
+                await asyncio.sleep(delay)
+
+            status = int((await reader.readline()).split()[1])
+            while await reader.read(4096):
+                await asyncio.sleep(delay)
+            return status
+        finally:
+            writer.close()
@@ -0,0 +1,97 @@
+import io
+import timeit
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from recipe.api.serializer import RecipeSerializer
+from recipe.models import Recipe
+from recipe.parsers import FastJSONParser
+from recipe.renderers import FastJSONRenderer, orjson
+from recipe.utils import build_envelope
+from recipe_radar.constant import RESPONSE_SUCCESS
+
+
+class Command(BaseCommand):
+    help = "Compare the stock DRF JSON renderer/parser with the fast pair on a recipe list page"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100)
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def build_page(self, rows) -> dict:
+        now = timezone.now()
+        recipes = [
+            Recipe(
+                id=index,
+                user_id=1,
+                category_id=index % 10,
+                title=f"Recipe {index} - café special",
+                description="A long description. " * 20,
+                ingredients="2 cups flour\n1 egg\nmilk\nsugar\nbutter",
+                preparation_steps="Mix everything and bake. " * 10,
+                cooking_time=index % 90,
+                serving_size=index % 6 + 1,
+                avg_rating=index % 5 + 0.25,
+                review_count=index,
+                created_at=now,
+                updated_at=now,
+            )
+            for index in range(rows)
+        ]
+        page = {
+            'count': rows,
+            'next': None,
+            'previous': None,
+            'results': RecipeSerializer(recipes, many=True).data,
+            # Types serializers do not emit themselves but views may.
+            'extra': {
+                'decimal': Decimal('1.25'),
+                'lazy': gettext_lazy('Recipes'),
+                'datetime': now,
+                'line_separator': '\u2028',
+            },
+        }
+        return build_envelope(
+            RESPONSE_SUCCESS['status'], "Fatched Successfully", page
+        )
+
+    def measure(self, function, iterations) -> float:
+        timings = timeit.repeat(function, number=iterations, repeat=3)
+        return min(timings) / iterations
+
+    def report(self, name, stock_time, fast_time):
+        self.stdout.write(
+            f"{name:<7} stock {stock_time * 1e6:9.1f} us  "
+            f"fast {fast_time * 1e6:9.1f} us  "
+            f"x{stock_time / fast_time:.1f}"
+        )
+
+    def handle(self, *args, **options):
+        rows, iterations = options['rows'], options['iterations']
+        data = self.build_page(rows)
+
+        stock_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        body = stock_renderer.render(data)
+        if fast_renderer.render(data) != body:
+            raise CommandError("FastJSONRenderer output differs from JSONRenderer")
+
+        stock_parser, fast_parser = JSONParser(), FastJSONParser()
+        if fast_parser.parse(io.BytesIO(body)) != stock_parser.parse(io.BytesIO(body)):
+            raise CommandError("FastJSONParser output differs from JSONParser")
+
+        backend = 'orjson' if orjson else 'json (orjson not installed)'
+        self.stdout.write(f"fast backend: {backend}")
+        self.stdout.write(f"payload: {rows} recipes, {len(body)} bytes")
+        self.report(
+            'render',
+            self.measure(lambda: stock_renderer.render(data), iterations),
+            self.measure(lambda: fast_renderer.render(data), iterations)
+        )
+        self.report(
+            'parse',
+            self.measure(lambda: stock_parser.parse(io.BytesIO(body)), iterations),
+            self.measure(lambda: fast_parser.parse(io.BytesIO(body)), iterations)
+        )
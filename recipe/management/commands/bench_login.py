@@ -0,0 +1,66 @@
+import json
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+from recipe.management.commands._bench import measure, throwaway_database
+from recipe.models import User
+
+EMAIL = 'bench@example.com'
+PASSWORD = 'Bench-passw0rd'
+
+
+class Command(BaseCommand):
+    help = ("Measure login throughput at one or more PBKDF2 work factors, "
+            "next to the cost of a single password hash")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations', type=int, nargs='+',
+            default=[settings.PASSWORD_HASHER_ITERATIONS],
+            help="PBKDF2 iteration counts to compare"
+        )
+        parser.add_argument('--logins', type=int, default=10)
+
+    def handle(self, *args, **options):
+        client = Client()
+        body = json.dumps({'email': EMAIL, 'password': PASSWORD})
+
+        def login():
+            response = client.post(
+                reverse('login'), body, content_type='application/json'
+            )
+            if response.status_code != 200:
+                raise CommandError(f"Login failed: {response.content!r}")
+
+        with throwaway_database():
+            user = User.objects.create_user(
+                EMAIL, PASSWORD, first_name='Bench', last_name='User',
+                phone_number='9000000000'
+            )
+            self.stdout.write(
+                f"{'iterations':>10} {'hash':>10} {'login':>10} "
+                f"{'logins/s':>9} {'hashes/login':>13}"
+            )
+            for iterations in options['iterations']:
+                with override_settings(PASSWORD_HASHER_ITERATIONS=iterations):
+                    # The first login upgrades the stored hash to this
+                    # work factor.
+                    login()
+                    user.refresh_from_db()
+                    if f'${iterations}$' not in user.password:
+                        raise CommandError(
+                            f"Stored hash was not upgraded to {iterations} "
+                            "iterations"
+                        )
+                    encoded = make_password(PASSWORD)
+                    hash_time = measure(
+                        lambda: check_password(PASSWORD, encoded), 3
+                    )
+                    login_time = measure(login, options['logins'])
+                self.stdout.write(
+                    f"{iterations:>10} {hash_time * 1000:>7.1f} ms "
+                    f"{login_time * 1000:>7.1f} ms {1 / login_time:>9.1f} "
+                    f"{login_time / hash_time:>13.2f}"
+                )
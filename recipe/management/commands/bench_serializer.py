@@ -0,0 +1,81 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from recipe.api.serializer import RecipeSerializer, recipe_values_serializer
+from recipe.management.commands._bench import measure, throwaway_database
+from recipe.models import Category, Recipe, User
+
+
+class Command(BaseCommand):
+    help = ("Compare RecipeSerializer on model instances with the values() "
+            "read path used by the list and search endpoints")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, nargs='+', default=[10, 100, 1000]
+        )
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def seed(self, rows):
+        user = User.objects.create_user(
+            'bench@example.com', 'bench-password',
+            first_name='Bench', last_name='User', phone_number='9000000000'
+        )
+        categories = Category.objects.bulk_create(
+            Category(name=f"Category {index}") for index in range(10)
+        )
+        Recipe.objects.bulk_create(
+            (
+                Recipe(
+                    user=user,
+                    category=categories[index % 10],
+                    title=f"Recipe {index}",
+                    description="A long description. " * 20,
+                    ingredients="2 cups flour\n1 egg\nmilk\nsugar\nbutter",
+                    preparation_steps="Mix everything and bake. " * 10,
+                    cooking_time=index % 90,
+                    serving_size=index % 6 + 1,
+                    avg_rating=index % 5 + 0.25,
+                    review_count=index % 7,
+                )
+                for index in range(rows)
+            ),
+            batch_size=500
+        )
+
+    def serialize_instances(self, rows) -> list:
+        queryset = Recipe.objects.order_by('-created_at', '-id')[:rows]
+        return RecipeSerializer(queryset, many=True).data
+
+    def serialize_values(self, rows) -> list:
+        queryset = Recipe.objects.order_by('-created_at', '-id').values(
+            *recipe_values_serializer.columns
+        )[:rows]
+        return recipe_values_serializer.serialize(queryset)
+
+    def handle(self, *args, **options):
+        sizes, iterations = options['rows'], options['iterations']
+        renderer = JSONRenderer()
+
+        with throwaway_database():
+            self.seed(max(sizes))
+            self.stdout.write(
+                f"{'rows':>6} {'instances':>14} {'values()':>14} {'speedup':>8}"
+            )
+            for rows in sizes:
+                if (renderer.render(self.serialize_instances(rows))
+                        != renderer.render(self.serialize_values(rows))):
+                    raise CommandError(
+                        f"values() output differs from RecipeSerializer "
+                        f"at {rows} rows"
+                    )
+                instances = measure(
+                    lambda: self.serialize_instances(rows), iterations
+                )
+                values = measure(
+                    lambda: self.serialize_values(rows), iterations
+                )
+                self.stdout.write(
+                    f"{rows:>6} {instances / rows * 1e6:>9.1f} us/row "
+                    f"{values / rows * 1e6:>9.1f} us/row "
+                    f"{instances / values:>7.1f}x"
+                )
@@ -0,0 +1,64 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+from recipe.api.filter import RecipeFilter
+from recipe.models import Recipe
+from recipe.services.exporter import (
+    EXPORT_FORMATS,
+    EXPORT_STREAMS,
+    export_recipes
+)
+
+
+class Command(BaseCommand):
+    help = "Stream recipes, or their reviews, as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-format', choices=list(EXPORT_FORMATS), default='ndjson'
+        )
+        parser.add_argument(
+            '--stream', choices=EXPORT_STREAMS, default='recipes',
+            help="Export the matching recipes or their reviews"
+        )
+        parser.add_argument(
+            '--filter', action='append', default=[], metavar='NAME=VALUE',
+            help="RecipeFilter parameter, e.g. --filter category_id=3 "
+                 "(repeatable)"
+        )
+        parser.add_argument(
+            '--output', default='-',
+            help="File to write, or - for standard output"
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def get_recipes(self, filters):
+        params = QueryDict(mutable=True)
+        for item in filters:
+            name, separator, value = item.partition('=')
+            if not separator:
+                raise CommandError(f"Expected NAME=VALUE, got {item!r}")
+            params.appendlist(name, value)
+
+        filterset = RecipeFilter(params, queryset=Recipe.objects.all())
+        if not filterset.is_valid():
+            raise CommandError(filterset.errors.as_text())
+        return filterset.qs
+
+    def handle(self, *args, **options):
+        chunks = export_recipes(
+            self.get_recipes(options['filter']),
+            options['output_format'],
+            options['stream'],
+            options['chunk_size']
+        )
+        if options['output'] == '-':
+            output = sys.stdout.buffer
+            for chunk in chunks:
+                output.write(chunk)
+            output.flush()
+            return
+
+        with open(options['output'], 'wb') as output:
+            for chunk in chunks:
+                output.write(chunk)
@@ -0,0 +1,92 @@
+import io
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from recipe.models import User
+from recipe.services.importer import (
+    IMPORT_FORMATS,
+    RecipeImporter,
+    guess_import_format,
+    read_records
+)
+
+
+class Command(BaseCommand):
+    help = "Stream recipes from a JSON Lines or CSV file into the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help="File to import, or - to read standard input"
+        )
+        parser.add_argument(
+            '--user', required=True,
+            help="Email of the user owning the imported recipes"
+        )
+        parser.add_argument(
+            '--format', choices=IMPORT_FORMATS,
+            help="Input format (default: from the file extension)"
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help="Number of records validated and inserted together"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Number of rows per INSERT statement"
+        )
+        parser.add_argument(
+            '--max-errors', type=int, default=100,
+            help="Number of row errors printed"
+        )
+
+    def get_format(self, path, format):
+        format = format or guess_import_format(path)
+        if format is None:
+            raise CommandError(
+                "Cannot tell the format of the input, pass --format"
+            )
+        return format
+
+    def open(self, path):
+        if path == '-':
+            return io.TextIOWrapper(
+                sys.stdin.buffer, encoding='utf-8-sig', newline=''
+            )
+        try:
+            return open(path, encoding='utf-8-sig', newline='')
+        except OSError as exc:
+            raise CommandError(exc)
+
+    def report_progress(self, report):
+        self.stdout.write(
+            f"created {report.created}, failed {report.failed}, "
+            f"{report.rows_per_second:.0f} rows/s"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        format = self.get_format(options['path'], options['format'])
+        importer = RecipeImporter(
+            user,
+            chunk_size=options['chunk_size'],
+            batch_size=options['batch_size'],
+            max_errors=options['max_errors']
+        )
+        with self.open(options['path']) as stream:
+            try:
+                report = importer.run(
+                    read_records(stream, format),
+                    on_chunk=self.report_progress
+                )
+            except UnicodeDecodeError as exc:
+                raise CommandError(f"Input is not valid UTF-8: {exc}")
+
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report.created} recipes ({report.failed} failed) in "
+            f"{report.seconds:.1f}s, {report.rows_per_second:.0f} rows/s"
+        ))
@@ -0,0 +1,88 @@
+import io
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from recipe.services.importer import (
+    IMPORT_FORMATS,
+    guess_import_format,
+    read_records
+)
+from recipe.services.provisioning import UserProvisioner
+
+
+class Command(BaseCommand):
+    help = ("Create users from a JSON Lines or CSV file of signup records, "
+            "hashing passwords in parallel")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help="File to import, or - to read standard input"
+        )
+        parser.add_argument(
+            '--format', choices=IMPORT_FORMATS,
+            help="Input format (default: from the file extension)"
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help="Number of records validated and inserted together"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Number of rows per INSERT statement"
+        )
+        parser.add_argument(
+            '--workers', type=int,
+            help="Password hashing processes (default: one per CPU, 0 to "
+                 "hash in this process)"
+        )
+        parser.add_argument(
+            '--max-errors', type=int, default=100,
+            help="Number of row errors printed"
+        )
+
+    def get_format(self, path, format):
+        format = format or guess_import_format(path)
+        if format is None:
+            raise CommandError(
+                "Cannot tell the format of the input, pass --format"
+            )
+        return format
+
+    def open(self, path):
+        if path == '-':
+            return io.TextIOWrapper(
+                sys.stdin.buffer, encoding='utf-8-sig', newline=''
+            )
+        try:
+            return open(path, encoding='utf-8-sig', newline='')
+        except OSError as exc:
+            raise CommandError(exc)
+
+    def report_progress(self, report):
+        self.stdout.write(
+            f"created {report.created}, failed {report.failed}, "
+            f"{report.rows_per_second:.0f} rows/s"
+        )
+
+    def handle(self, *args, **options):
+        format = self.get_format(options['path'], options['format'])
+        provisioner = UserProvisioner(
+            chunk_size=options['chunk_size'],
+            batch_size=options['batch_size'],
+            max_errors=options['max_errors'],
+            workers=options['workers']
+        )
+        with self.open(options['path']) as stream:
+            try:
+                report = provisioner.run(
+                    read_records(stream, format),
+                    on_chunk=self.report_progress
+                )
+            except UnicodeDecodeError as exc:
+                raise CommandError(f"Input is not valid UTF-8: {exc}")
+
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report.created} users ({report.failed} failed) in "
+            f"{report.seconds:.1f}s, {report.rows_per_second:.0f} rows/s"
+        ))
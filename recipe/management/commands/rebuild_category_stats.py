@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from recipe.services.category_stats import rebuild_category_stats
+
+
+class Command(BaseCommand):
+    help = ("Backfill or repair the stored per-category statistics from the "
+            "recipes and their rating aggregates")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'category_ids', nargs='*', type=int,
+            help="Only rebuild these categories (default: all categories)"
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_category_stats(category_ids=options['category_ids'])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt statistics of {rebuilt} categories")
+        )
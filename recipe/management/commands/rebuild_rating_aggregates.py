@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from recipe.services.ratings import rebuild_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = "Backfill or repair the stored rating aggregates of recipes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'recipe_ids', nargs='*', type=int,
+            help="Only rebuild these recipes (default: all recipes)"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Number of recipes rebuilt per query"
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_rating_aggregates(
+            recipe_ids=options['recipe_ids'],
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt rating aggregates of {rebuilt} recipes")
+        )
@@ -0,0 +1,88 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:16
+
+import recipe.fields
+from django.db import migrations
+from django.db.models import F, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce, Concat, Lower
+
+# The search document as of this migration (see
+# `recipe.services.search_engine`), frozen so later changes to the
+# service do not alter it.
+SECTIONS = (
+    ('title', 'A'),
+    ('category_name', 'B'),
+    ('ingredients', 'C'),
+    ('description', 'D'),
+)
+
+
+def search_document_expression(Category, vendor):
+    sources = {
+        'title': F('title'),
+        'category_name': Coalesce(
+            Subquery(
+                Category.objects.filter(
+                    pk=OuterRef('category_id')
+                ).values('name')[:1]
+            ),
+            Value('')
+        ),
+        'ingredients': F('ingredients'),
+        'description': F('description'),
+    }
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchVector
+
+        document = None
+        for name, weight in SECTIONS:
+            section = SearchVector(sources[name], weight=weight, config='english')
+            document = section if document is None else document + section
+        return document
+
+    parts = []
+    for name, _ in SECTIONS:
+        if parts:
+            parts.append(Value('\x1f'))
+        parts.append(Lower(sources[name]))
+    return Concat(*parts, output_field=TextField())
+
+
+def populate_search_documents(apps, schema_editor):
+    Recipe = apps.get_model('recipe', 'Recipe')
+    Category = apps.get_model('recipe', 'Category')
+    vendor = schema_editor.connection.vendor
+    Recipe.objects.using(schema_editor.connection.alias).update(
+        search_document=search_document_expression(Category, vendor)
+    )
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX "tabRecipe_search_document_gin" '
+        'ON "tabRecipe" USING GIN ("search_document")'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS "tabRecipe_search_document_gin"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0003_user_groups_user_is_superuser_user_user_permissions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='search_document',
+            field=recipe.fields.SearchDocumentField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
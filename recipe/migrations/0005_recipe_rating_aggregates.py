@@ -0,0 +1,83 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:19
+
+from collections import Counter, defaultdict
+from django.db import migrations, models
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    Recipe = apps.get_model('recipe', 'Recipe')
+    Review = apps.get_model('recipe', 'Review')
+    db_alias = schema_editor.connection.alias
+
+    histograms = defaultdict(Counter)
+    rows = Review.objects.using(db_alias).filter(
+        rating__in=range(1, 6)
+    ).values('recipe_id', 'rating').annotate(
+        total=models.Count('id')
+    ).values_list('recipe_id', 'rating', 'total').order_by()
+    for recipe_id, rating, total in rows:
+        histograms[recipe_id][rating] = total
+
+    recipes = []
+    for recipe_id, histogram in histograms.items():
+        review_count = sum(histogram.values())
+        recipe = Recipe(
+            pk=recipe_id,
+            review_count=review_count,
+            avg_rating=sum(r * n for r, n in histogram.items()) / review_count
+        )
+        for rating in range(1, 6):
+            setattr(recipe, f'rating_{rating}_count', histogram[rating])
+        recipes.append(recipe)
+    Recipe.objects.using(db_alias).bulk_update(
+        recipes,
+        ['avg_rating', 'review_count', 'rating_1_count', 'rating_2_count',
+         'rating_3_count', 'rating_4_count', 'rating_5_count'],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0004_recipe_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='avg_rating',
+            field=models.FloatField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rating_aggregates, migrations.RunPython.noop),
+    ]
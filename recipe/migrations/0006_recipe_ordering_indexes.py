@@ -0,0 +1,50 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0005_recipe_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipe',
+            name='avg_rating',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-created_at', '-id'], name='recipe_newest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-avg_rating', '-id'], name='recipe_top_rated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['cooking_time', 'id'], name='recipe_quickest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['serving_size', 'id'], name='recipe_serving_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='recipe_cat_newest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['category', '-avg_rating', '-id'], name='recipe_cat_top_rated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['category', 'cooking_time', 'id'], name='recipe_cat_quickest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['category', 'serving_size', 'id'], name='recipe_cat_serving_idx'),
+        ),
+    ]
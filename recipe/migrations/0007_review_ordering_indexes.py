@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0006_recipe_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['recipe', '-created_at', '-id'], name='review_recipe_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['recipe', '-rating', '-id'], name='review_recipe_top_rated_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_category_stats(apps, schema_editor):
+    Category = apps.get_model('recipe', 'Category')
+    CategoryStats = apps.get_model('recipe', 'CategoryStats')
+    Recipe = apps.get_model('recipe', 'Recipe')
+    db_alias = schema_editor.connection.alias
+
+    rating_total = sum(
+        (models.Value(rating) * models.F(f'rating_{rating}_count')
+         for rating in range(1, 6)),
+        models.Value(0)
+    )
+    rows = Recipe.objects.using(db_alias).filter(
+        category__isnull=False
+    ).values('category_id').annotate(
+        recipe_count=models.Count('id'),
+        cooking_time_total=models.Sum('cooking_time'),
+        serving_size_total=models.Sum('serving_size'),
+        review_count=models.Sum('review_count'),
+        rating_total=models.Sum(rating_total)
+    ).order_by()
+    totals = {row.pop('category_id'): row for row in rows}
+
+    now = timezone.now()
+    CategoryStats.objects.using(db_alias).bulk_create(
+        [
+            CategoryStats(
+                category_id=category_id, updated_at=now,
+                **totals.get(category_id, {})
+            )
+            for category_id in Category.objects.using(db_alias).values_list(
+                'pk', flat=True
+            )
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0007_review_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='recipe.category')),
+                ('recipe_count', models.IntegerField(default=0)),
+                ('cooking_time_total', models.BigIntegerField(default=0)),
+                ('serving_size_total', models.BigIntegerField(default=0)),
+                ('review_count', models.BigIntegerField(default=0)),
+                ('rating_total', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Category Stats',
+                'verbose_name_plural': 'Category Stats',
+                'db_table': 'tabCategoryStats',
+            },
+        ),
+        migrations.RunPython(backfill_category_stats, migrations.RunPython.noop),
+    ]
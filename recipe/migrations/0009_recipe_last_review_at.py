@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:04
+
+from django.db import migrations, models
+
+
+def backfill_last_review_at(apps, schema_editor):
+    Recipe = apps.get_model('recipe', 'Recipe')
+    Review = apps.get_model('recipe', 'Review')
+    db_alias = schema_editor.connection.alias
+
+    Recipe.objects.using(db_alias).update(
+        last_review_at=models.Subquery(
+            Review.objects.using(db_alias).filter(
+                recipe_id=models.OuterRef('pk')
+            ).order_by('-updated_at').values('updated_at')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0008_category_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='last_review_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_last_review_at, migrations.RunPython.noop),
+    ]
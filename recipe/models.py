@@ -1,9 +1,11 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin
 )
+from recipe.fields import SearchDocumentField
 # Create your models here.
 
 
@@ -108,14 +110,86 @@ class Recipe(RecipeBaseModelTemplate):
                                 )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_document = SearchDocumentField(
+                                            blank=True,
+                                            default='',
+                                            editable=False
+                                        )
+    # Rating aggregates maintained by `recipe.services.ratings` on every
+    # review write, so listing never has to aggregate `tabReview`.
+    avg_rating = models.FloatField(default=0, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_1_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_2_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_3_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_4_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_5_count = models.PositiveIntegerField(default=0, editable=False)
+    # Time of the last review write (create, edit or delete), so the
+    # recipe's validators never have to aggregate `tabReview`.
+    last_review_at = models.DateTimeField(null=True, editable=False)
+
+    # Written only with relative UPDATEs by `recipe.services.ratings`.
+    RATING_FIELDS = (
+        'avg_rating', 'review_count', 'rating_1_count', 'rating_2_count',
+        'rating_3_count', 'rating_4_count', 'rating_5_count', 'last_review_at'
+    )
 
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+            Saves of an existing recipe never write `RATING_FIELDS` back:
+            the values loaded with the instance may be stale by now, and
+            writing them would lose the reviews written meanwhile.
+        """
+        if (not self._state.adding and not args
+                and kwargs.get('update_fields') is None
+                and not kwargs.get('force_insert')):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname in self.__dict__
+                and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     class Meta:
         db_table = "tabRecipe"
         verbose_name = 'Recipe'
         verbose_name_plural = 'Recipes'
+        # One index per ordering supported by the recipe list endpoint
+        # (see `RECIPE_ORDERINGS`), plus a per-category variant of each.
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-id'], name='recipe_newest_idx'
+            ),
+            models.Index(
+                fields=['-avg_rating', '-id'], name='recipe_top_rated_idx'
+            ),
+            models.Index(
+                fields=['cooking_time', 'id'], name='recipe_quickest_idx'
+            ),
+            models.Index(
+                fields=['serving_size', 'id'], name='recipe_serving_idx'
+            ),
+            models.Index(
+                fields=['category', '-created_at', '-id'],
+                name='recipe_cat_newest_idx'
+            ),
+            models.Index(
+                fields=['category', '-avg_rating', '-id'],
+                name='recipe_cat_top_rated_idx'
+            ),
+            models.Index(
+                fields=['category', 'cooking_time', 'id'],
+                name='recipe_cat_quickest_idx'
+            ),
+            models.Index(
+                fields=['category', 'serving_size', 'id'],
+                name='recipe_cat_serving_idx'
+            ),
+        ]
 
 
 class Review(RecipeBaseModelTemplate):
@@ -136,3 +210,61 @@ class Review(RecipeBaseModelTemplate):
         db_table = "tabReview"
         verbose_name = 'Review'
         verbose_name_plural = 'Reviews'
+        # One index per ordering of a recipe's reviews (see
+        # `REVIEW_ORDERINGS`).
+        indexes = [
+            models.Index(
+                fields=['recipe', '-created_at', '-id'],
+                name='review_recipe_recent_idx'
+            ),
+            models.Index(
+                fields=['recipe', '-rating', '-id'],
+                name='review_recipe_top_rated_idx'
+            ),
+        ]
+
+
+class CategoryStats(models.Model):
+    """
+        Running totals of a category's recipes, maintained by
+        `recipe.services.category_stats` on every recipe and review write,
+        so dashboards read one row instead of aggregating `tabRecipe`.
+    """
+    category = models.OneToOneField(
+                                    Category,
+                                    primary_key=True,
+                                    related_name='stats',
+                                    on_delete=models.CASCADE
+                                )
+    # Signed, so a total drifting below zero never fails the write that
+    # updates it; `rebuild_category_stats` repairs drift.
+    recipe_count = models.IntegerField(default=0)
+    cooking_time_total = models.BigIntegerField(default=0)
+    serving_size_total = models.BigIntegerField(default=0)
+    review_count = models.BigIntegerField(default=0)
+    rating_total = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    @property
+    def avg_cooking_time(self) -> float:
+        return _average(self.cooking_time_total, self.recipe_count)
+
+    @property
+    def avg_serving_size(self) -> float:
+        return _average(self.serving_size_total, self.recipe_count)
+
+    @property
+    def avg_rating(self) -> float:
+        return _average(self.rating_total, self.review_count)
+
+    def __str__(self) -> str:
+        return f"{self.category_id} stats"
+
+    class Meta:
+        db_table = "tabCategoryStats"
+        verbose_name = 'Category Stats'
+        verbose_name_plural = 'Category Stats'
+
+
+def _average(total, count) -> float:
+    return total / count if count > 0 else 0.0
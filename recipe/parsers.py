@@ -0,0 +1,30 @@
+import io
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from recipe.renderers import FastJSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    """
+        JSONParser that decodes UTF-8 bodies with `orjson` when it is
+        installed. Anything orjson rejects is handed to JSONParser, so
+        errors (and big integers, which orjson refuses) behave as before.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read() if stream is not None else b''
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,91 @@
+import math
+import re
+import time
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+from recipe_radar.metrics import record_render
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson writes floats outside [1e-4, 1e16) without the exponent form of
+# `repr` (``1e16`` for ``1e+16``, ``0.00001`` for ``1e-05``) and NaN and
+# infinities as ``null``. Any of them in the output is worth a look.
+SUSPECT_FLOAT_OUTPUT = re.compile(rb'null|0\.0000|\de')
+
+
+def has_mismatched_floats(data) -> bool:
+    """
+        Whether ``data`` holds a float orjson would not write like `json`.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if value and not (math.isfinite(value)
+                              and 1e-4 <= abs(value) < 1e16):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+        JSONRenderer that encodes with `orjson` when it is installed and
+        falls back to the standard library otherwise.
+
+        Output is byte-for-byte what JSONRenderer produces for the compact
+        format: datetimes, Decimals, lazy strings, UUIDs and every other
+        type orjson does not handle natively go through DRF's JSONEncoder,
+        and U+2028/U+2029 are escaped the same way. Payloads with floats
+        orjson writes differently (see `has_mismatched_floats`) are
+        rendered by JSONRenderer, which also rejects NaN and infinities.
+        Indented output (the browsable API, ``; indent=N``) is left to
+        JSONRenderer. Encoding time is added to the request's metrics
+        (`recipe_radar.metrics`).
+    """
+    encoder = JSONEncoder()
+
+    if orjson is not None:
+        options = (
+            orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_NON_STR_KEYS
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        started_at = time.perf_counter()
+        try:
+            return self.encode(data, accepted_media_type, renderer_context)
+        finally:
+            record_render(time.perf_counter() - started_at)
+
+    def encode(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or not self.compact
+                or self.ensure_ascii
+                or self.get_indent(accepted_media_type,
+                                   renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder.default, option=self.options
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which json handles.
+            return super().render(data, accepted_media_type, renderer_context)
+        if SUSPECT_FLOAT_OUTPUT.search(ret) and has_mismatched_floats(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same strict javascript subset escaping as JSONRenderer.
+        return ret.replace(
+            b'\xe2\x80\xa8', b'\\u2028'
+        ).replace(
+            b'\xe2\x80\xa9', b'\\u2029'
+        )
@@ -0,0 +1,18 @@
+from .category_catalogue import get_category_catalogue
+from .pantry import pantry_index
+from .response_cache import get_recipe_detail_cache
+from .search_engine import (
+    asearch_recipes,
+    refresh_search_documents,
+    search_recipes
+)
+
+
+__all__ = [
+    "get_category_catalogue",
+    "pantry_index",
+    "get_recipe_detail_cache",
+    "asearch_recipes",
+    "refresh_search_documents",
+    "search_recipes"
+]
@@ -0,0 +1,142 @@
+"""
+    In-process cache of the category list.
+
+    The catalogue (every category with the number of its recipes) is
+    built with one query and kept per worker, tagged with the
+    ``category-catalogue`` version of `recipe.services.versioning`.
+    Category writes and recipe writes changing a category bump the
+    version, so a request only reads the version counter to know whether
+    its copy is current. ``TIMEOUT`` bounds staleness when the version
+    counter is not shared between workers (the default local-memory
+    cache) and after writes that bypass signals. Each entry carries an
+    ETag hashed from its content, so every worker hands out the same ETag
+    for the same list. Configured by the
+    ``CATEGORY_CATALOGUE`` setting:
+
+        CATEGORY_CATALOGUE = {'TIMEOUT': 300}
+"""
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from django.conf import settings
+from django.db.models import Count
+from django.utils.http import quote_etag
+from recipe.services.versioning import bump_version, get_version
+
+CATEGORY_CATALOGUE_VERSION = 'category-catalogue'
+
+DEFAULT_CATEGORY_CATALOGUE = {
+    'TIMEOUT': 300,
+}
+
+
+@dataclass(frozen=True)
+class CatalogueEntry:
+    version: int
+    # Serialized `CategoryListSerializer` rows, shared by every request:
+    # never mutate them.
+    categories: list
+    etag: str
+    expires_at: float
+
+
+class CategoryCatalogue:
+
+    def __init__(self, timeout=300):
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._entry = None
+        self._lock = threading.Lock()
+
+    def get_queryset(self):
+        from recipe.models import Category
+
+        return Category.objects.annotate(
+            recipe_count=Count('recipe')
+        ).order_by('pk')
+
+    def serialize(self, categories) -> list:
+        from recipe.api.serializer import CategoryListSerializer
+
+        return list(CategoryListSerializer(categories, many=True).data)
+
+    def get(self) -> CatalogueEntry:
+        """
+            Returns the current catalogue, building it when the version
+            changed or the copy expired. The version is read before
+            building so a catalogue built while a write commits is stored
+            under the old version.
+        """
+        version = get_version(CATEGORY_CATALOGUE_VERSION)
+        entry = self._get(version)
+        if entry is None:
+            entry = self._set(
+                version, self.serialize(list(self.get_queryset()))
+            )
+        return entry
+
+    async def aget(self) -> CatalogueEntry:
+        """
+            Async version of `get`, building with the async ORM.
+        """
+        version = get_version(CATEGORY_CATALOGUE_VERSION)
+        entry = self._get(version)
+        if entry is None:
+            categories = [
+                category async for category in self.get_queryset()
+            ]
+            entry = self._set(version, self.serialize(categories))
+        return entry
+
+    def _get(self, version):
+        with self._lock:
+            entry = self._entry
+            if (entry is None or entry.version != version
+                    or entry.expires_at <= time.monotonic()):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry
+
+    def _set(self, version, categories) -> CatalogueEntry:
+        entry = CatalogueEntry(
+            version, categories, get_content_etag(categories),
+            time.monotonic() + self.timeout
+        )
+        with self._lock:
+            self._entry = entry
+        return entry
+
+    def invalidate(self):
+        bump_version(CATEGORY_CATALOGUE_VERSION)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+def get_content_etag(categories) -> str:
+    content = json.dumps(categories, sort_keys=True, default=str)
+    return quote_etag(hashlib.md5(content.encode()).hexdigest())
+
+
+_category_catalogue = None
+
+
+def get_category_catalogue() -> CategoryCatalogue:
+    global _category_catalogue
+    if _category_catalogue is None:
+        config = getattr(
+            settings, 'CATEGORY_CATALOGUE', DEFAULT_CATEGORY_CATALOGUE
+        )
+        _category_catalogue = CategoryCatalogue(
+            timeout=config.get('TIMEOUT', 300)
+        )
+    return _category_catalogue
@@ -0,0 +1,248 @@
+"""
+    Stored per-category statistics.
+
+    `CategoryStats` keeps, per category, the number of recipes and the
+    totals of their ``cooking_time``, ``serving_size``, reviews and
+    ratings; averages are computed from them on read. Recipe writes (see
+    `recipe.signals`) and `apply_rating_changes` update the totals with
+    relative (``F()``) UPDATEs inside the writing transaction, so
+    concurrent writes never overwrite each other. The ratings come from
+    the stored rating aggregates of the recipes, not from `tabReview`.
+"""
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from recipe.services.ratings import RATING_VALUES, histogram_field
+
+STATS_FIELDS = (
+    'recipe_count', 'cooking_time_total', 'serving_size_total',
+    'review_count', 'rating_total',
+)
+
+# Recipe fields the totals depend on, remembered when a recipe is loaded.
+RECIPE_STATS_FIELDS = ('category_id', 'cooking_time', 'serving_size')
+
+
+def rating_total_expression():
+    """
+        Sum of the ratings of a recipe, from its rating histogram columns.
+    """
+    return sum(
+        (Value(rating) * F(histogram_field(rating)) for rating in RATING_VALUES),
+        Value(0)
+    )
+
+
+def get_contribution(recipe_count, cooking_time, serving_size,
+                     review_count=0, rating_total=0) -> Counter:
+    return Counter({
+        'recipe_count': recipe_count,
+        'cooking_time_total': cooking_time,
+        'serving_size_total': serving_size,
+        'review_count': review_count,
+        'rating_total': rating_total,
+    })
+
+
+def get_recipe_contributions(recipe_ids) -> dict:
+    """
+        Returns ``{recipe_id: (category_id, contribution)}`` read from the
+        database, review totals included.
+    """
+    from recipe.models import Recipe
+
+    rows = Recipe.objects.filter(pk__in=recipe_ids).annotate(
+        rating_total=rating_total_expression()
+    ).values_list(
+        'pk', 'category_id', 'cooking_time', 'serving_size',
+        'review_count', 'rating_total'
+    )
+    return {
+        recipe_id: (category_id, get_contribution(1, *values))
+        for recipe_id, category_id, *values in rows
+    }
+
+
+def apply_category_stats_changes(changes):
+    """
+        Applies ``changes``, a mapping of category id to a `Counter` of
+        deltas of `STATS_FIELDS`, with one UPDATE per affected category.
+        Must be called inside the transaction that wrote the recipes or
+        reviews, after writing them.
+    """
+    from recipe.models import CategoryStats
+
+    now = timezone.now()
+    # A fixed order, so concurrent writes lock their rows in the same
+    # order and cannot deadlock.
+    for category_id, deltas in sorted(
+            (item for item in changes.items() if item[0] is not None)):
+        values = {
+            name: F(name) + delta for name, delta in deltas.items() if delta
+        }
+        if not values:
+            continue
+        updated = CategoryStats.objects.filter(
+            category_id=category_id
+        ).update(updated_at=now, **values)
+        if not updated:
+            # No row yet (category created before the table): build it
+            # from the recipes, which already include this write.
+            rebuild_category_stats([category_id])
+
+
+def create_category_stats(category):
+    from recipe.models import CategoryStats
+
+    CategoryStats.objects.get_or_create(category=category)
+
+
+def record_recipes_created(recipes):
+    changes = defaultdict(Counter)
+    for recipe in recipes:
+        changes[recipe.category_id].update(get_contribution(
+            1, recipe.cooking_time, recipe.serving_size
+        ))
+    apply_category_stats_changes(changes)
+
+
+def record_recipe_updated(recipe_id, old_values, new_values):
+    """
+        Moves a saved recipe between categories and applies its cooking
+        time and serving size changes. ``old_values`` and ``new_values``
+        hold the `RECIPE_STATS_FIELDS` loaded before and stored by the
+        save.
+    """
+    if old_values == new_values:
+        return
+    if any(name not in values for name in RECIPE_STATS_FIELDS
+           for values in (old_values, new_values)):
+        # Saved from a partially loaded instance: the old values are
+        # unknown, recompute the categories the recipe left and joined.
+        rebuild_recipe_categories(recipe_id, old_values, new_values)
+        return
+
+    old_contribution = get_contribution(
+        1, old_values['cooking_time'], old_values['serving_size']
+    )
+    new_contribution = get_contribution(
+        1, new_values['cooking_time'], new_values['serving_size']
+    )
+    if old_values['category_id'] != new_values['category_id']:
+        # The recipe's reviews move with it.
+        _, stored = get_recipe_contributions([recipe_id])[recipe_id]
+        reviews = {
+            'review_count': stored['review_count'],
+            'rating_total': stored['rating_total'],
+        }
+        old_contribution.update(reviews)
+        new_contribution.update(reviews)
+    changes = defaultdict(Counter)
+    changes[old_values['category_id']].subtract(old_contribution)
+    changes[new_values['category_id']].update(new_contribution)
+    apply_category_stats_changes(changes)
+
+
+def rebuild_recipe_categories(recipe_id, old_values, new_values):
+    from recipe.models import Recipe
+
+    if 'category_id' in new_values and 'category_id' not in old_values:
+        # Category assigned on an instance loaded without it: the one it
+        # left is unknown.
+        rebuild_category_stats()
+        return
+    category_ids = {
+        old_values.get('category_id'),
+        Recipe.objects.filter(pk=recipe_id).values_list(
+            'category_id', flat=True
+        ).first(),
+    } - {None}
+    if category_ids:
+        rebuild_category_stats(sorted(category_ids))
+
+
+def record_recipe_deleted(category_id, contribution):
+    """
+        Removes a deleted recipe's ``contribution``, read by
+        `get_recipe_contributions` before the delete.
+    """
+    changes = defaultdict(Counter)
+    changes[category_id].subtract(contribution)
+    apply_category_stats_changes(changes)
+
+
+def record_rating_changes(changes):
+    """
+        Applies the review count and rating deltas of ``changes`` (see
+        `apply_rating_changes`) to the categories of the recipes.
+    """
+    from recipe.models import Recipe
+
+    categories = dict(
+        Recipe.objects.filter(pk__in=list(changes)).values_list(
+            'pk', 'category_id'
+        )
+    )
+    category_changes = defaultdict(Counter)
+    for recipe_id, deltas in changes.items():
+        deltas = {
+            rating: delta for rating, delta in deltas.items()
+            if delta and rating in RATING_VALUES
+        }
+        category_changes[categories.get(recipe_id)].update({
+            'review_count': sum(deltas.values()),
+            'rating_total': sum(
+                rating * delta for rating, delta in deltas.items()
+            ),
+        })
+    apply_category_stats_changes(category_changes)
+
+
+@transaction.atomic
+def rebuild_category_stats(category_ids=None) -> int:
+    """
+        Recomputes the stats of ``category_ids`` (default: every category)
+        with one grouped query over `tabRecipe`. The existing rows are
+        locked first so writes made meanwhile are applied on top of the
+        rebuilt totals. Returns the number of categories rewritten.
+    """
+    from recipe.models import Category, CategoryStats, Recipe
+
+    categories = Category.objects.order_by('pk')
+    if category_ids:
+        categories = categories.filter(pk__in=category_ids)
+    category_ids = list(categories.values_list('pk', flat=True))
+
+    list(
+        CategoryStats.objects.select_for_update().filter(
+            category_id__in=category_ids
+        ).values_list('pk', flat=True)
+    )
+    rows = Recipe.objects.filter(category_id__in=category_ids).values(
+        'category_id'
+    ).annotate(
+        recipe_count=Count('id'),
+        cooking_time_total=Coalesce(Sum('cooking_time'), 0),
+        serving_size_total=Coalesce(Sum('serving_size'), 0),
+        review_count=Coalesce(Sum('review_count'), 0),
+        rating_total=Coalesce(Sum(rating_total_expression()), 0)
+    ).order_by()
+    totals = {row.pop('category_id'): row for row in rows}
+
+    now = timezone.now()
+    CategoryStats.objects.bulk_create(
+        [
+            CategoryStats(
+                category_id=category_id, updated_at=now,
+                **totals.get(category_id, {})
+            )
+            for category_id in category_ids
+        ],
+        update_conflicts=True,
+        unique_fields=['category'],
+        update_fields=STATS_FIELDS + ('updated_at',),
+        batch_size=1000
+    )
+    return len(category_ids)
@@ -0,0 +1,76 @@
+"""
+    Streaming export of recipes and reviews as NDJSON or CSV.
+
+    Rows are read with ``values().iterator()``, which uses a server-side
+    cursor on PostgreSQL, and encoded in chunks, so memory stays bounded by
+    the chunk size however large the export is. Rows have the same fields
+    and formatting as the API responses.
+"""
+import csv
+import io
+from recipe.renderers import FastJSONRenderer
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+EXPORT_STREAMS = ('recipes', 'reviews')
+
+
+def encode_ndjson(rows, columns):
+    renderer = FastJSONRenderer()
+    return b''.join(renderer.render(row) + b'\n' for row in rows)
+
+
+def encode_csv(rows, columns, header=False):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def stream_rows(queryset, values_serializer, format, chunk_size=2000):
+    """
+        Yields ``queryset`` encoded as ``format``, one bytes chunk per
+        ``chunk_size`` rows. CSV starts with a header line.
+    """
+    columns = values_serializer.keys
+    rows = queryset.order_by('pk').values(
+        *values_serializer.columns
+    ).iterator(chunk_size=chunk_size)
+
+    if format == 'csv':
+        yield encode_csv([], columns, header=True)
+    encode = encode_csv if format == 'csv' else encode_ndjson
+
+    chunk = []
+    for row in rows:
+        chunk.append(values_serializer.to_representation(row))
+        if len(chunk) >= chunk_size:
+            yield encode(chunk, columns)
+            chunk = []
+    if chunk:
+        yield encode(chunk, columns)
+
+
+def export_recipes(recipes, format, stream='recipes', chunk_size=2000):
+    """
+        Yields the export of the ``recipes`` queryset, or of their reviews
+        when ``stream`` is ``'reviews'``.
+    """
+    from recipe.api.serializer import (
+        recipe_values_serializer,
+        review_export_values_serializer
+    )
+    from recipe.models import Review
+
+    if stream == 'reviews':
+        return stream_rows(
+            Review.objects.filter(recipe__in=recipes.values('pk')),
+            review_export_values_serializer,
+            format,
+            chunk_size
+        )
+    return stream_rows(recipes, recipe_values_serializer, format, chunk_size)
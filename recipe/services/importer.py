@@ -0,0 +1,235 @@
+"""
+    Streaming bulk import of recipes from JSON Lines or CSV.
+
+    Records are read lazily and processed in chunks: every chunk resolves
+    its categories with one query (cached for later chunks), checks title
+    uniqueness with one ``IN`` query, validates each row with the rules of
+    `CreateRecipeSerializer` and inserts the valid rows with
+    ``bulk_create()``. Memory use is bounded by the chunk size, whatever the
+    size of the input.
+"""
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+from recipe.services.signals import recipes_bulk_created
+
+IMPORT_FORMATS = ('jsonl', 'csv')
+IMPORT_FORMAT_EXTENSIONS = {
+    'jsonl': 'jsonl',
+    'ndjson': 'jsonl',
+    'json': 'jsonl',
+    'csv': 'csv',
+}
+DUPLICATE_TITLE_MESSAGE = "Recipe with this title already exists."
+
+
+def guess_import_format(name):
+    """
+        Returns the import format matching the extension of ``name``, or
+        None when it is not recognised.
+    """
+    extension = os.path.splitext(name or '')[1].lstrip('.').lower()
+    return IMPORT_FORMAT_EXTENSIONS.get(extension)
+
+
+def read_records(stream, format):
+    """
+        Yields ``(line, data, error)`` for every record of the text
+        ``stream``. ``data`` is None when the record cannot be decoded, in
+        which case ``error`` says why.
+    """
+    if format == 'csv':
+        reader = csv.DictReader(stream)
+        for data in reader:
+            yield reader.line_num, data, None
+        return
+
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            data = json.loads(text)
+        except ValueError as exc:
+            yield line, None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(data, dict):
+            yield line, None, "Expected a JSON object"
+            continue
+        yield line, data, None
+
+
+def plain_errors(detail):
+    """
+        Converts ``ValidationError.detail`` to plain dicts, lists and strings.
+    """
+    if isinstance(detail, dict):
+        return {key: plain_errors(value) for key, value in detail.items()}
+    if isinstance(detail, list):
+        return [plain_errors(value) for value in detail]
+    return str(detail)
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        total = self.created + self.failed
+        return total / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+        }
+
+
+class RecipeImporter:
+    """
+        Imports recipe records owned by ``user``.
+
+        ``max_errors`` bounds the number of row errors kept in the report;
+        every failed row is still counted.
+    """
+
+    def __init__(self, user, chunk_size=1000, batch_size=500, max_errors=1000):
+        from recipe.api.serializer.recipe_serializer import (
+            RecipeImportSerializer
+        )
+
+        self.user = user
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.categories = {}
+        self.serializer = RecipeImportSerializer(
+            context={'categories': self.categories}
+        )
+
+    def run(self, records, on_chunk=None) -> ImportReport:
+        """
+            Imports ``records`` (see `read_records`). ``on_chunk`` is called
+            with the report after every chunk, e.g. to print progress.
+        """
+        report = ImportReport()
+        started_at = time.perf_counter()
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                break
+            self.import_chunk(chunk, report)
+            report.seconds = time.perf_counter() - started_at
+            if on_chunk is not None:
+                on_chunk(report)
+        return report
+
+    def add_error(self, report, line, errors):
+        report.failed += 1
+        if len(report.errors) < self.max_errors:
+            report.errors.append({'line': line, 'errors': errors})
+
+    def load_categories(self, chunk):
+        from recipe.models import Category
+
+        category_ids = set()
+        for _, data, _ in chunk:
+            try:
+                category_ids.add(int(data['category_id']))
+            except (KeyError, TypeError, ValueError):
+                continue
+        missing = category_ids.difference(self.categories)
+        if missing:
+            self.categories.update(Category.objects.in_bulk(missing))
+
+    def get_existing_titles(self, chunk) -> set:
+        from recipe.models import Recipe
+
+        titles = {
+            data['title'] for _, data, _ in chunk
+            if isinstance(data.get('title'), str)
+        }
+        return set(
+            Recipe.objects.filter(title__in=titles).values_list(
+                'title', flat=True
+            )
+        )
+
+    def import_chunk(self, chunk, report):
+        from recipe.models import Recipe
+
+        decoded = [record for record in chunk if record[1] is not None]
+        self.load_categories(decoded)
+        taken_titles = self.get_existing_titles(decoded)
+
+        rows = []
+        for line, data, error in chunk:
+            if data is None:
+                self.add_error(report, line, {'non_field_errors': [error]})
+                continue
+            try:
+                validated_data = self.serializer.run_validation(data)
+            except ValidationError as exc:
+                self.add_error(report, line, plain_errors(exc.detail))
+                continue
+            title = validated_data['title']
+            if title in taken_titles:
+                self.add_error(
+                    report, line, {'title': [DUPLICATE_TITLE_MESSAGE]}
+                )
+                continue
+            taken_titles.add(title)
+            rows.append((line, Recipe(user=self.user, **validated_data)))
+
+        # The receivers (category stats, ...) write in the same
+        # transaction as the recipes.
+        with transaction.atomic():
+            created = self.create(rows, report)
+            if created:
+                recipes_bulk_created.send(sender=Recipe, recipes=created)
+        report.created += len(created)
+
+    def create(self, rows, report) -> list:
+        from recipe.models import Recipe
+
+        recipes = [recipe for _, recipe in rows]
+        try:
+            with transaction.atomic():
+                return Recipe.objects.bulk_create(
+                    recipes, batch_size=self.batch_size
+                )
+        except IntegrityError:
+            # Most likely a concurrent write took one of the titles, insert
+            # row by row to find out which.
+            pass
+
+        created = []
+        for line, recipe in rows:
+            # Forget ids assigned by the rolled back batch.
+            recipe.pk = None
+            try:
+                with transaction.atomic():
+                    Recipe.objects.bulk_create([recipe])
+            except IntegrityError as exc:
+                if Recipe.objects.filter(title=recipe.title).exists():
+                    errors = {'title': [DUPLICATE_TITLE_MESSAGE]}
+                else:
+                    # Another constraint (e.g. a category deleted
+                    # meanwhile): report it as is.
+                    errors = {'non_field_errors': [str(exc)]}
+                self.add_error(report, line, errors)
+                continue
+            created.append(recipe)
+        return created
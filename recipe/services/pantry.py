@@ -0,0 +1,248 @@
+"""
+    "What can I cook?" matching of pantry ingredients against recipes.
+
+    The ingredient lists of all recipes are normalized into tokens and
+    every recipe is stored as a frozenset of its tokens, next to a posting
+    set of recipes per token. Matching a pantry is then one set
+    intersection per candidate recipe, where candidates are the recipes
+    sharing at least one token with the pantry. Memory is proportional to
+    the tokens of the indexed recipes: tokens no recipe uses any more are
+    dropped.
+"""
+import heapq
+import re
+import threading
+from dataclasses import dataclass
+from recipe.services.versioning import (
+    bump_version,
+    get_changes,
+    get_version,
+    log_change
+)
+
+PANTRY_INDEX_VERSION = 'pantry-index'
+
+INGREDIENT_SEPARATOR_REGEX = re.compile(r'[\n,;]+')
+PARENTHESES_REGEX = re.compile(r'\([^)]*\)')
+WORD_REGEX = re.compile(r'[a-z]+')
+
+# Words that describe the quantity or preparation of an ingredient rather
+# than the ingredient itself.
+IGNORED_WORDS = frozenset({
+    'a', 'an', 'and', 'as', 'for', 'of', 'or', 'the', 'to', 'some',
+    'taste', 'optional', 'needed', 'about',
+    'cup', 'cups', 'tbsp', 'tsp', 'tablespoon', 'tablespoons', 'teaspoon',
+    'teaspoons', 'g', 'gm', 'gram', 'grams', 'kg', 'mg', 'ml', 'l', 'litre',
+    'liter', 'litres', 'liters', 'oz', 'ounce', 'ounces', 'lb', 'lbs',
+    'pound', 'pounds', 'pinch', 'dash', 'clove', 'cloves', 'can', 'cans',
+    'slice', 'slices', 'piece', 'pieces', 'handful', 'bunch', 'packet',
+    'chopped', 'diced', 'minced', 'sliced', 'grated', 'crushed', 'peeled',
+    'fresh', 'freshly', 'finely', 'roughly', 'thinly', 'large', 'medium',
+    'small', 'whole', 'cooked', 'boiled', 'melted', 'softened', 'beaten',
+})
+
+
+def _singular(word) -> str:
+    if len(word) <= 3 or word.endswith('ss'):
+        return word
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    if word.endswith('oes'):
+        return word[:-2]
+    if word.endswith('s'):
+        return word[:-1]
+    return word
+
+
+def normalize_ingredient(text) -> str:
+    """
+        Reduces one ingredient line to its comparable name, e.g.
+        ``"2 cups Chopped Tomatoes (ripe)"`` becomes ``"tomato"``.
+    """
+    text = PARENTHESES_REGEX.sub(' ', text.lower())
+    words = [
+        _singular(word) for word in WORD_REGEX.findall(text)
+        if word not in IGNORED_WORDS
+    ]
+    return ' '.join(words)
+
+
+def parse_ingredients(ingredients) -> set:
+    """
+        Splits the free text ``Recipe.ingredients`` into normalized tokens.
+    """
+    tokens = set()
+    for line in INGREDIENT_SEPARATOR_REGEX.split(ingredients or ''):
+        token = normalize_ingredient(line)
+        if token:
+            tokens.add(token)
+    return tokens
+
+
+@dataclass(frozen=True)
+class PantryMatch:
+    recipe_id: int
+    matched: int
+    missing: tuple
+
+
+def _add(recipes, postings, recipe_id, ingredients):
+    tokens = frozenset(parse_ingredients(ingredients))
+    for token in tokens:
+        postings.setdefault(token, set()).add(recipe_id)
+    recipes[recipe_id] = tokens
+
+
+class PantryIndex:
+    """
+        In-process index of recipe ingredients.
+
+        The index is built lazily on first use and kept current through
+        `update()` / `remove()` on recipe writes. Writes made by other
+        workers are picked up by comparing the shared version counter:
+        each write logs the recipe ids it changed, so a worker behind
+        reloads only those recipes. It rebuilds from the database only
+        when the log is incomplete, and then builds the new index without
+        blocking matches and swaps it in.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # Held while catching up, so one thread at a time reads the rows.
+        self._refresh_lock = threading.Lock()
+        self._version = None
+        self._recipes = {}
+        self._postings = {}
+
+    def _add(self, recipe_id, ingredients):
+        _add(self._recipes, self._postings, recipe_id, ingredients)
+
+    def _discard(self, recipe_id):
+        tokens = self._recipes.pop(recipe_id, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            postings = self._postings[token]
+            postings.discard(recipe_id)
+            if not postings:
+                del self._postings[token]
+
+    def build(self):
+        """
+            Rebuilds the index from the database.
+        """
+        from recipe.models import Recipe
+
+        # Read before the rows, so the index is at least this recent.
+        version = get_version(PANTRY_INDEX_VERSION)
+        recipes = {}
+        postings = {}
+        rows = Recipe.objects.values_list('id', 'ingredients')
+        for recipe_id, ingredients in rows.iterator(chunk_size=2000):
+            _add(recipes, postings, recipe_id, ingredients)
+        with self._lock:
+            self._recipes = recipes
+            self._postings = postings
+            self._version = version
+
+    def _catch_up(self, version, recipe_ids):
+        from recipe.models import Recipe
+
+        rows = dict(
+            Recipe.objects.filter(pk__in=recipe_ids).values_list(
+                'id', 'ingredients'
+            )
+        )
+        with self._lock:
+            for recipe_id in recipe_ids:
+                self._discard(recipe_id)
+                if recipe_id in rows:
+                    self._add(recipe_id, rows[recipe_id])
+            self._version = version
+
+    def _ensure_fresh(self):
+        if self._version == get_version(PANTRY_INDEX_VERSION):
+            return
+        with self._refresh_lock:
+            version = get_version(PANTRY_INDEX_VERSION)
+            if self._version == version:
+                return
+            changes = get_changes(
+                PANTRY_INDEX_VERSION, self._version, version
+            )
+            if changes is None:
+                self.build()
+            else:
+                self._catch_up(version, set().union(*changes))
+
+    def _publish(self, recipe_ids):
+        version = bump_version(PANTRY_INDEX_VERSION)
+        log_change(PANTRY_INDEX_VERSION, version, list(recipe_ids))
+        # Only claim the new version when nobody else wrote in between,
+        # otherwise the next match catches up with their changes.
+        if self._version is not None and self._version == version - 1:
+            self._version = version
+
+    def update(self, recipe_id, ingredients):
+        with self._lock:
+            if self._version is not None:
+                self._discard(recipe_id)
+                self._add(recipe_id, ingredients)
+            self._publish([recipe_id])
+
+    def update_many(self, recipes):
+        """
+            Indexes ``(recipe_id, ingredients)`` pairs, publishing a single
+            new version for all of them.
+        """
+        with self._lock:
+            if self._version is not None:
+                for recipe_id, ingredients in recipes:
+                    self._discard(recipe_id)
+                    self._add(recipe_id, ingredients)
+            self._publish([recipe_id for recipe_id, _ in recipes])
+
+    def remove(self, recipe_id):
+        with self._lock:
+            if self._version is not None:
+                self._discard(recipe_id)
+            self._publish([recipe_id])
+
+    def match(self, pantry, max_missing=None, limit=20) -> list:
+        """
+            Returns up to ``limit`` `PantryMatch` objects ordered by the
+            number of missing ingredients, then by the number matched.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            pantry_tokens = set()
+            candidates = set()
+            for item in pantry:
+                token = normalize_ingredient(item)
+                postings = self._postings.get(token)
+                if postings is not None:
+                    pantry_tokens.add(token)
+                    candidates.update(postings)
+
+            scored = []
+            for recipe_id in candidates:
+                tokens = self._recipes[recipe_id]
+                matched = len(tokens & pantry_tokens)
+                missing = len(tokens) - matched
+                if max_missing is not None and missing > max_missing:
+                    continue
+                scored.append((missing, -matched, recipe_id))
+
+            return [
+                PantryMatch(
+                    recipe_id=recipe_id,
+                    matched=-matched,
+                    missing=tuple(
+                        sorted(self._recipes[recipe_id] - pantry_tokens)
+                    )
+                )
+                for _, matched, recipe_id in heapq.nsmallest(limit, scored)
+            ]
+
+
+pantry_index = PantryIndex()
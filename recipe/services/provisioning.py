@@ -0,0 +1,181 @@
+"""
+    Bulk provisioning of users from JSON Lines or CSV.
+
+    Works like the recipe importer: records are processed in chunks, every
+    chunk checks email and phone number uniqueness with one ``IN`` query
+    each, validates each row with the rules of `SignupSerializer`, hashes
+    the passwords of the valid rows across a process pool and inserts them
+    with ``bulk_create()``.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+from recipe.services.importer import ImportReport, plain_errors
+
+DUPLICATE_EMAIL_MESSAGE = "User with this email already exists."
+DUPLICATE_PHONE_NUMBER_MESSAGE = "User with this phone number already exists."
+
+
+def setup_worker():
+    """
+        Initializer of the hashing processes. They are spawned rather than
+        forked so they never share the parent's database connections, and
+        load the settings (and hashers) here.
+    """
+    import django
+
+    django.setup()
+
+
+class UserProvisioner:
+    """
+        Creates users from signup records.
+
+        Passwords are hashed in the calling process by default. ``workers``
+        hashes them across a pool of that many processes started for the
+        run (``None``: one per CPU); the pool is spawned and sets Django up
+        in every process, so it is meant for the management command, never
+        for a web request. ``max_errors`` bounds the number of row errors
+        kept in the report; every failed row is still counted.
+    """
+
+    def __init__(self, chunk_size=1000, batch_size=500, max_errors=1000,
+                 workers=0):
+        from recipe.api.serializer.auth_serializer import (
+            UserProvisionSerializer
+        )
+
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.workers = workers
+        self.serializer = UserProvisionSerializer()
+        self.processes = 0
+        self.executor = None
+
+    def run(self, records, on_chunk=None) -> ImportReport:
+        """
+            Provisions ``records`` (see `read_records`). ``on_chunk`` is
+            called with the report after every chunk.
+        """
+        report = ImportReport()
+        started_at = time.perf_counter()
+        records = iter(records)
+        if self.workers != 0:
+            self.processes = self.workers or os.cpu_count() or 1
+            self.executor = ProcessPoolExecutor(
+                self.processes,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=setup_worker
+            )
+        try:
+            while True:
+                chunk = list(islice(records, self.chunk_size))
+                if not chunk:
+                    break
+                self.provision_chunk(chunk, report)
+                report.seconds = time.perf_counter() - started_at
+                if on_chunk is not None:
+                    on_chunk(report)
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+        return report
+
+    def add_error(self, report, line, errors):
+        report.failed += 1
+        if len(report.errors) < self.max_errors:
+            report.errors.append({'line': line, 'errors': errors})
+
+    def get_taken(self, chunk, field) -> set:
+        from recipe.models import User
+
+        values = {
+            data[field] for _, data, _ in chunk
+            if isinstance(data.get(field), str)
+        }
+        return set(
+            User.objects.filter(**{f'{field}__in': values}).values_list(
+                field, flat=True
+            )
+        )
+
+    def hash_passwords(self, passwords) -> list:
+        if self.executor is None:
+            return [make_password(password) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.processes * 4))
+        return list(
+            self.executor.map(make_password, passwords, chunksize=chunksize)
+        )
+
+    def provision_chunk(self, chunk, report):
+        from recipe.models import User
+
+        decoded = [record for record in chunk if record[1] is not None]
+        taken_emails = self.get_taken(decoded, 'email')
+        taken_phone_numbers = self.get_taken(decoded, 'phone_number')
+
+        rows = []
+        for line, data, error in chunk:
+            if data is None:
+                self.add_error(report, line, {'non_field_errors': [error]})
+                continue
+            try:
+                validated_data = self.serializer.run_validation(data)
+            except ValidationError as exc:
+                self.add_error(report, line, plain_errors(exc.detail))
+                continue
+            errors = {}
+            if validated_data['email'] in taken_emails:
+                errors['email'] = [DUPLICATE_EMAIL_MESSAGE]
+            if validated_data['phone_number'] in taken_phone_numbers:
+                errors['phone_number'] = [DUPLICATE_PHONE_NUMBER_MESSAGE]
+            if errors:
+                self.add_error(report, line, errors)
+                continue
+            taken_emails.add(validated_data['email'])
+            taken_phone_numbers.add(validated_data['phone_number'])
+            rows.append((line, User(**validated_data)))
+
+        passwords = self.hash_passwords([user.password for _, user in rows])
+        for (_, user), password in zip(rows, passwords):
+            user.password = password
+
+        report.created += len(self.create(rows, report))
+
+    def create(self, rows, report) -> list:
+        from recipe.models import User
+
+        users = [user for _, user in rows]
+        try:
+            with transaction.atomic():
+                return User.objects.bulk_create(
+                    users, batch_size=self.batch_size
+                )
+        except IntegrityError:
+            # A concurrent signup took one of the emails or phone numbers,
+            # insert row by row to find out which.
+            pass
+
+        created = []
+        for line, user in rows:
+            # Forget ids assigned by the rolled back batch.
+            user.pk = None
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create([user])
+            except IntegrityError:
+                if User.objects.filter(email=user.email).exists():
+                    errors = {'email': [DUPLICATE_EMAIL_MESSAGE]}
+                else:
+                    errors = {'phone_number': [DUPLICATE_PHONE_NUMBER_MESSAGE]}
+                self.add_error(report, line, errors)
+                continue
+            created.append(user)
+        return created
@@ -0,0 +1,175 @@
+"""
+    Stored rating aggregates of recipes.
+
+    `Recipe.avg_rating`, `Recipe.review_count` and the `rating_<n>_count`
+    histogram columns are updated with relative (``F()``) UPDATEs inside the
+    transaction that writes the review, so concurrent reviews of the same
+    recipe never overwrite each other's counts. The same UPDATE stamps
+    `Recipe.last_review_at`, on every review write.
+
+    The `Review` signal receivers (see `recipe.signals`) call the
+    ``record_*`` functions below, so every review write updates the
+    aggregates: API, admin, shell and cascading deletes alike.
+"""
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+RATING_VALUES = range(1, 6)
+
+
+def histogram_field(rating) -> str:
+    return f'rating_{rating}_count'
+
+
+HISTOGRAM_FIELDS = tuple(histogram_field(rating) for rating in RATING_VALUES)
+AGGREGATE_FIELDS = ('avg_rating', 'review_count') + HISTOGRAM_FIELDS
+
+
+def rating_update_values(deltas) -> dict:
+    """
+        Returns the ``QuerySet.update()`` kwargs applying ``deltas``, a
+        mapping of rating value to the change in its number of reviews.
+
+        Every expression refers to the values of the row before the update,
+        so the new average is computed from the old histogram plus deltas.
+    """
+    counts = {
+        rating: F(histogram_field(rating)) + deltas.get(rating, 0)
+        for rating in RATING_VALUES
+    }
+    review_count = F('review_count') + sum(deltas.values())
+    rating_total = sum(
+        (Value(rating) * count for rating, count in counts.items()),
+        Value(0)
+    )
+    values = {
+        histogram_field(rating): count
+        for rating, count in counts.items()
+        if deltas.get(rating)
+    }
+    values['review_count'] = review_count
+    values['avg_rating'] = Coalesce(
+        Cast(rating_total, FloatField()) / NullIf(review_count, Value(0)),
+        Value(0.0)
+    )
+    return values
+
+
+def apply_rating_changes(changes):
+    """
+        Applies ``changes``, a mapping of recipe id to a `Counter` of rating
+        deltas, with one UPDATE per affected recipe, and the review totals
+        of their categories. Every recipe of ``changes`` gets a new
+        ``last_review_at``, even without rating deltas (a comment edit).
+        Must be called inside the transaction that wrote the reviews.
+    """
+    from recipe.models import Recipe
+    from recipe.services.category_stats import record_rating_changes
+
+    now = timezone.now()
+    rated = {}
+    # A fixed order, so concurrent batches lock their recipes in the same
+    # order and cannot deadlock.
+    for recipe_id, deltas in sorted(changes.items()):
+        deltas = {
+            rating: delta for rating, delta in deltas.items()
+            if delta and rating in RATING_VALUES
+        }
+        values = rating_update_values(deltas) if deltas else {}
+        Recipe.objects.filter(pk=recipe_id).update(
+            last_review_at=now, **values
+        )
+        if deltas:
+            rated[recipe_id] = deltas
+    if rated:
+        record_rating_changes(rated)
+
+
+def record_review_created(review):
+    apply_rating_changes({review.recipe_id: Counter({review.rating: 1})})
+
+
+def record_reviews_created(reviews):
+    changes = defaultdict(Counter)
+    for review in reviews:
+        changes[review.recipe_id][review.rating] += 1
+    apply_rating_changes(changes)
+
+
+def record_review_updated(review, old_recipe_id, old_rating):
+    """
+        Applies a saved review's move from ``old_rating`` of recipe
+        ``old_recipe_id`` to its current rating and recipe.
+    """
+    changes = defaultdict(Counter)
+    changes[review.recipe_id][review.rating] += 1
+    changes[old_recipe_id][old_rating] -= 1
+    apply_rating_changes(changes)
+
+
+def record_review_deleted(review):
+    apply_rating_changes({review.recipe_id: Counter({review.rating: -1})})
+
+
+def rebuild_rating_aggregates(recipe_ids=None, batch_size=1000) -> int:
+    """
+        Recomputes the stored aggregates from `tabReview`, one grouped query
+        and one bulk UPDATE per batch of recipes. Each batch locks its
+        recipe rows first so reviews written meanwhile are not lost.
+        Returns the number of recipes rewritten.
+    """
+    from recipe.models import Recipe, Review
+
+    recipes = Recipe.objects.order_by('pk')
+    if recipe_ids:
+        recipes = recipes.filter(pk__in=recipe_ids)
+    recipe_pks = recipes.values_list('pk', flat=True).iterator(
+        chunk_size=batch_size
+    )
+
+    rebuilt = 0
+    batch = []
+    for recipe_id in recipe_pks:
+        batch.append(recipe_id)
+        if len(batch) == batch_size:
+            rebuilt += _rebuild_batch(Recipe, Review, batch)
+            batch = []
+    if batch:
+        rebuilt += _rebuild_batch(Recipe, Review, batch)
+    return rebuilt
+
+
+@transaction.atomic
+def _rebuild_batch(recipe_model, review_model, recipe_ids) -> int:
+    list(
+        recipe_model.objects.select_for_update().filter(
+            pk__in=recipe_ids
+        ).values_list('pk', flat=True)
+    )
+    histograms = defaultdict(Counter)
+    rows = review_model.objects.filter(
+        recipe_id__in=recipe_ids, rating__in=RATING_VALUES
+    ).values('recipe_id', 'rating').annotate(
+        total=Count('id')
+    ).values_list('recipe_id', 'rating', 'total').order_by()
+    for recipe_id, rating, total in rows:
+        histograms[recipe_id][rating] = total
+
+    recipes = []
+    for recipe_id in recipe_ids:
+        histogram = histograms[recipe_id]
+        review_count = sum(histogram.values())
+        rating_total = sum(rating * total for rating, total in histogram.items())
+        recipe = recipe_model(
+            pk=recipe_id,
+            review_count=review_count,
+            avg_rating=rating_total / review_count if review_count else 0.0
+        )
+        for rating in RATING_VALUES:
+            setattr(recipe, histogram_field(rating), histogram[rating])
+        recipes.append(recipe)
+    recipe_model.objects.bulk_update(recipes, AGGREGATE_FIELDS)
+    return len(recipes)
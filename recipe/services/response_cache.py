@@ -0,0 +1,226 @@
+"""
+    Cache of assembled recipe detail payloads.
+
+    Entries are keyed by recipe id and a per-recipe version. Invalidating a
+    recipe bumps its version, so every cached variant of it becomes
+    unreachable at once and simply ages out of the backend. The backend is
+    pluggable through the ``RECIPE_DETAIL_CACHE`` setting:
+
+        RECIPE_DETAIL_CACHE = {
+            'BACKEND': 'recipe.services.response_cache.LocalLRUBackend',
+            'OPTIONS': {'max_entries': 1024},
+            'TIMEOUT': 300,
+        }
+
+    `LocalLRUBackend` is per process and only sees invalidations made by
+    the same worker, with ``TIMEOUT`` bounding staleness elsewhere.
+    `DjangoCacheBackend` on a shared cache is exact across workers.
+
+    Versions are seeded from the clock, like `recipe.services.versioning`:
+    a version evicted from the backend never comes back with a value that
+    stale payloads may still be stored under.
+"""
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+DEFAULT_RECIPE_DETAIL_CACHE = {
+    'BACKEND': 'recipe.services.response_cache.LocalLRUBackend',
+    'OPTIONS': {'max_entries': 1024},
+    'TIMEOUT': 300,
+}
+
+
+class LocalLRUBackend:
+    """
+        In-process LRU cache bounded to ``max_entries`` items.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add(self, key, value, timeout=None) -> bool:
+        with self._lock:
+            if key in self._entries:
+                return False
+        self.set(key, value, timeout)
+        return True
+
+    async def aget(self, key):
+        return self.get(key)
+
+    async def aset(self, key, value, timeout=None):
+        self.set(key, value, timeout)
+
+    async def aadd(self, key, value, timeout=None) -> bool:
+        return self.add(key, value, timeout)
+
+    def incr(self, key) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            value = entry[0] + 1 if entry else time.time_ns()
+            self._entries[key] = (value, None)
+            self._entries.move_to_end(key)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoCacheBackend:
+    """
+        Stores entries in one of the caches configured in ``CACHES``.
+    """
+
+    def __init__(self, alias='default'):
+        self.cache = caches[alias]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.cache.set(key, value, timeout)
+
+    def add(self, key, value, timeout=None) -> bool:
+        return self.cache.add(key, value, timeout)
+
+    async def aget(self, key):
+        return await self.cache.aget(key)
+
+    async def aset(self, key, value, timeout=None):
+        await self.cache.aset(key, value, timeout)
+
+    async def aadd(self, key, value, timeout=None) -> bool:
+        return await self.cache.aadd(key, value, timeout)
+
+    def incr(self, key) -> int:
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            version = time.time_ns()
+            if self.cache.add(key, version, timeout=None):
+                return version
+            return self.cache.incr(key)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class RecipeDetailCache:
+    key_prefix = 'recipe-detail'
+
+    def __init__(self, backend, timeout=None):
+        self.backend = backend
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _version_key(self, recipe_id) -> str:
+        return f'{self.key_prefix}:{recipe_id}:version'
+
+    def _get_version(self, recipe_id) -> int:
+        key = self._version_key(recipe_id)
+        version = self.backend.get(key)
+        if version is None:
+            version = time.time_ns()
+            if not self.backend.add(key, version):
+                version = self.backend.get(key) or version
+        return version
+
+    async def _aget_version(self, recipe_id) -> int:
+        key = self._version_key(recipe_id)
+        version = await self.backend.aget(key)
+        if version is None:
+            version = time.time_ns()
+            if not await self.backend.aadd(key, version):
+                version = await self.backend.aget(key) or version
+        return version
+
+    def get_or_set(self, recipe_id, build, variant=''):
+        """
+            Returns the cached payload of ``recipe_id`` or builds, stores
+            and returns it. ``variant`` distinguishes representations of the
+            same recipe. The version is read before building so a payload
+            built while the recipe changes is stored under the old version.
+        """
+        version = self._get_version(recipe_id)
+        key = f'{self.key_prefix}:{recipe_id}:{version}:{variant}'
+        payload = self.backend.get(key)
+        if payload is not None:
+            with self._lock:
+                self.hits += 1
+            return payload
+
+        with self._lock:
+            self.misses += 1
+        payload = build()
+        self.backend.set(key, payload, self.timeout)
+        return payload
+
+    async def aget_or_set(self, recipe_id, build, variant=''):
+        """
+            Async version of `get_or_set`; ``build`` is a coroutine function.
+        """
+        version = await self._aget_version(recipe_id)
+        key = f'{self.key_prefix}:{recipe_id}:{version}:{variant}'
+        payload = await self.backend.aget(key)
+        if payload is not None:
+            with self._lock:
+                self.hits += 1
+            return payload
+
+        with self._lock:
+            self.misses += 1
+        payload = await build()
+        await self.backend.aset(key, payload, self.timeout)
+        return payload
+
+    def invalidate(self, recipe_id):
+        self.backend.incr(self._version_key(recipe_id))
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+_recipe_detail_cache = None
+
+
+def get_recipe_detail_cache() -> RecipeDetailCache:
+    global _recipe_detail_cache
+    if _recipe_detail_cache is None:
+        config = getattr(
+            settings, 'RECIPE_DETAIL_CACHE', DEFAULT_RECIPE_DETAIL_CACHE
+        )
+        backend_class = import_string(config['BACKEND'])
+        _recipe_detail_cache = RecipeDetailCache(
+            backend_class(**config.get('OPTIONS', {})),
+            timeout=config.get('TIMEOUT')
+        )
+    return _recipe_detail_cache
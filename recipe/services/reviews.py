@@ -0,0 +1,72 @@
+"""
+    Batch submission of reviews.
+
+    All recipes referenced by a batch are checked and locked with one
+    ``IN`` query, the valid reviews are inserted with one ``bulk_create()``
+    and the rating aggregates of each affected recipe are updated once (by
+    the receivers of `reviews_bulk_created`), all in a single transaction.
+"""
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from recipe.services.importer import plain_errors
+from recipe.services.signals import reviews_bulk_created
+
+MISSING_RECIPE_MESSAGE = "Recipe does not exist."
+
+
+def create_review_batch(user, items) -> list:
+    """
+        Creates the reviews described by ``items`` (dicts with the fields of
+        `ReviewCreateSerializer`) for ``user``. Returns one result per item,
+        in order: ``{'index', 'status': 'created', 'id'}`` or ``{'index',
+        'status': 'failed', 'errors'}``.
+    """
+    from recipe.api.serializer import ReviewCreateSerializer
+    from recipe.models import Recipe, Review
+
+    serializer = ReviewCreateSerializer()
+    results = [None] * len(items)
+    pending = []
+    for index, data in enumerate(items):
+        try:
+            pending.append((index, serializer.run_validation(data)))
+        except ValidationError as exc:
+            results[index] = {
+                'index': index,
+                'status': 'failed',
+                'errors': plain_errors(exc.detail)
+            }
+
+    if not pending:
+        return results
+
+    reviews = []
+    with transaction.atomic():
+        # Locked, so a recipe cannot be deleted before its reviews are
+        # inserted.
+        existing = set(
+            Recipe.objects.select_for_update().filter(
+                pk__in={data['recipe_id'] for _, data in pending}
+            ).order_by('pk').values_list('pk', flat=True)
+        )
+        for index, data in pending:
+            if data['recipe_id'] not in existing:
+                results[index] = {
+                    'index': index,
+                    'status': 'failed',
+                    'errors': {'recipe_id': [MISSING_RECIPE_MESSAGE]}
+                }
+                continue
+            reviews.append((index, Review(user=user, **data)))
+
+        if reviews:
+            created = Review.objects.bulk_create(
+                [review for _, review in reviews]
+            )
+            reviews_bulk_created.send(sender=Review, reviews=created)
+
+    for index, review in reviews:
+        results[index] = {
+            'index': index, 'status': 'created', 'id': review.pk
+        }
+    return results
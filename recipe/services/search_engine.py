@@ -0,0 +1,184 @@
+"""
+    Full-text search over recipes.
+
+    Every recipe carries a ``search_document`` built from its title, category
+    name, ingredients and description (weighted in that order). On PostgreSQL
+    the document is a weighted ``tsvector`` backed by a GIN index and results
+    are ranked with ``ts_rank``. Other backends store a lower-cased plain text
+    document, match it with ``LIKE`` and rank the matches in Python.
+"""
+import re
+from django.db import connections
+from django.db.models import F, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce, Concat, Lower
+
+SEARCH_CONFIG = 'english'
+
+# Sources of the search document and their weight, most important first.
+SEARCH_DOCUMENT_SECTIONS = (
+    ('title', 'A'),
+    ('category_name', 'B'),
+    ('ingredients', 'C'),
+    ('description', 'D'),
+)
+
+# Same defaults PostgreSQL's ts_rank applies to the A, B, C and D weights.
+SEARCH_WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+# Separates the sections of the plain text document used off PostgreSQL.
+SECTION_SEPARATOR = '\x1f'
+
+# Model fields whose change requires the search document to be rebuilt.
+SEARCH_SOURCE_FIELDS = frozenset(
+    {'title', 'category', 'category_id', 'ingredients', 'description'}
+)
+
+TERM_REGEX = re.compile(r'\w+')
+
+
+def _category_name(category_model):
+    return Coalesce(
+        Subquery(
+            category_model.objects.filter(
+                pk=OuterRef('category_id')
+            ).values('name')[:1]
+        ),
+        Value('')
+    )
+
+
+def search_document_expression(category_model, vendor):
+    """
+        Returns the SQL expression computing a recipe's search document.
+
+        The expression only references columns of the recipe row (plus a
+        subquery for the category name) so it can be used in
+        ``QuerySet.update()`` for any number of recipes at once.
+    """
+    sources = {
+        'title': F('title'),
+        'category_name': _category_name(category_model),
+        'ingredients': F('ingredients'),
+        'description': F('description'),
+    }
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchVector
+
+        document = None
+        for name, weight in SEARCH_DOCUMENT_SECTIONS:
+            section = SearchVector(
+                sources[name], weight=weight, config=SEARCH_CONFIG
+            )
+            document = section if document is None else document + section
+        return document
+
+    parts = []
+    for name, _ in SEARCH_DOCUMENT_SECTIONS:
+        if parts:
+            parts.append(Value(SECTION_SEPARATOR))
+        parts.append(Lower(sources[name]))
+    return Concat(*parts, output_field=TextField())
+
+
+def refresh_search_documents(queryset) -> int:
+    """
+        Rebuilds the search document of every recipe in ``queryset`` with a
+        single UPDATE statement. Returns the number of rows updated.
+    """
+    from recipe.models import Category
+
+    vendor = connections[queryset.db].vendor
+    return queryset.update(
+        search_document=search_document_expression(Category, vendor)
+    )
+
+
+def get_search_terms(query) -> list:
+    return TERM_REGEX.findall(query.lower())
+
+
+def rank_document(document, terms) -> float:
+    """
+        Python counterpart of ``ts_rank`` for plain text documents.
+    """
+    sections = document.split(SECTION_SEPARATOR)
+    score = 0.0
+    for (_, weight), section in zip(SEARCH_DOCUMENT_SECTIONS, sections):
+        hits = sum(section.count(term) for term in terms)
+        score += SEARCH_WEIGHTS[weight] * hits
+    return score
+
+
+def plan_search(query, queryset=None, values=None):
+    """
+        Returns ``(queryset, finish)``: the query to run for ``query`` and
+        the function turning its fetched rows into the ranked results, or
+        ``(None, None)`` when nothing can match. Shared by the sync and
+        async entry points, which only differ in how they fetch the rows.
+    """
+    from recipe.models import Recipe
+
+    if queryset is None:
+        queryset = Recipe.objects.all()
+
+    if connections[queryset.db].vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        search_query = SearchQuery(
+            query, search_type='websearch', config=SEARCH_CONFIG
+        )
+        queryset = queryset.filter(search_document__match=search_query).annotate(
+            rank=SearchRank(F('search_document'), search_query)
+        ).order_by('-rank', '-id')
+        if values is not None:
+            queryset = queryset.values(*values)
+        return queryset, list
+
+    terms = get_search_terms(query)
+    if not terms:
+        return None, None
+    for term in terms:
+        queryset = queryset.filter(search_document__contains=term)
+
+    if values is None:
+        def finish(results):
+            for recipe in results:
+                recipe.rank = rank_document(recipe.search_document, terms)
+            results.sort(key=lambda recipe: (-recipe.rank, -recipe.id))
+            return results
+        return queryset, finish
+
+    # The document and id are needed for ranking even when not requested.
+    extra = [name for name in ('id', 'search_document') if name not in values]
+
+    def finish_rows(results):
+        results.sort(key=lambda row: (
+            -rank_document(row['search_document'], terms), -row['id']
+        ))
+        for row in results:
+            for name in extra:
+                del row[name]
+        return results
+    return queryset.values(*values, *extra), finish_rows
+
+
+def search_recipes(query, queryset=None, values=None) -> list:
+    """
+        Returns the recipes matching ``query``, most relevant first. With
+        ``values`` the rows are dicts of those columns, as returned by
+        ``QuerySet.values()``, instead of model instances.
+    """
+    queryset, finish = plan_search(query, queryset, values)
+    if queryset is None:
+        return []
+    return finish(list(queryset))
+
+
+async def asearch_recipes(query, queryset=None, values=None) -> list:
+    """
+        Async version of `search_recipes`.
+    """
+    queryset, finish = plan_search(query, queryset, values)
+    if queryset is None:
+        return []
+    return finish([row async for row in queryset])
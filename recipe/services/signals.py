@@ -0,0 +1,12 @@
+"""
+    Signals sent by services for writes that bypass model signals, such as
+    ``bulk_create()``. Receivers live in `recipe.signals`.
+"""
+from django.dispatch import Signal
+
+# Sent with ``recipes``, the list of created `Recipe` objects.
+recipes_bulk_created = Signal()
+
+# Sent with ``reviews``, the list of created `Review` objects, inside the
+# transaction that created them.
+reviews_bulk_created = Signal()
@@ -0,0 +1,115 @@
+"""
+    Cache of the users behind authenticated requests.
+
+    `CachedJWTAuthentication` resolves the user id of a token through this
+    cache instead of loading the row on every request. Entries live in a
+    bounded per-process LRU for at most ``TIMEOUT`` seconds and are tagged
+    with the user's version from `recipe.services.versioning`. Saving or
+    deleting a user (deactivation, password change, ...) bumps the
+    version, so with a shared cache backend every worker drops its copy on
+    the next request. Configured by the ``AUTH_USER_CACHE`` setting:
+
+        AUTH_USER_CACHE = {'MAX_ENTRIES': 10000, 'TIMEOUT': 60}
+"""
+import threading
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from recipe.services.response_cache import LocalLRUBackend
+from recipe.services.versioning import (
+    aget_version,
+    bump_version,
+    get_version
+)
+
+DEFAULT_AUTH_USER_CACHE = {
+    'MAX_ENTRIES': 10000,
+    'TIMEOUT': 60,
+}
+
+
+def _version_name(user_id) -> str:
+    return f'user:{user_id}'
+
+
+class UserCache:
+
+    def __init__(self, max_entries=10000, timeout=60):
+        self.backend = LocalLRUBackend(max_entries)
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, user_id, load):
+        """
+            Returns the cached user ``user_id``, or loads it with ``load()``
+            (which may raise ``DoesNotExist``) and caches it. The version is
+            read before loading so a user loaded while it changes is stored
+            under the old version.
+        """
+        version = get_version(_version_name(user_id))
+        user = self._get(user_id, version)
+        if user is None:
+            user = load()
+            self._set(user_id, version, user)
+        return user
+
+    async def aget_or_load(self, user_id, load):
+        """
+            Async version of `get_or_load`; ``load`` is a coroutine function.
+        """
+        version = await aget_version(_version_name(user_id))
+        user = self._get(user_id, version)
+        if user is None:
+            user = await load()
+            self._set(user_id, version, user)
+        return user
+
+    def _get(self, user_id, version):
+        entry = self.backend.get(user_id)
+        if entry is None or entry[0] != version:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        user_model = get_user_model()
+        # A new instance per request, so requests never share (and
+        # mutate) the same object.
+        return user_model.from_db(
+            'default',
+            [field.attname for field in user_model._meta.concrete_fields],
+            entry[1]
+        )
+
+    def _set(self, user_id, version, user):
+        values = tuple(
+            getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+        )
+        self.backend.set(user_id, (version, values), self.timeout)
+
+    def invalidate(self, user_id):
+        bump_version(_version_name(user_id))
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+_user_cache = None
+
+
+def get_user_cache() -> UserCache:
+    global _user_cache
+    if _user_cache is None:
+        config = getattr(settings, 'AUTH_USER_CACHE', DEFAULT_AUTH_USER_CACHE)
+        _user_cache = UserCache(
+            max_entries=config.get('MAX_ENTRIES', 10000),
+            timeout=config.get('TIMEOUT', 60)
+        )
+    return _user_cache
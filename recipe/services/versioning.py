@@ -0,0 +1,93 @@
+"""
+    Shared version counters for the in-process caches of the `recipe` app.
+
+    Each worker keeps its own in-memory copy of derived data (ingredient
+    index, category catalogue, ...) tagged with the version it was built
+    from. Writers bump the version in Django's cache framework, so with a
+    shared backend (memcached, redis) every worker notices a change through
+    a single cache read instead of re-querying the database.
+
+    Writers may also log what each version changed (`log_change`), so a
+    worker a few versions behind applies those changes (`get_changes`)
+    instead of rebuilding its copy.
+"""
+import time
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = 'recipe-radar:version:'
+# Logged changes outlive any worker lagging behind by more than this.
+CHANGE_LOG_TIMEOUT = 3600
+
+
+def _key(name) -> str:
+    return f'{VERSION_KEY_PREFIX}{name}'
+
+
+def get_version(name) -> int:
+    """
+        Returns the current version of ``name``, creating it if needed.
+    """
+    key = _key(name)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a counter evicted from the cache never
+        # comes back with a value a worker has already seen.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(name) -> int:
+    """
+        Increments the version of ``name`` and returns the new value.
+    """
+    key = _key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def _change_key(name, version) -> str:
+    return f'{_key(name)}:change:{version}'
+
+
+def log_change(name, version, change):
+    """
+        Stores ``change``, what ``version`` of ``name`` changed, for the
+        workers catching up with `get_changes`.
+    """
+    cache.set(_change_key(name, version), change, CHANGE_LOG_TIMEOUT)
+
+
+def get_changes(name, since, until, limit=100):
+    """
+        Returns the changes logged by the versions of ``name`` after
+        ``since`` up to ``until``, in order. Returns None when any of them
+        is unknown (expired, evicted or not logged yet) or when there are
+        more than ``limit``: the caller must rebuild instead.
+    """
+    if since is None or not 0 <= until - since <= limit:
+        return None
+    keys = [
+        _change_key(name, version) for version in range(since + 1, until + 1)
+    ]
+    changes = cache.get_many(keys)
+    if len(changes) != len(keys):
+        return None
+    return [changes[key] for key in keys]
+
+
+async def aget_version(name) -> int:
+    """
+        Async version of `get_version`, without blocking the event loop on
+        the cache backend.
+    """
+    key = _key(name)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
@@ -0,0 +1,312 @@
+"""
+    Signal receivers keeping derived recipe data in sync with writes.
+"""
+from django.db import transaction
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save
+)
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from recipe.models import Category, Recipe, Review, User
+from recipe.services.category_catalogue import get_category_catalogue
+from recipe.services.category_stats import (
+    RECIPE_STATS_FIELDS,
+    create_category_stats,
+    get_recipe_contributions,
+    record_recipe_deleted,
+    record_recipe_updated,
+    record_recipes_created
+)
+from recipe.services.pantry import pantry_index
+from recipe.services.ratings import (
+    record_review_created,
+    record_review_deleted,
+    record_review_updated,
+    record_reviews_created
+)
+from recipe.services.response_cache import get_recipe_detail_cache
+from recipe.services.search_engine import (
+    SEARCH_SOURCE_FIELDS,
+    refresh_search_documents
+)
+from recipe.services.signals import (
+    recipes_bulk_created,
+    reviews_bulk_created
+)
+from recipe.services.user_cache import get_user_cache
+
+
+@receiver(post_save, sender=Recipe)
+def refresh_recipe_search_document(sender, instance, raw=False,
+                                   update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields and not SEARCH_SOURCE_FIELDS.intersection(update_fields):
+        return
+    refresh_search_documents(Recipe.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Recipe)
+def update_pantry_index(sender, instance, raw=False, update_fields=None,
+                        **kwargs):
+    if raw:
+        return
+    if update_fields and 'ingredients' not in update_fields:
+        return
+    # After the commit, so a rolled back write never reaches the index
+    # and other workers rebuild from committed rows only.
+    recipe_id, ingredients = instance.pk, instance.ingredients
+    transaction.on_commit(lambda: pantry_index.update(recipe_id, ingredients))
+
+
+@receiver(post_delete, sender=Recipe)
+def remove_from_pantry_index(sender, instance, **kwargs):
+    recipe_id = instance.pk
+    transaction.on_commit(lambda: pantry_index.remove(recipe_id))
+
+
+@receiver(recipes_bulk_created, sender=Recipe)
+def index_bulk_created_recipes(sender, recipes, **kwargs):
+    refresh_search_documents(
+        Recipe.objects.filter(pk__in=[recipe.pk for recipe in recipes])
+    )
+    indexed = [(recipe.pk, recipe.ingredients) for recipe in recipes]
+    transaction.on_commit(lambda: pantry_index.update_many(indexed))
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_search_documents(sender, instance, created=False,
+                                      raw=False, **kwargs):
+    if raw or created:
+        return
+    refresh_search_documents(Recipe.objects.filter(category_id=instance.pk))
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_recipes(sender, instance, **kwargs):
+    instance._recipe_ids = list(
+        Recipe.objects.filter(category_id=instance.pk).values_list(
+            'id', flat=True
+        )
+    )
+
+
+@receiver(post_delete, sender=Category)
+def refresh_uncategorized_search_documents(sender, instance, **kwargs):
+    recipe_ids = getattr(instance, '_recipe_ids', None)
+    if recipe_ids:
+        refresh_search_documents(Recipe.objects.filter(pk__in=recipe_ids))
+
+
+def invalidate_recipe_detail(recipe_id):
+    # Wait for the commit so a concurrent read cannot re-cache the old rows
+    # under the new version.
+    transaction.on_commit(
+        lambda: get_recipe_detail_cache().invalidate(recipe_id)
+    )
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def invalidate_recipe_detail_on_recipe_write(sender, instance, raw=False,
+                                             **kwargs):
+    if not raw:
+        invalidate_recipe_detail(instance.pk)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_recipe_detail_on_review_write(sender, instance, raw=False,
+                                             **kwargs):
+    if not raw:
+        invalidate_recipe_detail(instance.recipe_id)
+
+
+@receiver(reviews_bulk_created, sender=Review)
+def invalidate_recipe_detail_on_bulk_reviews(sender, reviews, **kwargs):
+    for recipe_id in {review.recipe_id for review in reviews}:
+        invalidate_recipe_detail(recipe_id)
+
+
+def invalidate_category_catalogue():
+    # After the commit, like `invalidate_recipe_detail`.
+    transaction.on_commit(get_category_catalogue().invalidate)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_catalogue_on_category_write(sender, raw=False,
+                                                    **kwargs):
+    if not raw:
+        invalidate_category_catalogue()
+
+
+def get_loaded_values(instance) -> dict:
+    # Deferred columns are missing.
+    return {
+        name: instance.__dict__[name] for name in RECIPE_STATS_FIELDS
+        if name in instance.__dict__
+    }
+
+
+def get_saved_values(instance, update_fields) -> dict:
+    """
+        The `RECIPE_STATS_FIELDS` of ``instance`` as stored by a save with
+        ``update_fields``: fields it did not write keep their loaded value.
+    """
+    values = get_loaded_values(instance)
+    if update_fields:
+        saved = {
+            'category_id' if name == 'category' else name
+            for name in update_fields
+        }
+        for name in set(RECIPE_STATS_FIELDS) - saved:
+            if name in instance._loaded_values:
+                values[name] = instance._loaded_values[name]
+            else:
+                values.pop(name, None)
+    return values
+
+
+@receiver(post_init, sender=Recipe)
+def remember_recipe_values(sender, instance, **kwargs):
+    instance._loaded_values = get_loaded_values(instance)
+
+
+@receiver(post_save, sender=Recipe)
+def invalidate_category_catalogue_on_recipe_save(sender, instance,
+                                                 created=False, raw=False,
+                                                 update_fields=None,
+                                                 **kwargs):
+    if raw:
+        return
+    loaded_values = instance._loaded_values
+    saved_values = get_saved_values(instance, update_fields)
+    if (created or 'category_id' not in loaded_values
+            or loaded_values['category_id'] != saved_values.get('category_id')):
+        invalidate_category_catalogue()
+
+
+@receiver(post_delete, sender=Recipe)
+def invalidate_category_catalogue_on_recipe_delete(sender, instance,
+                                                   **kwargs):
+    invalidate_category_catalogue()
+
+
+@receiver(recipes_bulk_created, sender=Recipe)
+def invalidate_category_catalogue_on_bulk_recipes(sender, recipes, **kwargs):
+    invalidate_category_catalogue()
+
+
+@receiver(post_save, sender=Category)
+def create_stats_of_category(sender, instance, created=False, raw=False,
+                             **kwargs):
+    if created and not raw:
+        create_category_stats(instance)
+
+
+@receiver(post_save, sender=Recipe)
+def update_category_stats_on_recipe_save(sender, instance, created=False,
+                                         raw=False, update_fields=None,
+                                         **kwargs):
+    if raw:
+        return
+    if created:
+        record_recipes_created([instance])
+    else:
+        record_recipe_updated(
+            instance.pk, instance._loaded_values,
+            get_saved_values(instance, update_fields)
+        )
+
+
+@receiver(post_save, sender=Recipe)
+def refresh_loaded_recipe_values(sender, instance, update_fields=None,
+                                 **kwargs):
+    # Registered after every receiver comparing with the loaded values.
+    instance._loaded_values = get_saved_values(instance, update_fields)
+
+
+@receiver(pre_delete, sender=Recipe)
+def remember_recipe_contribution(sender, instance, **kwargs):
+    instance._stats_contribution = get_recipe_contributions(
+        [instance.pk]
+    ).get(instance.pk)
+
+
+@receiver(post_delete, sender=Recipe)
+def update_category_stats_on_recipe_delete(sender, instance, **kwargs):
+    contribution = getattr(instance, '_stats_contribution', None)
+    if contribution is not None:
+        category_id, contribution = contribution
+        # The cascaded reviews were deleted first and already removed
+        # their ratings from the category (see
+        # `update_rating_aggregates_on_review_delete`).
+        contribution = contribution.copy()
+        contribution.pop('review_count')
+        contribution.pop('rating_total')
+        record_recipe_deleted(category_id, contribution)
+
+
+@receiver(recipes_bulk_created, sender=Recipe)
+def update_category_stats_on_bulk_recipes(sender, recipes, **kwargs):
+    record_recipes_created(recipes)
+
+
+def get_loaded_rating(instance):
+    # ``(recipe_id, rating)``, None when either column is deferred.
+    if 'recipe_id' in instance.__dict__ and 'rating' in instance.__dict__:
+        return instance.recipe_id, instance.rating
+    return None
+
+
+@receiver(post_init, sender=Review)
+def remember_review_rating(sender, instance, **kwargs):
+    instance._loaded_rating = get_loaded_rating(instance)
+
+
+@receiver(pre_save, sender=Review)
+def read_partially_loaded_review_rating(sender, instance, raw=False,
+                                        **kwargs):
+    if raw or instance._state.adding or instance._loaded_rating:
+        return
+    instance._loaded_rating = Review.objects.filter(
+        pk=instance.pk
+    ).values_list('recipe_id', 'rating').first()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_aggregates_on_review_save(sender, instance, created=False,
+                                            raw=False, **kwargs):
+    if raw:
+        return
+    if created or instance._loaded_rating is None:
+        record_review_created(instance)
+    else:
+        record_review_updated(instance, *instance._loaded_rating)
+    instance._loaded_rating = get_loaded_rating(instance)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_aggregates_on_review_delete(sender, instance, **kwargs):
+    record_review_deleted(instance)
+
+
+@receiver(reviews_bulk_created, sender=Review)
+def update_rating_aggregates_on_bulk_reviews(sender, reviews, **kwargs):
+    record_reviews_created(reviews)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # After the commit, so a concurrent request cannot cache the old row
+    # under the new version.
+    user_id = getattr(instance, jwt_settings.USER_ID_FIELD)
+    transaction.on_commit(lambda: get_user_cache().invalidate(user_id))
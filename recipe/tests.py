@@ -1,3 +1,2101 @@
-from django.test import TestCase
+import csv
+import datetime
+import decimal
+import io
+import json
+import os
+import re
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+from django.http import StreamingHttpResponse
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from recipe.api.filter import recipe_filter_planner
+from recipe.api.serializer import (
+    RECIPE_ORDERINGS,
+    REVIEW_ORDERINGS,
+    RecipeReviewSerializer,
+    RecipeSerializer,
+    ReviewCreateSerializer,
+    UpdateRecipeSerializer,
+    ValuesSerializer,
+    recipe_review_values_serializer,
+    recipe_values_serializer
+)
+from recipe.hashers import PBKDF2PasswordHasher
+from recipe.models import Category, CategoryStats, Recipe, Review, User
+from recipe.renderers import FastJSONRenderer
+from recipe.services import (
+    get_category_catalogue,
+    get_recipe_detail_cache
+)
+from recipe.services.category_stats import (
+    STATS_FIELDS,
+    rebuild_category_stats
+)
+from recipe.services.exporter import export_recipes
+from recipe.services.importer import (
+    DUPLICATE_TITLE_MESSAGE,
+    RecipeImporter,
+    read_records
+)
+from recipe.services.pantry import PantryIndex, pantry_index
+from recipe.services.provisioning import (
+    DUPLICATE_EMAIL_MESSAGE,
+    DUPLICATE_PHONE_NUMBER_MESSAGE,
+    UserProvisioner
+)
+from recipe.services.response_cache import (
+    LocalLRUBackend,
+    RecipeDetailCache
+)
+from recipe.services.ratings import (
+    AGGREGATE_FIELDS,
+    rebuild_rating_aggregates
+)
+from recipe.services.user_cache import get_user_cache
+from recipe.utils import KeysetPagination
+from recipe_radar import metrics
+from recipe_radar.query_inspector import (
+    RepeatedQueriesError,
+    no_repeated_queries
+)
+
+
+class RecipeOrderingIndexTests(TestCase):
+    """
+        Every ordering accepted by the recipe list endpoint must be served by
+        its composite index instead of sorting the table in memory.
+    """
+
+    def explain(self, queryset) -> str:
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = self.explain(queryset)
+        self.assertIn(index_name, plan)
+        if connection.vendor == 'postgresql':
+            self.assertNotIn('Sort', plan)
+        else:
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def get_index_name(self, ordering, per_category=False) -> str:
+        fields = ['category'] if per_category else []
+        fields.extend(ordering)
+        for index in Recipe._meta.indexes:
+            if index.fields == fields:
+                return index.name
+        self.fail(f"No index declared for ordering {fields}")
+
+    def get_cursor_position(self, ordering) -> list:
+        values = {
+            'created_at': timezone.now(),
+            'avg_rating': 4.5,
+            'cooking_time': 30,
+            'serving_size': 4,
+            'id': 100,
+        }
+        return [values[name.lstrip('-')] for name in ordering]
+
+    def test_orderings_use_index(self):
+        for name, ordering in RECIPE_ORDERINGS.items():
+            with self.subTest(ordering=name):
+                queryset = Recipe.objects.order_by(*ordering)[:11]
+                self.assertUsesIndex(
+                    queryset, self.get_index_name(ordering)
+                )
+
+    def test_per_category_orderings_use_index(self):
+        for name, ordering in RECIPE_ORDERINGS.items():
+            with self.subTest(ordering=name):
+                queryset = Recipe.objects.filter(
+                    category_id=1
+                ).order_by(*ordering)[:11]
+                self.assertUsesIndex(
+                    queryset, self.get_index_name(ordering, per_category=True)
+                )
+
+    def test_cursor_pages_use_index(self):
+        for name, ordering in RECIPE_ORDERINGS.items():
+            with self.subTest(ordering=name):
+                paginator = KeysetPagination()
+                paginator.ordering = ordering
+                position = paginator.get_position_filter(
+                    self.get_cursor_position(ordering)
+                )
+                queryset = Recipe.objects.filter(position).order_by(
+                    *ordering
+                )[:11]
+                self.assertUsesIndex(
+                    queryset, self.get_index_name(ordering)
+                )
+
+
+class QueryInspectorTests(TestCase):
+    """
+        Review listings must not load the reviewer of each row separately.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'inspector@example.com', 'Inspector-pass1',
+            first_name='Query', last_name='Inspector',
+            phone_number='9000000001'
+        )
+        cls.recipe = Recipe.objects.create(
+            user=cls.user,
+            category=Category.objects.create(name='Soups'),
+            title='Tomato Soup',
+            description='A simple soup.',
+            ingredients='tomatoes\nsalt',
+            preparation_steps='Simmer.',
+            cooking_time=20,
+            serving_size=2
+        )
+        reviewers = User.objects.bulk_create(
+            User(
+                email=f'reviewer{index}@example.com',
+                phone_number=f'90000001{index:02d}',
+                first_name='Reviewer', last_name=str(index)
+            )
+            for index in range(5)
+        )
+        Review.objects.bulk_create(
+            Review(user=reviewer, recipe=cls.recipe, rating=4, comment='Nice')
+            for reviewer in reviewers
+        )
+
+    def test_detects_n_plus_one(self):
+        with self.assertRaises(RepeatedQueriesError):
+            with no_repeated_queries():
+                for review in Review.objects.all():
+                    review.user.first_name
+
+    def test_recipe_reviews_have_no_n_plus_one(self):
+        token = AccessToken.for_user(self.user)
+        with no_repeated_queries():
+            response = self.client.get(
+                reverse('recipe-reviews', kwargs={'pk': self.recipe.pk}),
+                headers={'Authorization': f'Bearer {token}'}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']['results']), 5)
+
+
+class CategoryCatalogueTests(TestCase):
+    """
+        The category list is served from the per-worker catalogue and
+        follows category and recipe writes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'catalogue@example.com', 'Catalogue-pass1',
+            first_name='Category', last_name='Catalogue',
+            phone_number='9000000002'
+        )
+        cls.soups = Category.objects.create(name='Soups')
+        cls.salads = Category.objects.create(name='Salads')
+        cls.recipe = Recipe.objects.create(
+            user=cls.user,
+            category=cls.soups,
+            title='Tomato Soup',
+            description='A simple soup.',
+            ingredients='tomatoes\nsalt',
+            preparation_steps='Simmer.',
+            cooking_time=20,
+            serving_size=2
+        )
+
+    def setUp(self):
+        # Other tests rolled back their writes without invalidating.
+        get_category_catalogue().invalidate()
+
+    def get_recipe_counts(self) -> dict:
+        response = self.client.get(reverse('category-list-create'))
+        self.assertEqual(response.status_code, 200)
+        return {
+            category['name']: category['recipe_count']
+            for category in response.json()
+        }
+
+    def test_cached_between_writes(self):
+        self.assertEqual(self.get_recipe_counts(), {'Soups': 1, 'Salads': 0})
+        with self.assertNumQueries(0):
+            self.get_recipe_counts()
+
+    def test_follows_recipe_category_changes(self):
+        etag = self.client.get(reverse('category-list-create'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recipe.category = self.salads
+            self.recipe.save()
+        self.assertEqual(self.get_recipe_counts(), {'Soups': 0, 'Salads': 1})
+        self.assertNotEqual(
+            self.client.get(reverse('category-list-create'))['ETag'], etag
+        )
+
+    def test_etag_follows_content_not_version(self):
+        etag = self.client.get(reverse('category-list-create'))['ETag']
+        get_category_catalogue().invalidate()
+        response = self.client.get(
+            reverse('category-list-create'), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_follows_category_writes(self):
+        self.get_recipe_counts()
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name='Desserts')
+            self.salads.delete()
+        self.assertEqual(
+            self.get_recipe_counts(), {'Soups': 1, 'Desserts': 0}
+        )
+
+
+class CategoryStatsTests(TestCase):
+    """
+        The incrementally maintained category statistics must match a full
+        rebuild after recipe and review writes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'stats@example.com', 'Stats-pass1',
+            first_name='Category', last_name='Stats',
+            phone_number='9000000003'
+        )
+        cls.soups = Category.objects.create(name='Soups')
+        cls.salads = Category.objects.create(name='Salads')
+
+    def get_stats(self) -> dict:
+        return {
+            stats.category_id: [
+                getattr(stats, name) for name in STATS_FIELDS
+            ]
+            for stats in CategoryStats.objects.all()
+        }
+
+    def assertMatchesRebuild(self):
+        stats = self.get_stats()
+        rebuild_category_stats()
+        self.assertEqual(stats, self.get_stats())
+
+    def test_follows_writes(self):
+        recipe = Recipe.objects.create(
+            user=self.user,
+            category=self.soups,
+            title='Tomato Soup',
+            description='A simple soup.',
+            ingredients='tomatoes\nsalt',
+            preparation_steps='Simmer.',
+            cooking_time=20,
+            serving_size=2
+        )
+        for rating in (5, 2):
+            Review.objects.create(
+                user=self.user, recipe=recipe, rating=rating, comment='Ok'
+            )
+        self.assertEqual(
+            self.get_stats()[self.soups.pk], [1, 20, 2, 2, 7]
+        )
+
+        # Loaded again, like a view would, with its rating aggregates.
+        recipe = Recipe.objects.get(pk=recipe.pk)
+        recipe.cooking_time = 30
+        recipe.save()
+        self.assertMatchesRebuild()
+
+        recipe.category = self.salads
+        recipe.serving_size = 4
+        recipe.save()
+        self.assertEqual(self.get_stats()[self.soups.pk], [0, 0, 0, 0, 0])
+        self.assertEqual(
+            self.get_stats()[self.salads.pk], [1, 30, 4, 2, 7]
+        )
+
+        recipe.delete()
+        self.assertMatchesRebuild()
+
+    def test_partially_loaded_save_rebuilds_its_categories(self):
+        desserts = Category.objects.create(name='Desserts')
+        recipe = Recipe.objects.create(
+            user=self.user,
+            category=self.soups,
+            title='Tomato Soup',
+            description='A simple soup.',
+            ingredients='tomatoes\nsalt',
+            preparation_steps='Simmer.',
+            cooking_time=20,
+            serving_size=2
+        )
+        untouched_at = CategoryStats.objects.get(category=desserts).updated_at
+
+        recipe = Recipe.objects.only('category_id').get(pk=recipe.pk)
+        recipe.category = self.salads
+        recipe.cooking_time = 45
+        recipe.save()
+        self.assertEqual(self.get_stats()[self.salads.pk], [1, 45, 2, 0, 0])
+        self.assertEqual(
+            CategoryStats.objects.get(category=desserts).updated_at,
+            untouched_at
+        )
+        self.assertMatchesRebuild()
+
+    def test_endpoint(self):
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        # Caches the authenticated user.
+        self.client.get(reverse('category-stats'), headers=headers)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('category-stats'), headers=headers
+            )
+        self.assertEqual(
+            [stats['name'] for stats in response.json()], ['Soups', 'Salads']
+        )
+
+
+class RecipeValidatorsTests(TestCase):
+    """
+        The recipe detail validators are read from the recipe row and follow
+        every review write.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'validators@example.com', 'Validators-pass1',
+            first_name='Recipe', last_name='Validators',
+            phone_number='9000000004'
+        )
+        cls.recipe = Recipe.objects.create(
+            user=cls.user,
+            title='Tomato Soup',
+            description='A simple soup.',
+            ingredients='tomatoes\nsalt',
+            preparation_steps='Simmer.',
+            cooking_time=20,
+            serving_size=2
+        )
+
+    def setUp(self):
+        self.headers = {
+            'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+        }
+
+    def get_recipe(self, **headers):
+        return self.client.get(
+            reverse('update-recipe', args=[self.recipe.pk]),
+            headers={**self.headers, **headers}
+        )
+
+    def test_not_modified_without_reading_reviews(self):
+        etag = self.get_recipe()['ETag']
+        with self.assertNumQueries(1):
+            response = self.get_recipe(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_follows_review_comment_edits(self):
+        review = Review.objects.create(
+            user=self.user, recipe=self.recipe, rating=4, comment='Good'
+        )
+        etag = self.get_recipe()['ETag']
+
+        response = self.client.patch(
+            reverse('review-detail', args=[review.pk]),
+            {'comment': 'Very good'}, content_type='application/json',
+            headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_recipe(if_none_match=etag).status_code, 200)
+
+    def test_follows_review_writes_outside_the_api(self):
+        review = Review.objects.create(
+            user=self.user, recipe=self.recipe, rating=4, comment='Good'
+        )
+        for write in (lambda: review.save(update_fields=['comment']),
+                      lambda: Review.objects.filter(pk=review.pk).delete()):
+            etag = self.get_recipe()['ETag']
+            write()
+            self.assertEqual(
+                self.get_recipe(if_none_match=etag).status_code, 200
+            )
+
+
+class FastJSONRendererTests(TestCase):
+    """
+        `FastJSONRenderer` must write the same bytes as DRF's JSONRenderer.
+    """
+
+    payloads = [
+        {'id': 1, 'title': 'Tomato Soup', 'description': None,
+         'avg_rating': 4.5, 'tags': ['soup', 'quick'], 'published': True},
+        [{'created_at': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456,
+                                          tzinfo=datetime.timezone.utc),
+          'day': datetime.date(2024, 5, 1),
+          'price': decimal.Decimal('12.50'),
+          'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678')}],
+        {'text': 'null 1e5 0.00001 caf\u00e9 \u2028 \u2029 \U0001f345'},
+        {'floats': [0.0, -0.0, 0.1, 1e-4, 9999999999999998.0, 2 ** 0.5]},
+        {'small': 1e-05, 'tiny': -5e-324, 'large': 1e16, 'huge': 1e308},
+        {'average': 1e-07, 'rows': [{'score': 1.5e+22}]},
+        {'big': 2 ** 70, 'nested': {'deep': [[{'value': 3.0}]]}},
+    ]
+
+    def test_same_bytes_as_json_renderer(self):
+        for payload in self.payloads:
+            with self.subTest(payload=payload):
+                self.assertEqual(
+                    FastJSONRenderer().render(payload),
+                    JSONRenderer().render(payload)
+                )
+
+    def test_rejects_non_finite_floats(self):
+        for value in (float('nan'), float('inf'), float('-inf')):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render({'avg_rating': value})
+
+
+class SearchTests(TestCase):
+    """
+        Search ranks title matches above category, ingredient and
+        description matches, and follows recipe and category writes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'search@example.com', 'Search-pass1',
+            first_name='Recipe', last_name='Search',
+            phone_number='9000000005'
+        )
+        cls.soups = Category.objects.create(name='Soups')
+        recipes = {
+            'Garden Salad': 'A tomato side.',
+            'Tomato Soup': 'Warm and simple.',
+            'Bean Stew': 'Hearty.',
+        }
+        for title, description in recipes.items():
+            Recipe.objects.create(
+                user=cls.user,
+                category=cls.soups,
+                title=title,
+                description=description,
+                ingredients='beans\nsalt',
+                preparation_steps='Cook.',
+                cooking_time=20,
+                serving_size=2
+            )
+
+    def search(self, query) -> list:
+        response = self.client.get(
+            reverse('search', args=[query]),
+            headers={
+                'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+            }
+        )
+        if response.status_code == 404:
+            return []
+        self.assertEqual(response.status_code, 200)
+        return [
+            recipe['title']
+            for recipe in response.json()['data']['search_results']
+        ]
+
+    def test_ranks_title_matches_first(self):
+        self.assertEqual(
+            self.search('tomato'), ['Tomato Soup', 'Garden Salad']
+        )
+        # Every term must match.
+        self.assertEqual(self.search('beans stew'), ['Bean Stew'])
+
+    def test_follows_writes(self):
+        recipe = Recipe.objects.get(title='Bean Stew')
+        recipe.title = 'Tomato Stew'
+        recipe.save()
+        self.assertEqual(
+            self.search('tomato'),
+            ['Tomato Stew', 'Tomato Soup', 'Garden Salad']
+        )
+
+        self.soups.name = 'Broths'
+        self.soups.save()
+        self.assertEqual(len(self.search('broths')), 3)
+        self.assertEqual(self.search('soups'), [])
+
+
+class PantryIndexTests(TestCase):
+    """
+        The pantry index follows committed recipe writes only.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'pantry@example.com', 'Pantry-pass1',
+            first_name='Pantry', last_name='Index',
+            phone_number='9000000006'
+        )
+        cls.soup = cls.create_recipe('Tomato Soup', '2 Tomatoes\nSalt')
+        cls.salad = cls.create_recipe(
+            'Garden Salad', 'tomato, cucumber (peeled), olive oil'
+        )
+
+    @classmethod
+    def create_recipe(cls, title, ingredients):
+        return Recipe.objects.create(
+            user=cls.user,
+            title=title,
+            description='Simple.',
+            ingredients=ingredients,
+            preparation_steps='Mix.',
+            cooking_time=10,
+            serving_size=2
+        )
+
+    def setUp(self):
+        # Rebuilt from this test's data.
+        pantry_index.build()
+
+    def match(self, *pantry, **kwargs) -> list:
+        return [
+            (match.recipe_id, match.matched, match.missing)
+            for match in pantry_index.match(pantry, **kwargs)
+        ]
+
+    def test_ranks_by_missing_ingredients(self):
+        self.assertEqual(
+            self.match('tomatoes', 'salt'),
+            [(self.soup.pk, 2, ()),
+             (self.salad.pk, 1, ('cucumber', 'olive oil'))]
+        )
+        self.assertEqual(
+            self.match('tomato', max_missing=1),
+            [(self.soup.pk, 1, ('salt',))]
+        )
+
+    def test_follows_committed_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.salad.ingredients = 'cucumber\nsalt'
+            self.salad.save()
+        self.assertEqual(
+            self.match('cucumber', 'salt'),
+            [(self.salad.pk, 2, ()), (self.soup.pk, 1, ('tomato',))]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.soup.delete()
+        self.assertEqual(self.match('tomato'), [])
+        self.assertEqual(
+            self.match('salt'), [(self.salad.pk, 1, ('cucumber',))]
+        )
+
+    def test_ignores_rolled_back_writes(self):
+        soup_id = self.soup.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    self.create_recipe('Tomato Stew', 'tomato\nbean')
+                    self.soup.delete()
+                    raise RuntimeError
+        self.assertEqual(
+            self.match('tomato'),
+            [(soup_id, 1, ('salt',)),
+             (self.salad.pk, 1, ('cucumber', 'olive oil'))]
+        )
+
+    def test_catches_up_with_other_workers(self):
+        # Another worker's index, publishing to the shared version.
+        other = PantryIndex()
+        other.build()
+        Recipe.objects.filter(pk=self.salad.pk).update(
+            ingredients='cucumber\nsalt'
+        )
+        other.update(self.salad.pk, 'cucumber\nsalt')
+        soup_id = self.soup.pk
+        Recipe.objects.filter(pk=soup_id).delete()
+        other.remove(soup_id)
+
+        with CaptureQueriesContext(connection) as queries:
+            with mock.patch.object(PantryIndex, 'build') as build:
+                matches = self.match('salt')
+        self.assertEqual(matches, [(self.salad.pk, 1, ('cucumber',))])
+        build.assert_not_called()
+        # The changed rows only.
+        self.assertEqual(len(queries), 1)
+
+    def test_rebuilds_without_change_log(self):
+        other = PantryIndex()
+        other.build()
+        with mock.patch('recipe.services.pantry.log_change'):
+            other.remove(self.salad.pk)
+        Recipe.objects.filter(pk=self.salad.pk).delete()
+        with mock.patch.object(
+                PantryIndex, 'build', autospec=True,
+                side_effect=PantryIndex.build) as build:
+            self.assertEqual(
+                self.match('tomato'), [(self.soup.pk, 1, ('salt',))]
+            )
+        build.assert_called_once()
+
+
+class RatingAggregatesTests(TestCase):
+    """
+        The rating aggregates stored on recipes follow review writes made
+        through the API and match a rebuild from `tabReview`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'ratings@example.com', 'Ratings-pass1',
+            first_name='Rating', last_name='Aggregates',
+            phone_number='9000000007'
+        )
+        cls.recipe = Recipe.objects.create(
+            user=cls.user,
+            title='Tomato Soup',
+            description='A simple soup.',
+            ingredients='tomatoes\nsalt',
+            preparation_steps='Simmer.',
+            cooking_time=20,
+            serving_size=2
+        )
+
+    def setUp(self):
+        self.headers = {
+            'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+        }
+
+    def get_aggregates(self) -> list:
+        return list(
+            Recipe.objects.filter(pk=self.recipe.pk).values_list(
+                *AGGREGATE_FIELDS
+            ).get()
+        )
+
+    def assertAggregates(self, avg_rating, histogram):
+        aggregates = self.get_aggregates()
+        self.assertEqual(
+            aggregates, [avg_rating, sum(histogram)] + histogram
+        )
+        rebuild_rating_aggregates([self.recipe.pk])
+        self.assertEqual(self.get_aggregates(), aggregates)
+
+    def create_review(self, rating) -> int:
+        response = self.client.post(
+            reverse('review-list-create'),
+            {'recipe_id': self.recipe.pk, 'rating': rating, 'comment': 'Ok'},
+            content_type='application/json', headers=self.headers
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+
+    def test_follows_review_writes(self):
+        first = self.create_review(5)
+        second = self.create_review(2)
+        self.assertAggregates(3.5, [0, 1, 0, 0, 1])
+
+        response = self.client.patch(
+            reverse('review-detail', args=[second]), {'rating': 4},
+            content_type='application/json', headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertAggregates(4.5, [0, 0, 0, 1, 1])
+
+        response = self.client.delete(
+            reverse('review-detail', args=[first]), headers=self.headers
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertAggregates(4.0, [0, 0, 0, 1, 0])
+
+        response = self.client.delete(
+            reverse('review-detail', args=[second]), headers=self.headers
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertAggregates(0.0, [0, 0, 0, 0, 0])
+
+    def test_follows_model_writes(self):
+        review = Review.objects.create(
+            user=self.user, recipe=self.recipe, rating=5, comment='Ok'
+        )
+        Review.objects.create(
+            user=self.user, recipe=self.recipe, rating=3, comment='Ok'
+        )
+        self.assertAggregates(4.0, [0, 0, 1, 0, 1])
+
+        review = Review.objects.only('id').get(pk=review.pk)
+        review.rating = 1
+        review.save()
+        self.assertAggregates(2.0, [1, 0, 1, 0, 0])
+
+        Review.objects.filter(rating=3).delete()
+        self.assertAggregates(1.0, [1, 0, 0, 0, 0])
+
+        other = Recipe.objects.create(
+            user=self.user, title='Onion Soup', description='Soup.',
+            ingredients='onions', preparation_steps='Simmer.',
+            cooking_time=40, serving_size=2
+        )
+        review.recipe = other
+        review.save()
+        self.assertAggregates(0.0, [0, 0, 0, 0, 0])
+        self.assertEqual(
+            Recipe.objects.filter(pk=other.pk).values_list(
+                'avg_rating', 'review_count'
+            ).get(),
+            (1.0, 1)
+        )
+
+    def test_recipe_saves_keep_aggregates(self):
+        stale = Recipe.objects.get(pk=self.recipe.pk)
+        self.create_review(4)
+        stale.title = 'Tomato Bisque'
+        stale.save()
+        self.assertAggregates(4.0, [0, 0, 0, 1, 0])
+
+        response = self.client.put(
+            reverse('update-recipe', args=[self.recipe.pk]),
+            {'title': 'Tomato Soup', 'description': 'A simple soup.',
+             'ingredients': 'tomatoes\nsalt', 'preparation_steps': 'Simmer.',
+             'cooking_time': 25, 'serving_size': 2},
+            content_type='application/json', headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertAggregates(4.0, [0, 0, 0, 1, 0])
+        self.assertEqual(
+            Recipe.objects.get(pk=self.recipe.pk).cooking_time, 25
+        )
+
+
+class KeysetPaginationTests(TestCase):
+    """
+        Following the cursors of the recipe list visits every recipe once,
+        in order, across rows with equal sort values.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'cursor@example.com', 'Cursor-pass1',
+            first_name='Keyset', last_name='Pagination',
+            phone_number='9000000008'
+        )
+        for index, (cooking_time, avg_rating) in enumerate(
+                [(10, 4.5), (10, 4.5), (20, 3.0), (10, 4.5), (20, 3.0),
+                 (30, 4.5), (20, 0.0)]):
+            Recipe.objects.create(
+                user=cls.user,
+                title=f'Recipe {index}',
+                description='Simple.',
+                ingredients='salt',
+                preparation_steps='Cook.',
+                cooking_time=cooking_time,
+                serving_size=2,
+                avg_rating=avg_rating
+            )
+
+    def list_recipes(self, ordering, query='pagination=cursor&page_size=2'):
+        return self.client.post(
+            f"{reverse('list-recipes')}?{query}&fields=id",
+            {'ordering': ordering}, content_type='application/json',
+            headers={
+                'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+            }
+        )
+
+    def test_cursor_round_trip(self):
+        for name in ('quickest', 'top_rated', 'newest'):
+            with self.subTest(ordering=name):
+                ids = []
+                query = 'pagination=cursor&page_size=2'
+                while query is not None:
+                    response = self.list_recipes(name, query)
+                    self.assertEqual(response.status_code, 200)
+                    data = response.json()['data']
+                    ids.extend(recipe['id'] for recipe in data['results'])
+                    query = data['next'] and urlsplit(data['next']).query
+                self.assertEqual(
+                    ids,
+                    list(Recipe.objects.order_by(
+                        *RECIPE_ORDERINGS[name]
+                    ).values_list('id', flat=True))
+                )
+
+    def test_rejects_foreign_cursors(self):
+        response = self.list_recipes('quickest')
+        cursor = parse_qs(
+            urlsplit(response.json()['data']['next']).query
+        )['cursor'][0]
+        for ordering, cursor in (('top_rated', cursor),
+                                 ('quickest', 'not-a-cursor')):
+            with self.subTest(ordering=ordering, cursor=cursor):
+                self.assertEqual(
+                    self.list_recipes(
+                        ordering, f'cursor={cursor}'
+                    ).status_code,
+                    404
+                )
+
+
+class FilterPlannerTests(TestCase):
+    """
+        Body filters of the recipe list are compiled from the declared
+        schema; anything outside it is rejected.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'filters@example.com', 'Filters-pass1',
+            first_name='Filter', last_name='Planner',
+            phone_number='9000000009'
+        )
+        for title, cooking_time in (('Quick Soup', 10), ('Slow Stew', 90)):
+            Recipe.objects.create(
+                user=cls.user,
+                title=title,
+                description='Simple.',
+                ingredients='salt',
+                preparation_steps='Cook.',
+                cooking_time=cooking_time,
+                serving_size=2
+            )
+
+    def test_compiles_declared_filters(self):
+        self.assertEqual(
+            recipe_filter_planner.compile({
+                'cooking_time__range': ['5', 30],
+                'category_id__in': [1, '2'],
+                'title__icontains': 'soup',
+            }),
+            Q(category__in=[1, 2], cooking_time__range=[5, 30],
+              title__icontains='soup')
+        )
+
+    def test_rejects_filters_outside_the_schema(self):
+        for filters in (
+                ['cooking_time'],
+                {'user__password__startswith': 'pbkdf2'},
+                {'user__email': 'filters@example.com'},
+                {'cooking_time__regex': '.*'},
+                {'review_count__in': [1, 2]},
+                {'cooking_time__range': [5]},
+                {'cooking_time__in': list(range(101))},
+                {'cooking_time': 'quick'},
+                {'title__icontains': 'soup', 'description__icontains': 'a'}):
+            with self.subTest(filters=filters):
+                with self.assertRaises(ValidationError):
+                    recipe_filter_planner.compile(filters)
+
+    def test_list_endpoint(self):
+        url = f"{reverse('list-recipes')}?fields=title"
+        headers = {
+            'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+        }
+        response = self.client.post(
+            url, {'filters': {'cooking_time__lte': 30}},
+            content_type='application/json', headers=headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()['data']['results'], [{'title': 'Quick Soup'}]
+        )
+
+        response = self.client.post(
+            url, {'filters': {'user__password__startswith': 'p'}},
+            content_type='application/json', headers=headers
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class RecipeDetailCacheTests(TestCase):
+    """
+        Recipe detail responses are cached until a committed write to the
+        recipe or its reviews.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'detail@example.com', 'Detail-pass1',
+            first_name='Detail', last_name='Cache',
+            phone_number='9000000010'
+        )
+        cls.recipe = Recipe.objects.create(
+            user=cls.user,
+            title='Tomato Soup',
+            description='A simple soup.',
+            ingredients='tomatoes\nsalt',
+            preparation_steps='Simmer.',
+            cooking_time=20,
+            serving_size=2
+        )
+
+    def setUp(self):
+        self.headers = {
+            'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+        }
+        # Ids are reused after other tests rolled back.
+        get_recipe_detail_cache().invalidate(self.recipe.pk)
+
+    def get_detail(self) -> dict:
+        response = self.client.get(
+            reverse('update-recipe', args=[self.recipe.pk]),
+            headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def test_cached(self):
+        self.get_detail()
+        # The validators only.
+        with self.assertNumQueries(1):
+            self.get_detail()
+
+    def test_follows_recipe_writes(self):
+        self.get_detail()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse('update-recipe', args=[self.recipe.pk]),
+                {'title': 'Tomato Bisque'}, content_type='application/json',
+                headers=self.headers
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_detail()['recipe']['title'], 'Tomato Bisque')
+
+    def test_follows_review_writes(self):
+        self.get_detail()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('review-list-create'),
+                {'recipe_id': self.recipe.pk, 'rating': 4, 'comment': 'Ok'},
+                content_type='application/json', headers=self.headers
+            )
+        self.assertEqual(response.status_code, 201)
+        detail = self.get_detail()
+        self.assertEqual(detail['review_count'], 1)
+        self.assertEqual(
+            [review['comment'] for review in detail['reviews']], ['Ok']
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(
+                reverse('review-detail', args=[response.json()['id']]),
+                headers=self.headers
+            )
+        self.assertEqual(self.get_detail()['reviews'], [])
+
+    def test_keeps_cache_on_rolled_back_writes(self):
+        self.get_detail()
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    Recipe.objects.filter(pk=self.recipe.pk).update(
+                        title='Rolled Back'
+                    )
+                    self.recipe.save()
+                    raise RuntimeError
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.get_detail()['recipe']['title'], 'Tomato Soup'
+            )
+
+    def test_evicted_versions_never_repeat(self):
+        backend = LocalLRUBackend(max_entries=1)
+        cache = RecipeDetailCache(backend)
+        version_key = cache._version_key(self.recipe.pk)
+        cache.invalidate(self.recipe.pk)
+        version = backend.get(version_key)
+        # Evicts the version.
+        backend.set('filler', 'filler')
+        cache.invalidate(self.recipe.pk)
+        self.assertGreater(backend.get(version_key), version)
+
+
+class ReviewBatchTests(TestCase):
+    """
+        Batch review submission reports each review, saves the valid ones
+        and updates the rating aggregates once per recipe.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'batch@example.com', 'Batch-pass1',
+            first_name='Review', last_name='Batch',
+            phone_number='9000000011'
+        )
+        cls.recipes = [
+            Recipe.objects.create(
+                user=cls.user,
+                title=title,
+                description='Simple.',
+                ingredients='salt',
+                preparation_steps='Cook.',
+                cooking_time=10,
+                serving_size=2
+            )
+            for title in ('Tomato Soup', 'Garden Salad')
+        ]
+
+    def submit(self, reviews):
+        return self.client.post(
+            reverse('review-batch-create'), {'reviews': reviews},
+            content_type='application/json',
+            headers={
+                'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+            }
+        )
+
+    def test_partial_success(self):
+        soup, salad = self.recipes
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.submit([
+                {'recipe_id': soup.pk, 'rating': 5, 'comment': 'Great'},
+                {'recipe_id': soup.pk, 'rating': 9, 'comment': 'Too high'},
+                {'recipe_id': salad.pk, 'rating': 2, 'comment': 'Bland'},
+                {'recipe_id': 0, 'rating': 3, 'comment': 'Missing'},
+                {'recipe_id': soup.pk, 'rating': 3, 'comment': 'Fine'},
+            ])
+        self.assertEqual(response.status_code, 201)
+        data = response.json()['data']
+        self.assertEqual((data['created'], data['failed']), (3, 2))
+        self.assertEqual(
+            [result['status'] for result in data['results']],
+            ['created', 'failed', 'created', 'failed', 'created']
+        )
+        self.assertIn('rating', data['results'][1]['errors'])
+        self.assertIn('recipe_id', data['results'][3]['errors'])
+        self.assertEqual(
+            sorted(Review.objects.values_list('comment', flat=True)),
+            ['Bland', 'Fine', 'Great']
+        )
+
+        self.assertEqual(
+            list(Recipe.objects.order_by('pk').values_list(
+                'review_count', 'avg_rating'
+            )),
+            [(2, 4.0), (1, 2.0)]
+        )
+
+    def test_all_failed(self):
+        response = self.submit([{'recipe_id': 0, 'rating': 3, 'comment': ''}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['data']['failed'], 1)
+        self.assertFalse(Review.objects.exists())
+
+    def test_recipe_deleted_during_validation(self):
+        soup, salad = self.recipes
+        run_validation = ReviewCreateSerializer.run_validation
+
+        def delete_salad(serializer, data):
+            Recipe.objects.filter(pk=salad.pk).delete()
+            return run_validation(serializer, data)
+
+        with mock.patch.object(
+                ReviewCreateSerializer, 'run_validation', delete_salad):
+            response = self.submit([
+                {'recipe_id': soup.pk, 'rating': 5, 'comment': 'Great'},
+                {'recipe_id': salad.pk, 'rating': 2, 'comment': 'Bland'},
+            ])
+        self.assertEqual(response.status_code, 201)
+        results = response.json()['data']['results']
+        self.assertEqual(
+            [result['status'] for result in results], ['created', 'failed']
+        )
+
+
+@override_settings(PASSWORD_HASHER_ITERATIONS=1000)
+class LoginHashingTests(TestCase):
+    """
+        A login hashes the password once, and re-hashes it when the
+        configured iteration count changed.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'login@example.com', 'Login-pass1',
+            first_name='Login', last_name='Hashing',
+            phone_number='9000000012'
+        )
+
+    def login(self, password='Login-pass1'):
+        return self.client.post(
+            reverse('login'),
+            {'email': 'login@example.com', 'password': password},
+            content_type='application/json'
+        )
+
+    def get_iterations(self) -> int:
+        self.user.refresh_from_db()
+        return int(self.user.password.split('$')[1])
+
+    def test_hashes_once_per_login(self):
+        with mock.patch.object(
+                PBKDF2PasswordHasher, 'encode', autospec=True,
+                side_effect=PBKDF2PasswordHasher.encode) as encode:
+            response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(encode.call_count, 1)
+
+    def test_rehashes_when_iterations_change(self):
+        self.assertEqual(self.get_iterations(), 1000)
+        with override_settings(PASSWORD_HASHER_ITERATIONS=2000):
+            self.assertEqual(self.login('Wrong-pass1').status_code, 400)
+            self.assertEqual(self.get_iterations(), 1000)
+
+            self.assertEqual(self.login().status_code, 200)
+            self.assertEqual(self.get_iterations(), 2000)
+        self.assertEqual(self.login().status_code, 200)
+
+
+class UserCacheTests(TestCase):
+    """
+        Authenticated requests resolve their user from the cache until a
+        committed write to the user.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'cached@example.com', 'Cached-pass1',
+            first_name='User', last_name='Cache',
+            phone_number='9000000013'
+        )
+
+    def setUp(self):
+        self.headers = {
+            'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+        }
+        # The cache outlives the rolled back writes of each test.
+        get_user_cache().invalidate(self.user.pk)
+        self.addCleanup(get_user_cache().invalidate, self.user.pk)
+
+    def get_stats(self):
+        return self.client.get(reverse('category-stats'), headers=self.headers)
+
+    def update_user(self, **values):
+        with self.captureOnCommitCallbacks(execute=True):
+            for name, value in values.items():
+                setattr(self.user, name, value)
+            self.user.save()
+
+    def test_cached(self):
+        self.assertEqual(self.get_stats().status_code, 200)
+        # The stats only.
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_stats().status_code, 200)
+
+    def test_follows_deactivation(self):
+        self.assertEqual(self.get_stats().status_code, 200)
+        self.update_user(is_active=False)
+        self.assertEqual(self.get_stats().status_code, 401)
+
+        self.update_user(is_active=True)
+        self.assertEqual(self.get_stats().status_code, 200)
+
+    def test_follows_deletion(self):
+        self.assertEqual(self.get_stats().status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertEqual(self.get_stats().status_code, 401)
+
+    async def test_async_views_follow_deactivation(self):
+        url = reverse('async-search', args=['nothing'])
+        response = await self.async_client.get(url, headers=self.headers)
+        # Authenticated, no results.
+        self.assertEqual(response.status_code, 404)
+        await sync_to_async(self.update_user)(is_active=False)
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, 401)
+
+
+class RecipeImportTests(TestCase):
+    """
+        The importer inserts valid rows chunk by chunk and reports every
+        rejected line, from the API and the management command alike.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'importer@example.com', 'Importer-pass1',
+            first_name='Recipe', last_name='Importer',
+            phone_number='9000000014'
+        )
+        cls.soups = Category.objects.create(name='Soups', description='Hot')
+        Recipe.objects.create(
+            user=cls.user,
+            category=cls.soups,
+            title='Tomato Soup',
+            description='A simple soup.',
+            ingredients='tomatoes\nsalt',
+            preparation_steps='Simmer.',
+            cooking_time=20,
+            serving_size=2
+        )
+
+    def record(self, title, **values) -> dict:
+        return {
+            'title': title,
+            'category_id': self.soups.pk,
+            'description': 'Imported.',
+            'ingredients': 'salt',
+            'preparation_steps': 'Cook.',
+            'cooking_time': 10,
+            'serving_size': 2,
+            **values
+        }
+
+    def jsonl(self, *lines) -> io.StringIO:
+        return io.StringIO(''.join(
+            (line if isinstance(line, str) else json.dumps(line)) + '\n'
+            for line in lines
+        ))
+
+    def run_import(self, stream, format='jsonl', **options):
+        chunks = []
+        importer = RecipeImporter(self.user, **options)
+        report = importer.run(
+            read_records(stream, format),
+            on_chunk=lambda report: chunks.append(report.created)
+        )
+        return report, chunks
+
+    def imported_titles(self) -> list:
+        return sorted(
+            Recipe.objects.exclude(title='Tomato Soup').values_list(
+                'title', flat=True
+            )
+        )
+
+    def test_chunks(self):
+        titles = [f'Imported {index}' for index in range(5)]
+        report, chunks = self.run_import(
+            self.jsonl(*(self.record(title) for title in titles)),
+            chunk_size=2
+        )
+        self.assertEqual((report.created, report.failed), (5, 0))
+        self.assertEqual(chunks, [2, 4, 5])
+        self.assertEqual(self.imported_titles(), titles)
+        self.assertEqual(
+            CategoryStats.objects.get(category=self.soups).recipe_count, 6
+        )
+
+    def test_reports_rejected_lines(self):
+        report, _ = self.run_import(self.jsonl(
+            self.record('Onion Soup'),
+            'not json',
+            self.record('Tomato Soup'),
+            self.record('Onion Soup'),
+            self.record('Bean Soup', cooking_time=-1),
+            self.record('Pea Soup', category_id=0),
+            ['not', 'an', 'object'],
+        ))
+        self.assertEqual((report.created, report.failed), (1, 6))
+        errors = {error['line']: error['errors'] for error in report.errors}
+        self.assertEqual(sorted(errors), [2, 3, 4, 5, 6, 7])
+        self.assertIn('Invalid JSON', errors[2]['non_field_errors'][0])
+        for line in (3, 4):
+            self.assertEqual(
+                errors[line], {'title': [DUPLICATE_TITLE_MESSAGE]}
+            )
+        self.assertIn('cooking_time', errors[5])
+        self.assertIn('category_id', errors[6])
+        self.assertEqual(
+            errors[7], {'non_field_errors': ["Expected a JSON object"]}
+        )
+        self.assertEqual(self.imported_titles(), ['Onion Soup'])
+
+    def test_falls_back_to_row_by_row_inserts(self):
+        # A concurrent write took a title after the uniqueness check.
+        with mock.patch.object(
+                RecipeImporter, 'get_existing_titles', return_value=set()):
+            report, _ = self.run_import(self.jsonl(
+                self.record('Onion Soup'),
+                self.record('Tomato Soup'),
+                self.record('Bean Soup'),
+            ))
+        self.assertEqual((report.created, report.failed), (2, 1))
+        self.assertEqual(
+            report.errors,
+            [{'line': 2, 'errors': {'title': [DUPLICATE_TITLE_MESSAGE]}}]
+        )
+        self.assertEqual(self.imported_titles(), ['Bean Soup', 'Onion Soup'])
+        self.assertEqual(
+            CategoryStats.objects.get(category=self.soups).recipe_count, 3
+        )
+
+    def test_api(self):
+        rows = [self.record('Onion Soup'), self.record('Tomato Soup')]
+        stream = io.StringIO()
+        writer = csv.DictWriter(stream, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        response = self.client.post(
+            reverse('import-recipes'),
+            {'file': SimpleUploadedFile(
+                'recipes.csv', stream.getvalue().encode()
+            )},
+            headers={
+                'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+            }
+        )
+        self.assertEqual(response.status_code, 201)
+        data = response.json()['data']
+        self.assertEqual((data['created'], data['failed']), (1, 1))
+        self.assertEqual(data['errors'][0]['line'], 3)
+        self.assertEqual(
+            Recipe.objects.get(title='Onion Soup').user_id, self.user.pk
+        )
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile(
+                'w', suffix='.jsonl', delete=False) as file:
+            file.write(self.jsonl(
+                self.record('Onion Soup'), self.record('Tomato Soup')
+            ).getvalue())
+        self.addCleanup(os.remove, file.name)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command(
+            'import_recipes', file.name, user=self.user.email,
+            chunk_size=1, stdout=stdout, stderr=stderr
+        )
+        self.assertIn('Imported 1 recipes (1 failed)', stdout.getvalue())
+        self.assertIn('line 2:', stderr.getvalue())
+        self.assertEqual(self.imported_titles(), ['Onion Soup'])
+
+
+class RecipeExportTests(TestCase):
+    """
+        Exports stream the filtered recipes or their reviews, in chunks,
+        with the fields of the API responses.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'exporter@example.com', 'Exporter-pass1',
+            first_name='Recipe', last_name='Exporter',
+            phone_number='9000000015'
+        )
+        cls.soups = Category.objects.create(name='Soups', description='Hot')
+        cls.salads = Category.objects.create(name='Salads', description='Cold')
+        cls.recipes = [
+            Recipe.objects.create(
+                user=cls.user,
+                category=category,
+                title=title,
+                description='Simple, "quoted".',
+                ingredients='salt\npepper',
+                preparation_steps='Cook.',
+                cooking_time=10,
+                serving_size=2
+            )
+            for title, category in (('Tomato Soup', cls.soups),
+                                    ('Onion Soup', cls.soups),
+                                    ('Garden Salad', cls.salads))
+        ]
+        Review.objects.create(
+            user=cls.user, recipe=cls.recipes[0], rating=4, comment='Good'
+        )
+        Review.objects.create(
+            user=cls.user, recipe=cls.recipes[2], rating=2, comment='Bland'
+        )
+
+    def export(self, query=''):
+        response = self.client.get(
+            f"{reverse('export-recipes')}?{query}",
+            headers={
+                'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+            }
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return response, b''.join(response.streaming_content).decode()
+
+    def expected_recipes(self, recipes) -> list:
+        return [
+            json.loads(JSONRenderer().render(RecipeSerializer(recipe).data))
+            for recipe in Recipe.objects.filter(
+                pk__in=[recipe.pk for recipe in recipes]
+            ).order_by('pk')
+        ]
+
+    def test_ndjson(self):
+        response, content = self.export(f'category_id={self.soups.pk}')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(
+            response['Content-Disposition'],
+            'attachment; filename="recipes.ndjson"'
+        )
+        self.assertEqual(
+            [json.loads(line) for line in content.splitlines()],
+            self.expected_recipes(self.recipes[:2])
+        )
+
+    def test_csv(self):
+        response, content = self.export('output=csv&title=salad')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(io.StringIO(content)))
+        expected = self.expected_recipes(self.recipes[2:])
+        self.assertEqual(rows[0], list(expected[0]))
+        self.assertEqual(
+            rows[1:],
+            [[str(value) for value in row.values()] for row in expected]
+        )
+
+    def test_reviews(self):
+        response, content = self.export(
+            f'output=csv&stream=reviews&category_id={self.salads.pk}'
+        )
+        self.assertEqual(
+            response['Content-Disposition'],
+            'attachment; filename="reviews.csv"'
+        )
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(
+            [(row['recipe'], row['rating'], row['comment']) for row in rows],
+            [(str(self.recipes[2].pk), '2', 'Bland')]
+        )
+
+    def test_rejects_invalid_filters(self):
+        response = self.client.get(
+            f"{reverse('export-recipes')}?cooking_time=soon",
+            headers={
+                'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+            }
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_reads_rows_in_chunks(self):
+        with mock.patch.object(
+                QuerySet, 'iterator', autospec=True,
+                side_effect=QuerySet.iterator) as iterator:
+            chunks = list(
+                export_recipes(Recipe.objects.all(), 'ndjson', chunk_size=2)
+            )
+        iterator.assert_called_once_with(mock.ANY, chunk_size=2)
+        self.assertEqual(
+            [chunk.count(b'\n') for chunk in chunks], [2, 1]
+        )
+
+
+@override_settings(PASSWORD_HASHER_ITERATIONS=1000)
+class UserProvisioningTests(TestCase):
+    """
+        Provisioning creates users with hashed passwords, in the calling
+        process or across a pool, and reports every rejected line.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            'provisioner@example.com', 'Provisioner-pass1',
+            first_name='User', last_name='Provisioner',
+            phone_number='9000000016'
+        )
+
+    def record(self, index, **values) -> dict:
+        return {
+            'first_name': 'Provisioned',
+            'last_name': f'User {index}',
+            'email': f'provisioned{index}@example.com',
+            'phone_number': f'81000000{index:02d}',
+            'password': f'Provisioned-pass{index}',
+            **values
+        }
+
+    def jsonl(self, *records) -> io.StringIO:
+        return io.StringIO(
+            ''.join(json.dumps(record) + '\n' for record in records)
+        )
+
+    def provisioned(self) -> list:
+        return list(
+            User.objects.exclude(pk=self.admin.pk).order_by('email')
+        )
+
+    def assertHashed(self, users):
+        for user in users:
+            algorithm, iterations, *_ = user.password.split('$')
+            self.assertEqual(
+                (algorithm, iterations), ('pbkdf2_sha256', '1000')
+            )
+            index = int(user.last_name.split()[-1])
+            self.assertTrue(user.check_password(f'Provisioned-pass{index}'))
+
+    def test_hashes_in_process_without_workers(self):
+        with mock.patch(
+                'recipe.services.provisioning.ProcessPoolExecutor') as pool:
+            report = UserProvisioner(workers=0, chunk_size=2).run(
+                read_records(self.jsonl(*map(self.record, range(3))), 'jsonl')
+            )
+        pool.assert_not_called()
+        self.assertEqual((report.created, report.failed), (3, 0))
+        self.assertHashed(self.provisioned())
+
+    def test_hashes_across_workers(self):
+        # Threads stand in for the spawned processes.
+        with mock.patch(
+                'recipe.services.provisioning.ProcessPoolExecutor',
+                side_effect=lambda processes, **kwargs: (
+                    ThreadPoolExecutor(processes)
+                )) as pool:
+            report = UserProvisioner(workers=2).run(
+                read_records(self.jsonl(*map(self.record, range(3))), 'jsonl')
+            )
+        pool.assert_called_once()
+        self.assertEqual(report.created, 3)
+        self.assertHashed(self.provisioned())
+
+    def test_reports_rejected_lines(self):
+        report = UserProvisioner().run(read_records(self.jsonl(
+            self.record(1),
+            self.record(2, email='provisioner@example.com'),
+            self.record(3, phone_number='8100000001'),
+            self.record(4, email='not-an-email'),
+            self.record(5, phone_number='12'),
+            self.record(6, password=''),
+        ), 'jsonl'))
+        self.assertEqual((report.created, report.failed), (1, 5))
+        errors = {error['line']: error['errors'] for error in report.errors}
+        self.assertEqual(errors[2], {'email': [DUPLICATE_EMAIL_MESSAGE]})
+        self.assertEqual(
+            errors[3], {'phone_number': [DUPLICATE_PHONE_NUMBER_MESSAGE]}
+        )
+        self.assertEqual(list(errors[4]), ['email'])
+        self.assertEqual(list(errors[5]), ['phone_number'])
+        self.assertEqual(list(errors[6]), ['password'])
+        self.assertEqual(
+            [user.email for user in self.provisioned()],
+            ['provisioned1@example.com']
+        )
+
+    def test_falls_back_to_row_by_row_inserts(self):
+        # A concurrent signup took an email after the uniqueness check.
+        with mock.patch.object(
+                UserProvisioner, 'get_taken', return_value=set()):
+            report = UserProvisioner().run(read_records(self.jsonl(
+                self.record(1),
+                self.record(2, email='provisioner@example.com'),
+            ), 'jsonl'))
+        self.assertEqual((report.created, report.failed), (1, 1))
+        self.assertEqual(
+            report.errors,
+            [{'line': 2, 'errors': {'email': [DUPLICATE_EMAIL_MESSAGE]}}]
+        )
+
+    def post(self, user, content):
+        return self.client.post(
+            reverse('provision-users'),
+            {'file': SimpleUploadedFile('users.jsonl', content.encode())},
+            headers={'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+        )
+
+    def test_api(self):
+        content = self.jsonl(self.record(1), self.record(1)).getvalue()
+        response = self.post(self.admin, content)
+        self.assertEqual(response.status_code, 201)
+        data = response.json()['data']
+        self.assertEqual((data['created'], data['failed']), (1, 1))
+        self.assertHashed(self.provisioned())
+
+        member = self.provisioned()[0]
+        response = self.post(member, self.jsonl(self.record(2)).getvalue())
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(len(self.provisioned()), 1)
+
+
+class PerformanceMetricsTests(TestCase):
+    """
+        Every response reports its timings in ``Server-Timing``, requests
+        are aggregated under bounded labels and ``/metrics`` is protected.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'metrics@example.com', 'Metrics-pass1',
+            first_name='Performance', last_name='Metrics',
+            phone_number='9000000017'
+        )
+        cls.recipe = Recipe.objects.create(
+            user=cls.user,
+            title='Tomato Soup',
+            description='A simple soup.',
+            ingredients='tomatoes\nsalt',
+            preparation_steps='Simmer.',
+            cooking_time=20,
+            serving_size=2
+        )
+
+    def setUp(self):
+        metrics.registry.clear()
+        self.addCleanup(metrics.registry.clear)
+        get_recipe_detail_cache().invalidate(self.recipe.pk)
+
+    def test_server_timing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('update-recipe', args=[self.recipe.pk]),
+                headers={
+                    'Authorization':
+                        f'Bearer {AccessToken.for_user(self.user)}'
+                }
+            )
+        self.assertEqual(response.status_code, 200)
+        timing = re.fullmatch(
+            r'db;dur=[\d.]+;desc="(\d+) queries", serialize;dur=[\d.]+, '
+            r'render;dur=[\d.]+, total;dur=[\d.]+',
+            response['Server-Timing']
+        )
+        self.assertIsNotNone(timing)
+        self.assertEqual(int(timing[1]), len(queries))
+
+        view = metrics.registry.views[('update-recipe', 'GET')]
+        self.assertEqual(view.queries, len(queries))
+        self.assertGreater(view.serialize_seconds, 0)
+        self.assertGreater(view.render_seconds, 0)
+
+    def test_bounded_labels(self):
+        self.client.generic('BREW', '/nowhere')
+        self.client.generic('BREW', reverse('category-list-create'))
+        self.client.get('/nowhere')
+        self.assertEqual(
+            sorted(metrics.registry.views),
+            [('category-list-create', 'other'), ('other', 'GET'),
+             ('other', 'other')]
+        )
+
+    @override_settings(METRICS_TOKEN='metrics-token')
+    def test_requires_the_token(self):
+        for authorization, status_code in (
+                (None, 401), ('Bearer wrong', 401),
+                ('Bearer metrics-token', 200)):
+            with self.subTest(authorization=authorization):
+                headers = {}
+                if authorization:
+                    headers['Authorization'] = authorization
+                response = self.client.get(
+                    reverse('metrics'), headers=headers
+                )
+                self.assertEqual(response.status_code, status_code)
+        self.assertIn(
+            b'recipe_radar_request_duration_seconds', response.content
+        )
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_open_without_token_only_in_debug(self):
+        for debug, status_code in ((False, 403), (True, 200)):
+            with self.subTest(debug=debug), self.settings(DEBUG=debug):
+                self.assertEqual(
+                    self.client.get(reverse('metrics')).status_code,
+                    status_code
+                )
+
+
+class AsyncViewsTests(TestCase):
+    """
+        The async endpoints answer like their sync counterparts and enforce
+        the same authentication.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'async@example.com', 'Async-pass1',
+            first_name='Async', last_name='Views',
+            phone_number='9000000018'
+        )
+        cls.soups = Category.objects.create(name='Soups', description='Hot')
+        cls.recipes = [
+            Recipe.objects.create(
+                user=cls.user,
+                category=cls.soups,
+                title=title,
+                description='A simple soup.',
+                ingredients='tomatoes\nsalt',
+                preparation_steps='Simmer.',
+                cooking_time=cooking_time,
+                serving_size=2
+            )
+            for title, cooking_time in (('Tomato Soup', 20),
+                                        ('Onion Soup', 40),
+                                        ('Bean Soup', 30))
+        ]
+        Review.objects.create(
+            user=cls.user, recipe=cls.recipes[0], rating=4, comment='Good'
+        )
+
+    def setUp(self):
+        self.headers = {
+            'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+        }
+        for recipe in self.recipes:
+            get_recipe_detail_cache().invalidate(recipe.pk)
+
+    def get_requests(self):
+        """
+            Yields ``(sync_url, async_url, method, body)``.
+        """
+        recipe_id = self.recipes[0].pk
+        yield (reverse('category-list-create'),
+               reverse('async-category-list'), 'get', None)
+        for query in ('', '?fields=card',
+                      '?pagination=cursor&page_size=2&fields=id,title'):
+            yield (reverse('list-recipes') + query,
+                   reverse('async-list-recipes') + query, 'post',
+                   {'ordering': 'quickest',
+                    'filters': {'cooking_time__lte': 30}})
+        for query in ('', '?fields=card'):
+            yield (reverse('update-recipe', args=[recipe_id]) + query,
+                   reverse('async-recipe-detail', args=[recipe_id]) + query,
+                   'get', None)
+        yield (reverse('update-recipe', args=[0]),
+               reverse('async-recipe-detail', args=[0]), 'get', None)
+        for query in ('onion', 'nothing'):
+            yield (reverse('search', args=[query]),
+                   reverse('async-search', args=[query]), 'get', None)
+
+    async def send(self, method, url, body, headers, sync=False):
+        kwargs = {'headers': headers}
+        if body is not None:
+            kwargs.update(data=body, content_type='application/json')
+        if sync:
+            return await sync_to_async(getattr(self.client, method))(
+                url, **kwargs
+            )
+        return await getattr(self.async_client, method)(url, **kwargs)
+
+    async def assertMatchesSync(self, sync_url, async_url, method, body,
+                                headers):
+        expected = await self.send(method, sync_url, body, headers, sync=True)
+        response = await self.send(method, async_url, body, headers)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.json(), expected.json())
+        for header in ('ETag', 'WWW-Authenticate'):
+            self.assertEqual(response.get(header), expected.get(header))
+        return response
+
+    async def test_match_sync_views(self):
+        for sync_url, async_url, method, body in self.get_requests():
+            with self.subTest(url=async_url):
+                await self.assertMatchesSync(
+                    sync_url, async_url, method, body, self.headers
+                )
+
+    async def test_enforce_authentication(self):
+        public_url = reverse('async-category-list')
+        for sync_url, async_url, method, body in self.get_requests():
+            for headers in ({}, {'Authorization': 'Bearer not-a-token'}):
+                with self.subTest(url=async_url, headers=headers):
+                    response = await self.assertMatchesSync(
+                        sync_url, async_url, method, body, headers
+                    )
+                    # Invalid tokens are rejected even by public views.
+                    public = async_url == public_url and not headers
+                    self.assertEqual(
+                        response.status_code, 200 if public else 401
+                    )
+
+
+class ValuesSerializerTests(TestCase):
+    """
+        `ValuesSerializer` renders ``values()`` rows to the same bytes as
+        its model serializer renders instances.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'values@example.com', 'Values-pass1',
+            first_name='Values', last_name='Serializer',
+            phone_number='9000000019'
+        )
+        soups = Category.objects.create(name='Soups', description='Hot')
+        for title, category, rating in (('Tomato Soup', soups, 4),
+                                        ('Plain Rice', None, None)):
+            recipe = Recipe.objects.create(
+                user=cls.user,
+                category=category,
+                title=title,
+                description='Déjà vu, "quoted".',
+                ingredients='tomatoes\nsalt',
+                preparation_steps='Simmer.',
+                cooking_time=20,
+                serving_size=2
+            )
+            if rating:
+                Review.objects.create(
+                    user=cls.user, recipe=recipe, rating=rating,
+                    comment='Good'
+                )
+        Review.objects.create(
+            user=cls.user, recipe=recipe, rating=3, comment='Fine'
+        )
+
+    def assertSameBytes(self, values_serializer, serializer_class,
+                        queryset):
+        queryset = queryset.order_by('pk')
+        rows = values_serializer.serialize(
+            queryset.values(*values_serializer.columns)
+        )
+        instances = serializer_class(queryset, many=True).data
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            with self.subTest(renderer=type(renderer).__name__):
+                self.assertEqual(
+                    renderer.render(rows), renderer.render(instances)
+                )
+
+    def test_recipes(self):
+        self.assertSameBytes(
+            recipe_values_serializer, RecipeSerializer, Recipe.objects.all()
+        )
+
+    def test_reviews(self):
+        self.assertSameBytes(
+            recipe_review_values_serializer, RecipeReviewSerializer,
+            Review.objects.all()
+        )
+
+    def test_list_endpoint(self):
+        response = self.client.post(
+            reverse('list-recipes'), {'ordering': 'newest'},
+            content_type='application/json',
+            headers={
+                'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+            }
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()['data']['results'],
+            json.loads(JSONRenderer().render(RecipeSerializer(
+                Recipe.objects.order_by(*RECIPE_ORDERINGS['newest']),
+                many=True
+            ).data))
+        )
+
+    def test_rejects_unsupported_fields(self):
+        class DescribedRecipeSerializer(RecipeSerializer):
+            summary = serializers.SerializerMethodField()
+
+            def get_summary(self, recipe):
+                return recipe.title
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(DescribedRecipeSerializer).plan
+
+
+class SparseFieldsetTests(TestCase):
+    """
+        ``?fields=`` selects the keys returned and the columns read, and
+        rejects unknown fields.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'fieldsets@example.com', 'Fieldsets-pass1',
+            first_name='Sparse', last_name='Fieldsets',
+            phone_number='9000000020'
+        )
+        cls.recipe = Recipe.objects.create(
+            user=cls.user,
+            title='Tomato Soup',
+            description='A long description.',
+            ingredients='tomatoes\nsalt',
+            preparation_steps='Simmer for a long time.',
+            cooking_time=20,
+            serving_size=2
+        )
+
+    def setUp(self):
+        self.headers = {
+            'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+        }
+        get_recipe_detail_cache().invalidate(self.recipe.pk)
+        # Authenticate once, so only the view's queries are captured.
+        get_user_cache().invalidate(self.user.pk)
+        self.addCleanup(get_user_cache().invalidate, self.user.pk)
+        self.list_recipes('')
+
+    def list_recipes(self, fields):
+        return self.client.post(
+            f"{reverse('list-recipes')}?fields={fields}",
+            {'ordering': 'newest'}, content_type='application/json',
+            headers=self.headers
+        )
+
+    def get_detail(self, fields):
+        return self.client.get(
+            reverse('update-recipe', args=[self.recipe.pk]),
+            {'fields': fields}, headers=self.headers
+        )
+
+    def search(self, fields):
+        return self.client.get(
+            reverse('search', args=['tomato']), {'fields': fields},
+            headers=self.headers
+        )
+
+    def test_selects_fields_and_columns(self):
+        for name, request, serializer_class, get_item in (
+                ('list', self.list_recipes, RecipeSerializer,
+                 lambda data: data['results'][0]),
+                ('detail', self.get_detail, UpdateRecipeSerializer,
+                 lambda data: data['recipe']),
+                ('search', self.search, RecipeSerializer,
+                 lambda data: data['search_results'][0])):
+            card = serializer_class.fieldsets['card']
+            for fields, keys in (('title,id', ['id', 'title']),
+                                 ('card', card)):
+                with self.subTest(view=name, fields=fields):
+                    with CaptureQueriesContext(connection) as queries:
+                        response = request(fields)
+                    self.assertEqual(response.status_code, 200)
+                    item = get_item(response.json()['data'])
+                    # In declaration order, whatever the requested order.
+                    self.assertEqual(
+                        list(item),
+                        [key for key in serializer_class().fields
+                         if key in keys]
+                    )
+                    self.assertCountEqual(item, keys)
+                    recipe_queries = [
+                        query['sql'] for query in queries
+                        if 'FROM "tabRecipe"' in query['sql']
+                    ]
+                    self.assertTrue(recipe_queries)
+                    for sql in recipe_queries:
+                        self.assertNotIn('"preparation_steps"', sql)
+
+    def test_full_fieldset(self):
+        default = self.get_detail('').json()['data']['recipe']
+        get_recipe_detail_cache().invalidate(self.recipe.pk)
+        self.assertEqual(
+            self.get_detail('full').json()['data']['recipe'], default
+        )
+        self.assertIn('preparation_steps', default)
+
+    def test_rejects_unknown_fields(self):
+        for request in (self.list_recipes, self.get_detail, self.search):
+            for fields in ('title,password', ',', 'cards'):
+                with self.subTest(view=request.__name__, fields=fields):
+                    response = request(fields)
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn('fields', str(response.json()))
+
+
+class RecipeReviewPagesTests(TestCase):
+    """
+        The recipe detail embeds the most recent page of reviews, and its
+        ``reviews_next`` cursor continues in the recipe reviews endpoint.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'pages@example.com', 'Pages-pass1',
+            first_name='Review', last_name='Pages',
+            phone_number='9000000021'
+        )
+        cls.recipe = Recipe.objects.create(
+            user=cls.user,
+            title='Tomato Soup',
+            description='A simple soup.',
+            ingredients='tomatoes\nsalt',
+            preparation_steps='Simmer.',
+            cooking_time=20,
+            serving_size=2
+        )
+        created_at = timezone.now()
+        # Equal timestamps in pairs, so the pages split ties by id.
+        cls.reviews = Review.objects.bulk_create(
+            Review(
+                user=cls.user, recipe=cls.recipe, rating=index % 5 + 1,
+                comment=f'Review {index}'
+            )
+            for index in range(25)
+        )
+        for index, review in enumerate(cls.reviews):
+            Review.objects.filter(pk=review.pk).update(
+                created_at=created_at - datetime.timedelta(minutes=index // 2)
+            )
+        rebuild_rating_aggregates([cls.recipe.pk])
+
+    def setUp(self):
+        self.headers = {
+            'Authorization': f'Bearer {AccessToken.for_user(self.user)}'
+        }
+        get_recipe_detail_cache().invalidate(self.recipe.pk)
+
+    def get(self, url):
+        response = self.client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def test_follows_embedded_cursor(self):
+        expected = list(
+            Review.objects.order_by(*REVIEW_ORDERINGS['recent']).values_list(
+                'comment', flat=True
+            )
+        )
+        data = self.get(reverse('update-recipe', args=[self.recipe.pk]))
+        self.assertEqual(data['review_count'], 25)
+        self.assertEqual(len(data['reviews']), KeysetPagination.page_size)
+        self.assertEqual(
+            list(data['reviews'][0]),
+            list(RecipeReviewSerializer().fields)
+        )
+
+        comments = [review['comment'] for review in data['reviews']]
+        next_url = data['reviews_next']
+        self.assertTrue(next_url.startswith(
+            reverse('recipe-reviews', args=[self.recipe.pk])
+        ))
+        while next_url is not None:
+            page = self.get(next_url)
+            self.assertEqual(page['count'], 25)
+            comments.extend(review['comment'] for review in page['results'])
+            next_url = page['next']
+        self.assertEqual(comments, expected)
+
+    def test_single_page_has_no_cursor(self):
+        Review.objects.exclude(pk__in=[
+            review.pk for review in self.reviews[:3]
+        ]).delete()
+        data = self.get(reverse('update-recipe', args=[self.recipe.pk]))
+        self.assertEqual(data['review_count'], 3)
+        self.assertEqual(len(data['reviews']), 3)
+        self.assertIsNone(data['reviews_next'])
+
+    def test_missing_recipe(self):
+        response = self.client.get(
+            reverse('recipe-reviews', args=[0]), headers=self.headers
+        )
+        self.assertEqual(response.status_code, 404)
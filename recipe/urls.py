@@ -4,12 +4,24 @@ from recipe import api
 urlpatterns = [
     path('signup', api.SignupAPI.as_view(), name='signup'),
     path('login', api.LoginAPI.as_view(), name='login'),
+    path('users/import', api.UserProvisionAPI.as_view(), name='provision-users'),
     path('recipe', api.CreateRecipeAPI.as_view(), name='recipe'),
     path('reviews', api.ReviewCreateView.as_view(), name='review-list-create'),
+    path('reviews/batch', api.ReviewBatchCreateAPI.as_view(), name='review-batch-create'),
     path('reviews/<int:pk>', api.ReviewDetailView.as_view(), name='review-detail'),
     path('categories', api.CategoryListCreateAPIView.as_view(), name='category-list-create'),
     path('categories/<int:pk>', api.CategoryRetrieveUpdateDestroyAPIView.as_view(), name='category-retrieve-update-destroy'),
+    path('categories/stats', api.CategoryStatsListAPIView.as_view(), name='category-stats'),
+    path('categories/<int:pk>/stats', api.CategoryStatsRetrieveAPIView.as_view(), name='category-stats-detail'),
     path('recipes', api.ListGetRecipeAPI.as_view(), name='list-recipes'),
+    path('recipes/pantry', api.PantryMatchAPI.as_view(), name='pantry-match'),
+    path('recipes/import', api.RecipeImportAPI.as_view(), name='import-recipes'),
+    path('recipes/export', api.RecipeExportAPI.as_view(), name='export-recipes'),
     path('recipe/<int:pk>', api.ListUpdateDeleteRecipeAPI.as_view(), name='update-recipe'),
+    path('recipe/<int:pk>/reviews', api.RecipeReviewListAPI.as_view(), name='recipe-reviews'),
     path('search/<str:query>', api.SearchAPI.as_view(), name='search'),
+    path('async/categories', api.AsyncCategoryListAPI.as_view(), name='async-category-list'),
+    path('async/recipes', api.AsyncRecipeListAPI.as_view(), name='async-list-recipes'),
+    path('async/recipe/<int:pk>', api.AsyncRecipeDetailAPI.as_view(), name='async-recipe-detail'),
+    path('async/search/<str:query>', api.AsyncSearchAPI.as_view(), name='async-search'),
 ]
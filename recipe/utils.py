@@ -1,8 +1,19 @@
-import copy
+import json
 import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
 from recipe.models import User
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    PageNumberPagination,
+    _positive_int
+)
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from recipe_radar.constant import RESPONSE_FAILED, RESPONSE_SUCCESS
 from rest_framework.views import exception_handler
 from rest_framework.serializers import ValidationError
@@ -13,33 +24,233 @@ class CustomPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+            Async version of `paginate_queryset`, counting and fetching the
+            page with the async ORM.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        if page_number in self.last_page_strings:
+            page_number = paginator.num_pages
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+
+        bottom = (number - 1) * page_size
+        rows = [row async for row in queryset[bottom:bottom + page_size]]
+        self.page = paginator._get_page(rows, number, paginator)
+        return rows
+
+    def get_paginated_data(self, data) -> dict:
+        return {
+            'count': self.page.paginator.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+
+class KeysetPagination(BasePagination):
+    """
+        Cursor pagination over a stable ordering without COUNT or OFFSET.
 
-def get_success_response() -> dict:
+        The cursor is an opaque token holding the ordering values of the
+        last row of the page, and the next page is fetched with a
+        ``WHERE (a, b) < (x, y)`` style condition. Page 1000 therefore costs
+        the same index range scan as page 1. The last ordering field must be
+        unique (``id``) so rows with equal values are never skipped.
     """
-        Returns a deep copy of the success response dictionary.
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.prepare(queryset, request, view)
+        return self.get_page(queryset, self.decode_cursor(request))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.prepare(queryset, request, view)
+        return await self.aget_page(queryset, self.decode_cursor(request))
+
+    def prepare(self, queryset, request, view):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, view)
+        self.model = queryset.model
+
+    def get_page_queryset(self, queryset, position=None):
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+        return queryset[:self.page_size + 1]
+
+    def get_page(self, queryset, position=None) -> list:
+        """
+            Returns the rows of ``queryset`` after ``position``, or the
+            first page when it is None.
+        """
+        return self.set_page(
+            list(self.get_page_queryset(queryset, position))
+        )
 
-        This function returns a deep copy of the global RESPONSE_SUCCESS
-        dictionary.The deep copy ensures that the returned dictionary can
-        be modified without altering the original RESPONSE_SUCCESS dictionary.
+    async def aget_page(self, queryset, position=None) -> list:
+        return self.set_page([
+            row async for row in self.get_page_queryset(queryset, position)
+        ])
 
-        Returns:
-            dict: A deep copy of the success response dictionary.
-    """
-    return copy.deepcopy(RESPONSE_SUCCESS)
+    def set_page(self, rows) -> list:
+        self.page = rows[:self.page_size]
+        self.next_position = None
+        if len(rows) > self.page_size:
+            self.next_position = self.get_row_position(self.page[-1])
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_ordering(self, request, view):
+        get_keyset_ordering = getattr(view, 'get_keyset_ordering', None)
+        if get_keyset_ordering is not None:
+            return tuple(get_keyset_ordering())
+        return self.ordering
+
+    def _fields(self):
+        return [
+            (name.lstrip('-'), name.startswith('-')) for name in self.ordering
+        ]
+
+    def get_position_filter(self, position) -> Q:
+        fields = self._fields()
+        condition = None
+        for (name, descending), value in reversed(list(zip(fields, position))):
+            after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+            if condition is not None:
+                after |= Q(**{name: value}) & condition
+            condition = after
+        # Redundant bound on the leading column that the index can use as
+        # the start of its range scan.
+        name, descending = fields[0]
+        bound = Q(**{f"{name}__{'lte' if descending else 'gte'}": position[0]})
+        return bound & condition
+
+    def get_row_position(self, row) -> list:
+        if isinstance(row, dict):
+            return [row[name] for name, _ in self._fields()]
+        return [getattr(row, name) for name, _ in self._fields()]
+
+    def encode_cursor(self, position) -> str:
+        payload = {
+            'o': list(self.ordering),
+            'p': [
+                value.isoformat() if hasattr(value, 'isoformat') else value
+                for value in position
+            ]
+        }
+        data = json.dumps(payload, separators=(',', ':')).encode()
+        return urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padding = '=' * (-len(encoded) % 4)
+            payload = json.loads(urlsafe_b64decode(encoded + padding))
+            if payload['o'] != list(self.ordering):
+                raise ValueError("cursor belongs to another ordering")
+            fields = self._fields()
+            if len(payload['p']) != len(fields):
+                raise ValueError("cursor does not match the ordering")
+            return [
+                self.model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(fields, payload['p'])
+            ]
+        except (KeyError, TypeError, ValueError, FieldDoesNotExist,
+                DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position)
+        )
 
+    def get_paginated_data(self, data) -> dict:
+        return {
+            'next': self.get_next_link(),
+            'results': data
+        }
 
-def get_fail_response() -> dict:
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+def build_envelope(status, message, data=None) -> dict:
     """
-        Returns a deep copy of the success response dictionary.
+        Returns a new ``{status, message, data}`` envelope dictionary.
+
+        The envelope is built directly instead of deep copying the
+        RESPONSE_SUCCESS / RESPONSE_FAILED templates on every request.
+    """
+    return {
+        "status": status,
+        "message": message,
+        "data": data if data is not None else {}
+    }
 
-        This function returns a deep copy of the global RESPONSE_FAILED
-        dictionary.The deep copy ensures that the returned dictionary can be
-        modified without altering the original RESPONSE_FAILED dictionary.
 
-        Returns:
-            dict: A deep copy of the success response dictionary.
+class EnvelopeResponse(Response):
+    """
+        `Recipe Radar` response: wraps ``data`` in the ``{status, message,
+        data}`` envelope when the response is constructed, so views return
+        their payload and message and no second Response is built around
+        a paginator's or generic view's own Response.
     """
-    return copy.deepcopy(RESPONSE_FAILED)
+
+    def __init__(self, data=None, message=None, status=None,
+                 envelope_status=RESPONSE_SUCCESS["status"], **kwargs):
+        if message is None:
+            message = (RESPONSE_SUCCESS["message"]
+                       if envelope_status == RESPONSE_SUCCESS["status"]
+                       else RESPONSE_FAILED["message"])
+        super().__init__(
+            build_envelope(envelope_status, message, data),
+            status=status,
+            **kwargs
+        )
 
 
 def recipe_custom_exc_handler(exc, context):
@@ -50,22 +261,22 @@ def recipe_custom_exc_handler(exc, context):
     response = exception_handler(exc, context)
 
     if response is not None:
-        _response = get_fail_response()
+        message = RESPONSE_FAILED["message"]
+        data = None
 
         try:
             if isinstance(exc, ValidationError):
                 errors = []
                 for error in response.data.values():
                     errors.append(error[0])
-                _response['message'] = errors
+                message = errors
             elif exc.status_code >= 400:
-                _response['message'] = exc.default_detail
+                message = exc.default_detail
             else:
-                _response['data'] = response.data
-            response.data = _response
-        except:
-            _response["message"] = str(exc)
-            response.data = _response
+                data = response.data
+        except Exception:
+            message = str(exc)
+        response.data = build_envelope(RESPONSE_FAILED["status"], message, data)
 
     return response
 
@@ -109,6 +320,29 @@ def validate_password(value) -> str:
     return value
 
 
+def validate_phone_number_format(value) -> str:
+    """
+    Validates the format of a phone number, without the uniqueness check
+    of `validate_phone_number` (bulk provisioning checks a whole batch with
+    one query).
+    """
+    phone_number_regex = r'^\+?1?\d{9,15}$'
+    if not re.match(phone_number_regex, value):
+        raise ValidationError("Invalid phone number format")
+    return value
+
+
+def validate_email_format(value) -> str:
+    """
+    Validates the format of an email address, without the uniqueness check
+    of `validate_email`.
+    """
+    email_regex = r"(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$)"
+    if not re.match(email_regex, value):
+        raise ValidationError("Invalid email format")
+    return value
+
+
 def validate_phone_number(value) -> str:
     """
     Validates the format and uniqueness of a phone number.
@@ -123,9 +357,7 @@ def validate_phone_number(value) -> str:
     - ValidationError: If the phone number format is invalid or if a user with
       the same phone number already exists in the database.
     """
-    phone_number_regex = r'^\+?1?\d{9,15}$'
-    if not re.match(phone_number_regex, value):
-        raise ValidationError("Invalid phone number format")
+    validate_phone_number_format(value)
 
     if User.objects.filter(phone_number=value).exists():
         raise ValidationError(
@@ -148,9 +380,7 @@ def validate_email(value) -> str:
     - ValidationError: If the email address format is invalid or if a user with
       the same email address already exists in the database.
     """
-    email_regex = r"(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$)"
-    if not re.match(email_regex, value):
-        raise ValidationError("Invalid email format")
+    validate_email_format(value)
     if User.objects.filter(email=value).exists():
         raise ValidationError(
             "User with this email already exists."
@@ -158,8 +388,15 @@ def validate_email(value) -> str:
     return value
 
 
-def success_response(data=None, status=None, message="success"):
-    response = get_success_response()
-    response['data'] = data if data is not None else {}
-    response['message'] = message
-    return Response(response, status=status)
+def success_response(data=None, status=None, message=None, **kwargs):
+    return EnvelopeResponse(data, message=message, status=status, **kwargs)
+
+
+def fail_response(message=None, status=None, data=None, **kwargs):
+    return EnvelopeResponse(
+        data,
+        message=message,
+        status=status,
+        envelope_status=RESPONSE_FAILED["status"],
+        **kwargs
+    )
@@ -0,0 +1,325 @@
+"""
+    Per-request performance metrics.
+
+    `PerformanceMetricsMiddleware` (``recipe_radar.middleware``) opens a
+    `RequestStats` for every request. Queries are counted and timed by an
+    execute wrapper installed on every database connection, the app's
+    serializers time themselves with `time_serialize` and the JSON renderer
+    adds its encoding time. When the response is ready the totals are
+    folded into per-view aggregates, exposed by `metrics_view` in the
+    Prometheus text format. Unresolved routes and unknown HTTP methods are
+    labelled ``other``, so clients cannot grow the number of series.
+
+    Aggregates are per process (sum them across workers in the query), and
+    recording a request costs a few counter updates under one lock.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.module_loading import import_string
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Objects with a ``stats()`` method returning ``hits`` and ``misses``.
+CACHES = {
+    'recipe_detail': 'recipe.services.response_cache.get_recipe_detail_cache',
+    'auth_user': 'recipe.services.user_cache.get_user_cache',
+    'category_catalogue':
+        'recipe.services.category_catalogue.get_category_catalogue',
+}
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+METHODS = frozenset(
+    ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+)
+OTHER_LABEL = 'other'
+
+_current_request = ContextVar('recipe_radar_request_stats', default=None)
+
+
+class RequestStats:
+    __slots__ = (
+        'started_at', 'queries', 'db_seconds', 'serialize_seconds',
+        'render_seconds', 'serializing'
+    )
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.render_seconds = 0.0
+        self.serializing = False
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+
+def start_request():
+    """
+        Starts collecting the stats of the current request. Returns the
+        stats and a token for `finish_request`.
+    """
+    stats = RequestStats()
+    return stats, _current_request.set(stats)
+
+
+def finish_request(token):
+    _current_request.reset(token)
+
+
+def record_render(seconds):
+    """
+        Adds ``seconds`` of response encoding to the current request.
+    """
+    stats = _current_request.get()
+    if stats is not None:
+        stats.render_seconds += seconds
+
+
+@contextmanager
+def time_serialize():
+    """
+        Adds the time spent in the block to the serialization time of the
+        current request, less the queries it ran (lazy querysets), which
+        are counted as database time. Nested blocks count once.
+    """
+    stats = _current_request.get()
+    if stats is None or stats.serializing:
+        yield
+        return
+    stats.serializing = True
+    db_seconds = stats.db_seconds
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializing = False
+        stats.serialize_seconds += (
+            time.perf_counter() - started_at
+            - (stats.db_seconds - db_seconds)
+        )
+
+
+def time_query(execute, sql, params, many, context):
+    """
+        Database execute wrapper counting and timing the queries of the
+        current request. Context variables follow the request into the
+        threads that run async ORM queries.
+    """
+    stats = _current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started_at
+
+
+def install_query_timer(sender, connection, **kwargs):
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+def install_query_timers():
+    """
+        Installs the timer on the connections opened before this module was
+        imported; `install_query_timer` handles the later ones.
+    """
+    for connection in connections.all(initialized_only=True):
+        install_query_timer(None, connection)
+
+
+connection_created.connect(install_query_timer)
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def samples(self, name, labels):
+        """
+            Yields the cumulative ``_bucket``, ``_sum`` and ``_count`` lines.
+        """
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {total}'
+        total += self.counts[-1]
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {total}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+        yield f'{name}_count{{{labels}}} {total}'
+
+
+class ViewMetrics:
+
+    def __init__(self):
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.statuses = {}
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.render_seconds = 0.0
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.views = {}
+        self._lock = threading.Lock()
+
+    def record(self, view, method, status_code, stats, duration, size):
+        with self._lock:
+            metrics = self.views.get((view, method))
+            if metrics is None:
+                metrics = self.views[(view, method)] = ViewMetrics()
+            metrics.duration.observe(duration)
+            if size is not None:
+                metrics.size.observe(size)
+            metrics.statuses[status_code] = (
+                metrics.statuses.get(status_code, 0) + 1
+            )
+            metrics.queries += stats.queries
+            metrics.db_seconds += stats.db_seconds
+            metrics.serialize_seconds += stats.serialize_seconds
+            metrics.render_seconds += stats.render_seconds
+
+    def clear(self):
+        with self._lock:
+            self.views.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            views = sorted(self.views.items())
+            lines = []
+
+            def family(name, kind, help_text):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+
+            family('recipe_radar_requests_total', 'counter',
+                   'Requests by view, method and status code.')
+            for (view, method), metrics in views:
+                for status_code, count in sorted(metrics.statuses.items()):
+                    lines.append(
+                        f'recipe_radar_requests_total{{'
+                        f'{_labels(view, method)},status="{status_code}"}} '
+                        f'{count}'
+                    )
+
+            family('recipe_radar_request_duration_seconds', 'histogram',
+                   'Time from the first middleware to the response.')
+            for (view, method), metrics in views:
+                lines.extend(metrics.duration.samples(
+                    'recipe_radar_request_duration_seconds',
+                    _labels(view, method)
+                ))
+
+            family('recipe_radar_response_size_bytes', 'histogram',
+                   'Size of the response body (streamed responses are '
+                   'not counted).')
+            for (view, method), metrics in views:
+                lines.extend(metrics.size.samples(
+                    'recipe_radar_response_size_bytes', _labels(view, method)
+                ))
+
+            for name, attribute, help_text in (
+                    ('recipe_radar_db_queries_total', 'queries',
+                     'Database queries run by requests.'),
+                    ('recipe_radar_db_duration_seconds_total', 'db_seconds',
+                     'Time spent in database queries.'),
+                    ('recipe_radar_serialize_duration_seconds_total',
+                     'serialize_seconds',
+                     'Time spent in serializers, queries excluded.'),
+                    ('recipe_radar_render_duration_seconds_total',
+                     'render_seconds', 'Time spent encoding responses.')):
+                family(name, 'counter', help_text)
+                for (view, method), metrics in views:
+                    lines.append(
+                        f'{name}{{{_labels(view, method)}}} '
+                        f'{getattr(metrics, attribute)}'
+                    )
+
+        family('recipe_radar_cache_hits_total', 'counter', 'Cache hits.')
+        cache_stats = get_cache_stats()
+        for cache, stats in cache_stats.items():
+            lines.append(
+                f'recipe_radar_cache_hits_total{{cache="{cache}"}} '
+                f'{stats["hits"]}'
+            )
+        family('recipe_radar_cache_misses_total', 'counter', 'Cache misses.')
+        for cache, stats in cache_stats.items():
+            lines.append(
+                f'recipe_radar_cache_misses_total{{cache="{cache}"}} '
+                f'{stats["misses"]}'
+            )
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value) -> str:
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _labels(view, method) -> str:
+    return f'view="{_escape(view)}",method="{_escape(method)}"'
+
+
+def get_request_labels(request) -> tuple:
+    """
+        Returns the ``(view, method)`` labels of ``request``, from a fixed
+        set of values whatever the client sends.
+    """
+    match = request.resolver_match
+    view = match.view_name if match else OTHER_LABEL
+    method = request.method if request.method in METHODS else OTHER_LABEL
+    return view, method
+
+
+def get_cache_stats() -> dict:
+    return {
+        name: import_string(path)().stats() for name, path in CACHES.items()
+    }
+
+
+registry = MetricsRegistry()
+
+
+def metrics_view(request):
+    """
+        Prometheus scrape endpoint. Requests must send ``METRICS_TOKEN`` as
+        ``Authorization: Bearer <token>``. Without a token the endpoint is
+        only open when ``DEBUG`` is on.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=403)
+    elif not constant_time_compare(
+            request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        registry.render(), content_type=PROMETHEUS_CONTENT_TYPE
+    )
@@ -3,8 +3,14 @@
 """
 
 import logging
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
 from django.http import JsonResponse
-from recipe.utils import get_fail_response
+from recipe.utils import build_envelope
+from recipe_radar import metrics
+from recipe_radar.query_inspector import QueryInspector
+from recipe_radar.constant import RESPONSE_FAILED
 
 logger = logger = logging.getLogger(__name__)
 
@@ -28,7 +34,104 @@ class RecipeRadarMiddleware:
 
         logger.critical(f"An error occurred: {exception}", exc_info=True)
 
-        response = get_fail_response()
-        response['message'] = str(exception)
+        response = build_envelope(RESPONSE_FAILED['status'], str(exception))
 
         return JsonResponse(response, status=500)
+
+
+class PerformanceMetricsMiddleware:
+    """
+        Records the latency, database queries and time, serialization and
+        encoding time and response size of every request in `recipe_radar.metrics`, per view,
+        and reports them to the client in a ``Server-Timing`` header.
+
+        Works in both sync and async mode so async views are not pushed to
+        a thread. Put it first in ``MIDDLEWARE`` to time the whole stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        metrics.install_query_timers()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.finish_request(token)
+        return self.record(request, response, stats)
+
+    async def __acall__(self, request):
+        stats, token = metrics.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.finish_request(token)
+        return self.record(request, response, stats)
+
+    def record(self, request, response, stats):
+        duration = stats.elapsed
+        metrics.registry.record(
+            *metrics.get_request_labels(request),
+            response.status_code,
+            stats,
+            duration,
+            None if response.streaming else len(response.content)
+        )
+        response['Server-Timing'] = (
+            f'db;dur={stats.db_seconds * 1000:.2f};'
+            f'desc="{stats.queries} queries", '
+            f'serialize;dur={stats.serialize_seconds * 1000:.2f}, '
+            f'render;dur={stats.render_seconds * 1000:.2f}, '
+            f'total;dur={duration * 1000:.2f}'
+        )
+        return response
+
+
+class QueryInspectorMiddleware:
+    """
+        Development aid: inspects the queries of every request with
+        `QueryInspector` and logs the shapes repeated ``threshold`` times or
+        more (likely N+1 patterns) with the stacks that issued them. The
+        number of repeated shapes is returned in ``X-Repeated-Queries``.
+
+        Disabled unless ``QUERY_INSPECTOR_ENABLED`` is set.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_INSPECTOR_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with QueryInspector() as inspector:
+            response = self.get_response(request)
+        return self.report(request, response, inspector)
+
+    async def __acall__(self, request):
+        with QueryInspector() as inspector:
+            response = await self.get_response(request)
+        return self.report(request, response, inspector)
+
+    def report(self, request, response, inspector):
+        repeated = inspector.repeated()
+        if repeated:
+            logger.warning(
+                f"{request.method} {request.get_full_path()} ran "
+                f"{inspector.total} queries with {len(repeated)} repeated "
+                f"shapes:\n{inspector.report()}"
+            )
+            response['X-Repeated-Queries'] = str(len(repeated))
+        return response
@@ -0,0 +1,186 @@
+"""
+    Duplicate query (N+1) detection for development and tests.
+
+    `QueryInspector` captures every SQL statement run while it is active,
+    groups them by normalized shape (literals, parameters and ``IN`` lists
+    collapsed) and reports the shapes run ``threshold`` times or more,
+    with the stack that issued them::
+
+        with no_repeated_queries():
+            client.get('/api/recipe/1/reviews')
+
+        @no_repeated_queries(threshold=3)
+        def test_list(self): ...
+
+    ``QueryInspectorMiddleware`` (``recipe_radar.middleware``) runs one per
+    request when ``QUERY_INSPECTOR_ENABLED`` is set and logs the repeats.
+    Capturing stacks is slow; keep both out of production.
+"""
+import os
+import re
+import traceback
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+DEFAULT_THRESHOLD = 3
+# Frames of the project kept per query, innermost last.
+STACK_DEPTH = 5
+
+_active_inspector = ContextVar('recipe_radar_query_inspector', default=None)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN \((?:%s, )*%s\)', re.I)
+_SPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql) -> str:
+    """
+        Shape of ``sql``: string and number literals become ``%s`` like
+        the parameters, and ``IN`` lists of any length become ``IN (...)``.
+    """
+    sql = _SPACE_RE.sub(' ', sql).strip()
+    sql = _NUMBER_RE.sub('%s', _STRING_RE.sub('%s', sql))
+    return _IN_LIST_RE.sub('IN (...)', sql)
+
+
+def get_query_stack() -> list:
+    """
+        The innermost `STACK_DEPTH` frames of the project that led to the
+        current query, followed by the frame that issued it (the innermost
+        one outside the ORM, e.g. a serializer field's ``get_attribute``),
+        as ``file:line in function`` strings.
+    """
+    base_dir = str(settings.BASE_DIR)
+    stack = [
+        frame for frame in traceback.extract_stack()[:-1]
+        if frame.filename != __file__
+    ]
+    frames = [
+        frame for frame in stack
+        if frame.filename.startswith(base_dir)
+        and '/site-packages/' not in frame.filename
+    ][-STACK_DEPTH:]
+    for frame in reversed(stack):
+        if f'{os.sep}django{os.sep}db{os.sep}' not in frame.filename:
+            if not frames or frame != frames[-1]:
+                frames.append(frame)
+            break
+    return [
+        f'{frame.filename}:{frame.lineno} in {frame.name}' for frame in frames
+    ]
+
+
+@dataclass
+class QueryShape:
+    sql: str
+    count: int = 0
+    # Distinct stacks that issued the shape.
+    stacks: list = field(default_factory=list)
+
+    def report(self) -> str:
+        lines = [f'{self.count}x {self.sql}']
+        for stack in self.stacks:
+            lines.append('    issued from:')
+            lines.extend(f'      {frame}' for frame in stack)
+        return '\n'.join(lines)
+
+
+class RepeatedQueriesError(AssertionError):
+    pass
+
+
+class QueryInspector(ContextDecorator):
+    """
+        Captures the queries run while active, on every database connection
+        and in the threads running async ORM queries. Inspectors nest; each
+        one sees the queries of its block.
+
+        ``fail=True`` raises `RepeatedQueriesError` when the block exits
+        with repeated shapes.
+    """
+
+    def __init__(self, threshold=None, fail=False):
+        self.threshold = threshold or getattr(
+            settings, 'QUERY_INSPECTOR_THRESHOLD', DEFAULT_THRESHOLD
+        )
+        self.fail = fail
+        self.shapes = {}
+        self.total = 0
+        self.parent = None
+        self._token = None
+
+    def __enter__(self):
+        install_query_recorders()
+        self.shapes, self.total = {}, 0
+        self.parent = _active_inspector.get()
+        self._token = _active_inspector.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        _active_inspector.reset(self._token)
+        if self.fail and exc_type is None and self.repeated():
+            raise RepeatedQueriesError(
+                f"Repeated queries (threshold {self.threshold}):\n"
+                + self.report()
+            )
+        return False
+
+    def record(self, sql, stack):
+        self.total += 1
+        sql = normalize_sql(sql)
+        shape = self.shapes.get(sql)
+        if shape is None:
+            shape = self.shapes[sql] = QueryShape(sql)
+        shape.count += 1
+        if stack not in shape.stacks:
+            shape.stacks.append(stack)
+        if self.parent is not None:
+            self.parent.record(sql, stack)
+
+    def repeated(self) -> list:
+        """
+            Shapes run ``threshold`` times or more, most repeated first.
+        """
+        return sorted(
+            (shape for shape in self.shapes.values()
+             if shape.count >= self.threshold),
+            key=lambda shape: -shape.count
+        )
+
+    def report(self) -> str:
+        return '\n'.join(shape.report() for shape in self.repeated())
+
+
+def no_repeated_queries(threshold=None) -> QueryInspector:
+    """
+        Context manager / decorator failing the block (a test) when a
+        query shape is repeated ``threshold`` times or more.
+    """
+    return QueryInspector(threshold, fail=True)
+
+
+def record_query(execute, sql, params, many, context):
+    inspector = _active_inspector.get()
+    if inspector is not None:
+        inspector.record(sql, tuple(get_query_stack()))
+    return execute(sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_query_recorders():
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(None, connection)
+
+
+connection_created.connect(install_query_recorder)
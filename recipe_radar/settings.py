@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'recipe_radar.middleware.PerformanceMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,6 +57,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'recipe_radar.middleware.QueryInspectorMiddleware',
 ]
 
 ROOT_URLCONF = 'recipe_radar.urls'
@@ -93,6 +95,64 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Use a shared backend (memcached, redis) in production so version bumps
+# made by one worker are seen by the others.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Assembled recipe detail payloads, see `recipe.services.response_cache`.
+# Switch to `recipe.services.response_cache.DjangoCacheBackend` to share the
+# cache (and its invalidations) between workers.
+
+RECIPE_DETAIL_CACHE = {
+    'BACKEND': os.getenv(
+        'RECIPE_DETAIL_CACHE_BACKEND',
+        'recipe.services.response_cache.LocalLRUBackend'
+    ),
+    'OPTIONS': {},
+    'TIMEOUT': int(os.getenv('RECIPE_DETAIL_CACHE_TIMEOUT', 300)),
+}
+
+# Users of authenticated requests, see `recipe.services.user_cache`.
+# Entries are dropped when the user is saved or deleted; TIMEOUT bounds
+# staleness after writes that bypass signals (QuerySet.update()).
+
+AUTH_USER_CACHE = {
+    'MAX_ENTRIES': int(os.getenv('AUTH_USER_CACHE_MAX_ENTRIES', 10000)),
+    'TIMEOUT': int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 60)),
+}
+
+# Category list with recipe counts, see `recipe.services.category_catalogue`.
+# Rebuilt when a category or a recipe's category changes; TIMEOUT bounds
+# staleness when the version counters are not shared between workers.
+
+CATEGORY_CATALOGUE = {
+    'TIMEOUT': int(os.getenv('CATEGORY_CATALOGUE_TIMEOUT', 300)),
+}
+
+# Prometheus scrape endpoint `/metrics`, see `recipe_radar.metrics`.
+# Scrapers must send `Authorization: Bearer <METRICS_TOKEN>`; unset, the
+# endpoint answers 403 unless DEBUG is on.
+
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+# N+1 detection, see `recipe_radar.query_inspector`. Development only: logs
+# query shapes repeated QUERY_INSPECTOR_THRESHOLD times or more in a request.
+
+QUERY_INSPECTOR_ENABLED = bool(int(os.getenv('QUERY_INSPECTOR_ENABLED', 0)))
+
+QUERY_INSPECTOR_THRESHOLD = int(os.getenv('QUERY_INSPECTOR_THRESHOLD', 3))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -112,6 +172,22 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.0/topics/auth/passwords/
+# PBKDF2 iterations of new hashes (Django's default is 720000). Stored
+# hashes with another count are upgraded on the user's next login.
+
+PASSWORD_HASHER_ITERATIONS = int(os.getenv('PASSWORD_HASHER_ITERATIONS', 720000))
+
+PASSWORD_HASHERS = [
+    'recipe.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
@@ -137,9 +213,22 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
 # Django REST Framework
+# `FastJSONRenderer`/`FastJSONParser` use orjson when it is installed and
+# produce the same bytes as DRF's JSONRenderer/JSONParser. Swap in
+# 'rest_framework.renderers.JSONRenderer'/'rest_framework.parsers.JSONParser'
+# to go back to the stock pair.
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'recipe.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'recipe.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'recipe.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'EXCEPTION_HANDLER': 'recipe.utils.recipe_custom_exc_handler',
 }